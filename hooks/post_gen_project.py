@@ -1,5 +1,9 @@
 #!/usr/bin/env python
-"""Cookiecutter hook that runs after template generation."""
+"""Cookiecutter hook that runs after template generation.
+
+The template's own tooling evaluates the exclusion rules in cookiecutter.json before rendering and never runs this
+hook. It remains so that projects generated directly through cookiecutter or cruft end up with the same files.
+"""
 import json
 import shutil
 import stat
@@ -8,50 +12,22 @@ from typing import Any
 from typing import Callable
 
 
-REMOVE_PATHS: list[str] = [
-    "{% if not cookiecutter.add_rust_extension %}rust{% endif %}",
-    "{% if not cookiecutter.add_rust_extension %}.github/workflows/lint-rust.yml{% endif %}",
-    "{% if not cookiecutter.add_rust_extension %}.github/workflows/build-rust.yml{% endif %}",
-    "{% if not cookiecutter.add_rust_extension %}.github/workflows/test-rust.yml{% endif %}",
-    "{% if cookiecutter.repository_provider != 'github' %}.github{% endif %}",
-    "{% if cookiecutter.repository_provider != 'gitlab' %}.gitlab-ci.yml{% endif %}",
-    "{% if cookiecutter.repository_provider != 'bitbucket' %}bitbucket-pipelines.yml{% endif %}",
-]
-
-
 def post_gen_project() -> None:
     """Run post-generation tasks."""
-    reindent_cookiecutter_json()
-    remove_undesired_files()
-
-
-def reindent_cookiecutter_json():
-    """Indent .cookiecutter.json using two spaces.
-
-    The jsonify extension distributed with Cookiecutter uses an indentation
-    width of four spaces. This conflicts with the default indentation width of
-    Prettier for JSON files. Prettier is run as a pre-commit hook in CI.
-    """
-    path = Path(".cookiecutter.json")
-
-    with path.open() as io:
-        data = json.load(io)
-
-    with path.open(mode="w") as io:
-        json.dump(data, io, sort_keys=True, indent=2)
-        io.write("\n")
+    remove_excluded_paths()
 
 
-def remove_undesired_files() -> None:
-    """Removes any files that are not desired in the generated project based on the cookiecutter.json.
+def remove_excluded_paths() -> None:
+    """Removes any paths excluded by the _exclude_unless rules in cookiecutter.json.
 
     This is done to avoid issues that tend to arise when the name of the template file contains a conditional.
     """
-    for path in REMOVE_PATHS:
-        if path == "":
+    context: dict[str, Any] = json.loads(Path(".cookiecutter.json").read_text())
+    for relative_path, conditions in context["_exclude_unless"].items():
+        if all(context.get(variable) in values for variable, values in conditions.items()):
             continue
 
-        path: Path = Path.cwd() / path
+        path: Path = Path.cwd() / relative_path
         if path.is_dir():
             shutil.rmtree(path, onerror=remove_readonly)
         else:
@@ -51,6 +51,7 @@ DEMOS_CACHE_FOLDER: Path = Path(
     )
 ).resolve()
 DEFAULT_DEMO_NAME: str = "robust-python-demo"
+RENDER_CACHE_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "renders"
 
 GENERATE_DEMO_SCRIPT: Path = SCRIPTS_FOLDER / "generate-demo.py"
 GENERATE_DEMO_OPTIONS: tuple[str, ...] = (
@@ -67,6 +68,9 @@ UPDATE_DEMO_OPTIONS: tuple[str, ...] = (
     *("--max-python-version", "3.14")
 )
 
+UPDATE_DEMOS_SCRIPT: Path = SCRIPTS_FOLDER / "update-demos.py"
+WARM_UV_CACHE_SCRIPT: Path = SCRIPTS_FOLDER / "warm-uv-cache.py"
+
 MERGE_DEMO_FEATURE_SCRIPT: Path = SCRIPTS_FOLDER / "merge-demo-feature.py"
 MERGE_DEMO_FEATURE_OPTIONS: tuple[str, ...] = GENERATE_DEMO_OPTIONS
 
@@ -74,6 +78,7 @@ BUMP_VERSION_SCRIPT: Path = SCRIPTS_FOLDER / "bump-version.py"
 GET_RELEASE_NOTES_SCRIPT: Path = SCRIPTS_FOLDER / "get-release-notes.py"
 SETUP_RELEASE_SCRIPT: Path = SCRIPTS_FOLDER / "setup-release.py"
 TAG_VERSION_SCRIPT: Path = SCRIPTS_FOLDER / "tag-version.py"
+BENCHMARK_TEMPLATE_SCRIPT: Path = SCRIPTS_FOLDER / "benchmark-template.py"
 
 
 @dataclass
@@ -118,14 +123,27 @@ def generate_demo(session: Session) -> None:
     session.run("python", GENERATE_DEMO_SCRIPT, *GENERATE_DEMO_OPTIONS, *session.posargs)
 
 
+@nox.session(python=DEFAULT_TEMPLATE_PYTHON_VERSION)
+def benchmark(session: Session) -> None:
+    """Time rendering, setting up, and running the nox sessions of projects generated from the template.
+
+    Usage:
+      nox -s benchmark                                      # Benchmark the python and maturin demos
+      nox -s benchmark -- -V add_rust_extension=false -s lint-python  # Benchmark a single variant and session
+      nox -s benchmark -- --tolerance 0.1                   # Fail on phases over 10% slower than their baseline
+    """
+    session.install_and_run_script(BENCHMARK_TEMPLATE_SCRIPT, *session.posargs)
+
+
 @nox.session(python=False, name="clear-cache")
 def clear_cache(session: Session) -> None:
-    """Clear the cache of generated project demos.
+    """Clear the cache of generated project demos and template renders.
 
     Not commonly used, but sometimes permissions might get messed up if exiting mid-build and such.
     """
     session.log("Clearing cache of generated project demos...")
     shutil.rmtree(DEMOS_CACHE_FOLDER, ignore_errors=True)
+    shutil.rmtree(RENDER_CACHE_FOLDER, ignore_errors=True)
     session.log("Cache cleared.")
 
 
@@ -185,7 +203,7 @@ def test(session: Session) -> None:
     session.log("Installing template testing dependencies...")
     # Sync deps from template's own pyproject.toml, e.g., 'dev' group that includes 'pytest', 'cookiecutter'
     session.install("-e", ".", "--group", "dev", "--group", "test")
-    session.run("pytest", "tests")
+    session.run("pytest", "-n", "auto", "tests")
 
 
 @nox.parametrize(
@@ -207,6 +225,30 @@ def update_demo(session: Session, demo: RepoMetadata) -> None:
     session.install_and_run_script(UPDATE_DEMO_SCRIPT, *args, env=demo_env)
 
 
+@nox.session(python=DEFAULT_TEMPLATE_PYTHON_VERSION, name="update-demos")
+def update_demos(session: Session) -> None:
+    """Update every generated project demo at once, reporting the outcome of each.
+
+    Usage:
+      nox -s update-demos                 # Update all demos concurrently
+      nox -s update-demos -- --jobs 1     # Update the demos one at a time
+    """
+    session.log("Updating all generated project demos...")
+    session.install_and_run_script(UPDATE_DEMOS_SCRIPT, *UPDATE_DEMO_OPTIONS, *session.posargs)
+
+
+@nox.session(python=DEFAULT_TEMPLATE_PYTHON_VERSION, name="warm-uv-cache")
+def warm_uv_cache(session: Session) -> None:
+    """Pre-populate the uv cache and interpreters shared by the demo workflows.
+
+    Usage:
+      nox -s warm-uv-cache                # Install interpreters and cache wheels for each demo's uv.lock
+      nox -s warm-uv-cache -- --force     # Sync lockfiles again even if already warmed up
+    """
+    session.log("Warming up the shared uv cache for generated project demos...")
+    session.install_and_run_script(WARM_UV_CACHE_SCRIPT, *UPDATE_DEMO_OPTIONS, *session.posargs)
+
+
 @nox.parametrize(
     arg_names="demo",
     arg_values_list=[PYTHON_DEMO, MATURIN_DEMO],
@@ -0,0 +1,232 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "cookiecutter",
+#   "cruft",
+#   "nox",
+#   "platformdirs",
+#   "python-dotenv",
+#   "typer",
+# ]
+# ///
+"""Python script for benchmarking how long the template takes to produce a working project."""
+
+import importlib
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Annotated
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+import typer
+from cookiecutter.exceptions import CookiecutterException
+from cookiecutter.generate import generate_files
+from cookiecutter.hooks import run_hook_from_repo_dir
+from cookiecutter.utils import work_in
+from jinja2 import TemplateError
+from util import BENCHMARK_HISTORY_PATH
+from util import REPO_FOLDER
+from util import TemplateRenderer
+from util import get_demo_extra_context
+from util import get_template_state
+from util import nox
+from util import parse_variant
+from util import remove_readonly
+
+
+# Variants benchmarked when none are given, matching the demos the template maintains
+DEFAULT_VARIANTS: list[str] = ["add_rust_extension=false", "add_rust_extension=true"]
+
+# Number of previous runs of a phase whose median is used as its baseline
+BASELINE_RUNS: int = 5
+
+cli: typer.Typer = typer.Typer()
+
+
+@cli.callback(invoke_without_command=True)
+def main(
+    variants: Annotated[
+        Optional[list[str]],
+        typer.Option("--variants", "-V", help="Variant to benchmark, such as 'license=MIT,add_rust_extension=true'.")
+    ] = None,
+    sessions: Annotated[
+        Optional[list[str]],
+        typer.Option("--sessions", "-s", help="Nox session to time, defaulting to every idempotent session.")
+    ] = None,
+    history_path: Annotated[
+        Path, typer.Option("--history", help="JSON file benchmark runs are recorded to.")
+    ] = BENCHMARK_HISTORY_PATH,
+    tolerance: Annotated[
+        float, typer.Option("--tolerance", "-t", help="Fraction a phase may exceed its baseline by.")
+    ] = 0.25,
+    tolerance_seconds: Annotated[
+        float, typer.Option("--tolerance-seconds", help="Seconds a phase may exceed its baseline by.")
+    ] = 5.0,
+    no_record: Annotated[
+        bool, typer.Option("--no-record", help="Compare against the history without adding to it.")
+    ] = False
+) -> None:
+    """Times each phase of generating and using a project from the template working tree, for every variant.
+
+    Each variant is rendered, has its post-gen hook run, is set up with setup-git and setup-venv, and then runs each
+    nox session. A phase regresses when it is slower than the median of its previous runs by more than both the
+    relative and absolute tolerances. Exits with an error if any phase fails or regresses.
+    """
+    history: list[dict[str, Any]] = _read_history(history_path)
+    sessions: list[str] = sessions if sessions is not None else _get_idempotent_nox_sessions()
+    commit: str = get_template_state().commit
+    renderer: TemplateRenderer = TemplateRenderer(template_folder=REPO_FOLDER, commit=commit)
+
+    runs: list[dict[str, Any]] = []
+    for spec in variants or DEFAULT_VARIANTS:
+        extra_context: dict[str, Any] = get_demo_extra_context(**{"add_rust_extension": False, **parse_variant(spec)})
+        typer.secho(f"Benchmarking {spec}...", fg="blue")
+        runs.append({
+            "timestamp": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "variant": spec,
+            "phases": _benchmark_variant(renderer=renderer, extra_context=extra_context, sessions=sessions)
+        })
+
+    problems: list[str] = []
+    for run in runs:
+        problems.extend(_report_run(
+            run=run, history=history, tolerance=tolerance, tolerance_seconds=tolerance_seconds
+        ))
+    if not no_record:
+        _write_history(history_path=history_path, history=[*history, *runs])
+        typer.secho(f"Recorded {len(runs)} benchmark run(s) to {history_path}.", fg="green")
+
+    if problems:
+        for problem in problems:
+            typer.secho(f"error: {problem}", fg="red")
+        sys.exit(1)
+
+
+def _benchmark_variant(
+    renderer: TemplateRenderer, extra_context: dict[str, Any], sessions: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Generates the variant in a temporary folder, returning the duration and outcome of each phase."""
+    phases: dict[str, dict[str, Any]] = {}
+    output_folder: Path = Path(tempfile.mkdtemp(prefix="cookiecutter-robust-python-benchmark-"))
+    try:
+        context: dict[str, Any] = {}
+        project_path: Path = output_folder / extra_context["project_name"]
+
+        def render() -> None:
+            context.update(renderer.build_context(extra_context=extra_context))
+            generate_files(repo_dir=REPO_FOLDER, context=context, output_dir=output_folder, accept_hooks=False)
+
+        def post_gen_hook() -> None:
+            run_hook_from_repo_dir(
+                repo_dir=REPO_FOLDER,
+                hook_name="post_gen_project",
+                project_dir=project_path,
+                context=context,
+                delete_project_on_failure=False
+            )
+
+        phases["render"] = _time_phase(render)
+        phases["post-gen-hook"] = _time_phase(post_gen_hook)
+        for session in ["setup-git", "setup-venv", *sessions]:
+            if any(not phase["succeeded"] for phase in phases.values()):
+                break
+            phases[session] = _time_phase(_get_nox_session_phase(project_path=project_path, session=session))
+        phases["total"] = {
+            "seconds": sum(phase["seconds"] for phase in phases.values()),
+            "succeeded": all(phase["succeeded"] for phase in phases.values())
+        }
+    finally:
+        shutil.rmtree(output_folder, onerror=remove_readonly)
+    return phases
+
+
+def _get_nox_session_phase(project_path: Path, session: str) -> Callable[[], None]:
+    """Returns a callable running the nox session within the project, raising on failure."""
+    def run_nox_session() -> None:
+        with work_in(project_path):
+            nox("-s", session)
+    return run_nox_session
+
+
+def _time_phase(phase: Callable[[], None]) -> dict[str, Any]:
+    """Runs the phase, returning how long it took and whether it succeeded.
+
+    A failed command has already printed its output, while failing to render or run a hook is reported here.
+    """
+    start: float = time.perf_counter()
+    try:
+        phase()
+        succeeded: bool = True
+    except subprocess.CalledProcessError:
+        succeeded: bool = False
+    except (CookiecutterException, TemplateError, OSError) as error:
+        typer.secho(f"{type(error).__name__}: {error}", err=True)
+        succeeded: bool = False
+    return {"seconds": round(time.perf_counter() - start, 3), "succeeded": succeeded}
+
+
+def _report_run(
+    run: dict[str, Any], history: list[dict[str, Any]], tolerance: float, tolerance_seconds: float
+) -> list[str]:
+    """Prints each phase of the run next to its baseline and returns any failures or regressions."""
+    problems: list[str] = []
+    typer.secho(f"\n{run['variant']}", bold=True)
+    typer.secho(f"  {'phase':<32}{'seconds':>10}{'baseline':>10}{'change':>10}")
+    for name, phase in run["phases"].items():
+        previous: list[float] = [
+            previous_run["phases"][name]["seconds"]
+            for previous_run in history
+            if previous_run["variant"] == run["variant"] and previous_run["phases"].get(name, {}).get("succeeded")
+        ][-BASELINE_RUNS:]
+        baseline: Optional[float] = statistics.median(previous) if previous else None
+        change: str = f"{phase['seconds'] - baseline:+.1f}" if baseline is not None else "-"
+        color: Optional[str] = None
+        if not phase["succeeded"]:
+            color = "red"
+            if name != "total":
+                problems.append(f"{name} failed for {run['variant']}.")
+        elif baseline is not None and _is_regression(phase["seconds"], baseline, tolerance, tolerance_seconds):
+            color = "yellow"
+            problems.append(f"{name} regressed for {run['variant']}: {phase['seconds']:.1f}s against {baseline:.1f}s.")
+        baseline_text: str = f"{baseline:.1f}" if baseline is not None else "-"
+        typer.secho(f"  {name:<32}{phase['seconds']:>10.1f}{baseline_text:>10}{change:>10}", fg=color)
+    return problems
+
+
+def _is_regression(seconds: float, baseline: float, tolerance: float, tolerance_seconds: float) -> bool:
+    """Returns whether the duration exceeds the baseline by more than both the relative and absolute tolerances."""
+    return seconds > baseline * (1 + tolerance) and seconds - baseline > tolerance_seconds
+
+
+def _get_idempotent_nox_sessions() -> list[str]:
+    """Returns the nox sessions the template's tests expect every generated project to pass repeatedly."""
+    sys.path.insert(0, str(REPO_FOLDER))
+    constants: Any = importlib.import_module("tests.constants")
+    return list(constants.IDEMPOTENT_NOX_SESSIONS)
+
+
+def _read_history(history_path: Path) -> list[dict[str, Any]]:
+    """Reads the recorded benchmark runs, returning an empty history if none exist."""
+    if not history_path.exists():
+        return []
+    return json.loads(history_path.read_text())
+
+
+def _write_history(history_path: Path, history: list[dict[str, Any]]) -> None:
+    """Writes the recorded benchmark runs."""
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history_path.write_text(json.dumps(history, indent=2))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,103 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "cookiecutter",
+#   "cruft>=2.16.0,<2.17",
+#   "platformdirs",
+#   "python-dotenv",
+#   "typer",
+# ]
+# ///
+"""Module containing cruft update as applied from the render cache.
+
+cruft offers no public way to update a project from templates rendered ahead of time, so this reuses the private
+helpers that cruft update applies its diff with. Those aren't part of cruft's public API, so every script using this
+module pins cruft to the release range it has been checked against.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import cruft
+from cruft._commands.update import _apply_project_updates
+from cruft._commands.update import _is_project_repo_clean
+from cruft._commands.utils.cruft import get_cruft_file
+from cruft._commands.utils.cruft import json_dumps
+from cruft._commands.utils.generate import _get_deleted_files
+from cruft._commands.utils.generate import _get_skip_paths
+from cruft._commands.utils.generate import _remove_paths
+from util import REPO_FOLDER
+from util import _read_cruft_file
+from util import _stamp_template_commit
+from util import can_render_commit
+from util import get_cached_render
+from util import get_template_state
+from util import get_update_contexts
+from util import invalidating_git_queries
+from util import materialize_render
+from util import remove_readonly
+
+
+def update_from_cached_renders(project_path: Path, template_commit: str, extra_context: dict[str, Any]) -> None:
+    """Updates a project to the template commit the same way cruft update would, diffing renders from the render cache.
+
+    The project's current and updated template are looked up in the render cache first, so projects updated with the
+    same contexts, such as the demos update-demos has already rendered, don't render them again. Projects whose last
+    update commit the renderer can't reproduce are updated by cruft update instead.
+    """
+    cruft_state: dict[str, Any] = _read_cruft_file(project_path)
+    if not can_render_commit(cruft_state["commit"]):
+        with invalidating_git_queries():
+            cruft.update(project_dir=project_path, template_path=REPO_FOLDER, extra_context=extra_context)
+        return
+    if not _is_project_repo_clean(project_path, allow_untracked_files=False):
+        raise ValueError(f"Cannot update {project_path} while its git working tree is unclean.")
+
+    current_context, updated_context = get_update_contexts(cruft_state=cruft_state, extra_context=extra_context)
+    # A list rather than a dict, as a project may be updated to a new context at the commit it's already on
+    renders: list[tuple[str, Path]] = [
+        (
+            cruft_state["commit"],
+            get_cached_render(
+                extra_context=current_context, template_state=get_template_state(commit=cruft_state["commit"])
+            ),
+        ),
+        (
+            template_commit,
+            get_cached_render(extra_context=updated_context, template_state=get_template_state(commit=template_commit)),
+        ),
+    ]
+    temp_folder: Path = Path(tempfile.mkdtemp(prefix="cookiecutter-robust-python-update-"))
+    try:
+        current_folder: Path = temp_folder / "current_template"
+        updated_folder: Path = temp_folder / "new_template"
+        for folder, (commit, render_path) in zip((current_folder, updated_folder), renders, strict=True):
+            materialize_render(render_path=render_path, project_path=folder)
+            _stamp_template_commit(project_path=folder, commit=commit)
+        updated_cruft_context: dict[str, Any] = _read_cruft_file(updated_folder)["context"]
+
+        # Mirrors cruft, which leaves out skipped paths and paths the project deleted, besides the .cruft.json it writes
+        skip_state: dict[str, Any] = {**cruft_state, "skip": list(cruft_state.get("skip", []))}
+        removed_paths: set[Path | str] = {
+            Path(".cruft.json"),
+            *_get_skip_paths(skip_state, project_path / "pyproject.toml"),
+            *_get_deleted_files(current_folder, project_path),
+        }
+        for folder in (current_folder, updated_folder):
+            _remove_paths(folder, removed_paths)
+        with invalidating_git_queries():
+            _apply_project_updates(
+                current_folder,
+                updated_folder,
+                project_path,
+                skip_update=False,
+                skip_apply_ask=True,
+                allow_untracked_files=False
+            )
+    finally:
+        shutil.rmtree(temp_folder, onerror=remove_readonly)
+
+    cruft_state.update(commit=template_commit, checkout=None, context=updated_cruft_context)
+    get_cruft_file(project_dir_path=project_path).write_text(json_dumps(cruft_state))
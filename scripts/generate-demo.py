@@ -3,6 +3,7 @@
 # dependencies = [
 #   "cookiecutter",
 #   "cruft",
+#   "platformdirs",
 #   "python-dotenv",
 #   "typer",
 # ]
@@ -12,11 +13,19 @@
 import sys
 from pathlib import Path
 from typing import Annotated
+from typing import Any
+from typing import Optional
 
 import typer
 
 from util import FolderOption
 from util import generate_demo
+from util import get_demo_extra_context
+from util import get_variant_matrix
+from util import parse_variant
+from util import ProfileOption
+from util import profiling
+from util import render_variants
 
 
 cli: typer.Typer = typer.Typer()
@@ -26,19 +35,52 @@ cli: typer.Typer = typer.Typer()
 def main(
     demos_cache_folder: Annotated[Path, FolderOption("--demos-cache-folder", "-c")],
     add_rust_extension: Annotated[bool, typer.Option("--add-rust-extension", "-r")] = False,
-    no_cache: Annotated[bool, typer.Option("--no-cache", "-n")] = False
+    no_cache: Annotated[bool, typer.Option("--no-cache", "-n")] = False,
+    incremental: Annotated[bool, typer.Option("--incremental", "-i")] = False,
+    variants: Annotated[
+        Optional[list[str]],
+        typer.Option("--variants", "-V", help="Variant to render into the cache, such as 'license=MIT,add_rust_extension=true'.")
+    ] = None,
+    matrix: Annotated[
+        Optional[list[str]],
+        typer.Option("--matrix", "-m", help="cookiecutter.json choice to render every option of for each variant.")
+    ] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", help="Number of variants to render in parallel.")] = 1,
+    profile: Annotated[bool, ProfileOption("--profile")] = False
 ) -> None:
-    """Generates a project demo using the cookiecutter-robust-python template."""
+    """Generates a project demo using the cookiecutter-robust-python template.
+
+    When given variants or a matrix, every resulting variant is rendered into the render cache in one batch instead.
+    """
     try:
-        generate_demo(
-            demos_cache_folder=demos_cache_folder,
-            add_rust_extension=add_rust_extension,
-            no_cache=no_cache
-        )
+        with profiling(name="generate-demo", enabled=profile):
+            if variants or matrix:
+                _render_variants(variants=variants or [""], matrix=matrix or [], jobs=jobs, refresh=no_cache)
+                return
+
+            generate_demo(
+                demos_cache_folder=demos_cache_folder,
+                add_rust_extension=add_rust_extension,
+                no_cache=no_cache,
+                incremental=incremental
+            )
     except Exception as error:
         typer.secho(f"error: {error}", fg="red")
         sys.exit(1)
 
 
+def _render_variants(variants: list[str], matrix: list[str], jobs: int, refresh: bool) -> None:
+    """Renders every combination of the given variants and matrix choices into the render cache."""
+    extra_contexts: list[dict[str, Any]] = []
+    for spec in variants:
+        for combination in get_variant_matrix(*matrix):
+            variant: dict[str, Any] = {**parse_variant(spec), **combination}
+            extra_contexts.append(get_demo_extra_context(**{"add_rust_extension": False, **variant}))
+
+    project_paths: list[Path] = render_variants(variants=extra_contexts, jobs=jobs, refresh=refresh)
+    for extra_context, project_path in zip(extra_contexts, project_paths, strict=True):
+        typer.secho(f"{extra_context}: {project_path}")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,8 +1,10 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
+#   "commitizen>=4.8.2,<5",
 #   "cookiecutter",
 #   "cruft",
+#   "platformdirs",
 #   "python-dotenv",
 #   "typer",
 # ]
@@ -3,24 +3,42 @@
 # dependencies = [
 #   "cookiecutter",
 #   "cruft",
+#   "platformdirs",
 #   "python-dotenv",
 #   "retrocookie",
 #   "typer",
 # ]
 # ///
 
+import asyncio
+import subprocess
+import sys
 from pathlib import Path
 from typing import Annotated
+from typing import Any
+from typing import Optional
 
-import pre_commit.main
 import typer
+from pre_commit.clientlib import load_config
+from pre_commit.commands.run import Classifier
+from pre_commit.constants import CONFIG_FILE
+from pre_commit.repository import all_hooks
+from pre_commit.store import Store
 from retrocookie.core import retrocookie
 
 from util import DEMO
 from util import git
 from util import FolderOption
+from util import in_demo_worktree
 from util import in_new_demo
+from util import invalidating_git_queries
+from util import profile_phase
+from util import ProfileOption
+from util import profiling
+from util import REPO_FOLDER
 from util import require_clean_and_up_to_date_demo_repo
+from util import run_command_async
+from util import run_sync
 
 
 # These still may need linted, but retrocookie shouldn't be used on them
@@ -36,25 +54,137 @@ cli: typer.Typer = typer.Typer()
 def lint_from_demo(
     demos_cache_folder: Annotated[Path, FolderOption("--demos-cache-folder", "-c")],
     add_rust_extension: Annotated[bool, typer.Option("--add-rust-extension", "-r")] = False,
-    no_cache: Annotated[bool, typer.Option("--no-cache", "-n")] = False
+    no_cache: Annotated[bool, typer.Option("--no-cache", "-n")] = False,
+    changed_only: Annotated[
+        bool,
+        typer.Option("--changed-only", help="Only lint files the render changed since the demo's last cruft update.")
+    ] = False,
+    profile: Annotated[bool, ProfileOption("--profile")] = False
 ) -> None:
-    """Runs precommit in a generated project and matches the template to the results."""
-    with in_new_demo(
+    """Runs precommit in a generated project and matches the template to the results.
+
+    Works within a worktree of the demo's shared store, so the demo's own checkout is left as is. Hooks that share no
+    files run concurrently, while hooks sharing files run in the order they are configured in. When only linting
+    changed files, precommit runs on just the files that differ from the demo's last cruft update commit and only
+    their diffs are committed, so retrocookie only applies those files back to the template.
+    """
+    with profiling(name="lint-from-demo", enabled=profile), in_demo_worktree(
         demos_cache_folder=demos_cache_folder,
         add_rust_extension=add_rust_extension,
-        no_cache=no_cache
-    ) as demo_path:
-        require_clean_and_up_to_date_demo_repo(demo_path=demo_path)
-        git("checkout", DEMO.develop_branch)
-        git("branch", "-D", "temp/lint-from-demo", ignore_error=True)
-        git("checkout", "-b", "temp/lint-from-demo", DEMO.develop_branch)
-        pre_commit.main.main(["run", "--all-files", "--show-diff-on-failure"])
-
-        for path in IGNORED_FILES:
-            git("checkout", "HEAD", "--", path)
-        git("add", ".")
-        git("commit", "-m", "meta: lint-from-demo", "--no-verify")
-    retrocookie(instance_path=demo_path, commits=[f"{DEMO.develop_branch}..temp/lint-from-demo"])
+        operation="lint-from-demo",
+        start_point=DEMO.develop_branch,
+        branch="temp/lint-from-demo"
+    ) as worktree_path:
+        require_clean_and_up_to_date_demo_repo(demo_path=worktree_path)
+        with in_new_demo(
+            demos_cache_folder=demos_cache_folder,
+            add_rust_extension=add_rust_extension,
+            no_cache=no_cache,
+            demo_path=worktree_path
+        ):
+            changed_files: Optional[list[str]] = _get_changed_files() if changed_only else None
+            if changed_files == []:
+                typer.secho("No files changed since the demo's last cruft update, skipping lint.", fg="yellow")
+                return
+
+            with profile_phase("pre-commit"):
+                _run_pre_commit(changed_files=changed_files)
+
+            for path in IGNORED_FILES:
+                git("checkout", "HEAD", "--", path)
+            if changed_files is None:
+                git("add", ".")
+            else:
+                git("add", "--all", "--", *changed_files)
+            git("commit", "-m", "meta: lint-from-demo", "--no-verify")
+        with profile_phase("retrocookie"), invalidating_git_queries():
+            # The worktree is still the current directory here, so the template has to be named explicitly
+            retrocookie(
+                instance_path=worktree_path,
+                commits=[f"{DEMO.develop_branch}..temp/lint-from-demo"],
+                path=REPO_FOLDER
+            )
+
+
+def _get_changed_files() -> list[str]:
+    """Returns the demo files that differ from the demo's last cruft update commit, including untracked files."""
+    cruft_update_commit: str = git("log", "-1", "--format=%H", "--", ".cruft.json").stdout.strip()
+    if not cruft_update_commit:
+        raise ValueError("Could not find a commit updating .cruft.json in the demo.")
+
+    changed_files: list[str] = git("diff", "--name-only", "--no-renames", cruft_update_commit).stdout.splitlines()
+    untracked_files: list[str] = git("ls-files", "--others", "--exclude-standard").stdout.splitlines()
+    return sorted({*changed_files, *untracked_files})
+
+
+def _get_pre_commit_file_args(changed_files: Optional[list[str]]) -> list[str]:
+    """Returns the pre-commit arguments selecting either every file or the changed files that still exist."""
+    if changed_files is None:
+        return ["--all-files"]
+    return ["--files", *(path for path in changed_files if Path(path).exists())]
+
+
+def _run_pre_commit(changed_files: Optional[list[str]]) -> None:
+    """Runs the demo's pre-commit hooks wave by wave, showing the resulting diff if any hook failed.
+
+    Nothing is run when every changed file was deleted, as pre-commit would fall back to the staged files given no
+    files, stashing and restoring the others while the hooks of a wave run at once.
+    """
+    file_args: list[str] = _get_pre_commit_file_args(changed_files)
+    if file_args == ["--files"]:
+        typer.secho("Every changed file was deleted, skipping pre-commit.", fg="yellow")
+        return
+    filenames: list[str] = git("ls-files", "-z").stdout.split("\0")[:-1] if changed_files is None else file_args[1:]
+    succeeded: bool = True
+    for wave in _get_hook_waves(filenames=filenames):
+        results: list[bool] = run_sync(_run_hook_wave(hook_ids=wave, file_args=file_args))
+        succeeded = succeeded and all(results)
+
+    if not succeeded:
+        typer.secho("pre-commit hook(s) made changes or failed, all changes made by hooks:", fg="yellow")
+        typer.echo(git("--no-pager", "diff", "--no-ext-diff").stdout)
+
+
+def _get_hook_waves(filenames: list[str]) -> list[list[str]]:
+    """Groups the ids of the demo's pre-commit hooks into waves whose hooks share no files and can run at once.
+
+    Each hook joins the wave after the latest wave holding a hook that shares any of its files, so hooks sharing files
+    keep their configured order while hooks on unrelated files, such as ruff, rustfmt and prettier, run together.
+    """
+    config: dict[str, Any] = load_config(CONFIG_FILE)
+    classifier: Classifier = Classifier.from_config(filenames, config["files"], config["exclude"])
+    hook_files: dict[str, set[str]] = {}
+    for hook in all_hooks(config, Store()):
+        if "pre-commit" in hook.stages:
+            hook_files.setdefault(hook.id, set()).update(classifier.filenames_for_hook(hook))
+
+    waves: list[list[str]] = []
+    wave_files: list[set[str]] = []
+    for hook_id, files in hook_files.items():
+        index: int = next((index + 1 for index in reversed(range(len(waves))) if wave_files[index] & files), 0)
+        if index == len(waves):
+            waves.append([])
+            wave_files.append(set())
+        waves[index].append(hook_id)
+        wave_files[index].update(files)
+    return waves
+
+
+async def _run_hook_wave(hook_ids: list[str], file_args: list[str]) -> list[bool]:
+    """Runs each pre-commit hook of the wave in its own process at once, returning whether each one passed."""
+    return await asyncio.gather(*(_run_hook(hook_id=hook_id, file_args=file_args) for hook_id in hook_ids))
+
+
+async def _run_hook(hook_id: str, file_args: list[str]) -> bool:
+    """Runs a single pre-commit hook, returning whether it passed without changing any files."""
+    try:
+        result: subprocess.CompletedProcess = await run_command_async(
+            sys.executable, "-m", "pre_commit", "run", hook_id, *file_args
+        )
+    except subprocess.CalledProcessError:
+        return False
+    typer.echo(result.stdout, nl=False)
+    return True
 
 
 if __name__ == '__main__':
@@ -3,11 +3,11 @@
 # dependencies = [
 #    "cookiecutter",
 #    "cruft",
+#    "platformdirs",
 #    "python-dotenv",
 #    "typer",
 # ]
 # ///
-import subprocess
 from pathlib import Path
 from typing import Annotated
 from typing import Optional
@@ -19,7 +19,8 @@ from util import DEMO
 from util import FolderOption
 from util import get_current_branch
 from util import get_demo_name
-from util import gh
+from util import GitHubClient
+from util import PullRequest
 
 
 cli: typer.Typer = typer.Typer()
@@ -40,14 +41,14 @@ def merge_demo_feature(
     branch: str = branch if branch is not None else get_current_branch()
 
     with work_in(demo_path):
-        pr_number_query: subprocess.CompletedProcess = gh(
-            "pr", "list", "--head", branch, "--base", DEMO.develop_branch, "--json", "number", "--jq", ".[0].number"
+        client: GitHubClient = GitHubClient()
+        pull_request: Optional[PullRequest] = client.find_pull_request(
+            repository=f"{DEMO.app_author}/{DEMO.app_name}", head=branch, base=DEMO.develop_branch
         )
-        pr_number: str = pr_number_query.stdout.strip()
-        if pr_number == "":
-            raise ValueError("Failed to find an existing PR from {} to {DEMO.develop_branch}")
+        if pull_request is None:
+            raise ValueError(f"Failed to find an existing PR from {branch} to {DEMO.develop_branch}")
 
-        gh("pr", "merge", pr_number, "--auto", "--delete-branch", "--merge")
+        client.merge_pull_request(pull_request=pull_request)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 # dependencies = [
 #    "cookiecutter",
 #    "cruft",
+#    "platformdirs",
 #    "python-dotenv",
 #    "typer",
 # ]
@@ -14,13 +15,13 @@ from pathlib import Path
 from typing import Annotated
 
 import typer
-from cookiecutter.utils import work_in
 from loguru import logger
 
 from util import get_current_branch
 from util import get_demo_name
 from util import gh
 from util import git
+from util import in_demo_worktree
 from util import nox
 from util import require_clean_and_up_to_date_demo_repo
 from util import FolderOption
@@ -37,11 +38,14 @@ def release_demo(
 ) -> None:
     """Creates a release of the demo's current develop branch if changes exist."""
     demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
-    demo_path: Path = demos_cache_folder / demo_name
 
-    with work_in(demo_path):
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder,
+        add_rust_extension=add_rust_extension,
+        operation="release-demo",
+        start_point=DEMO.develop_branch
+    ) as demo_path:
         require_clean_and_up_to_date_demo_repo(demo_path)
-        git("checkout", DEMO.develop_branch)
         try:
             nox("setup-release", "--", "MINOR")
             logger.success(f"Successfully created release {demo_name}")
@@ -57,14 +61,16 @@ def release_demo(
 
 
 def _rollback_failed_release() -> None:
-    """Returns the demo repo back to the state it was prior to the release attempt."""
-    starting_demo_branch: str = get_current_branch()
-
-    if starting_demo_branch != "develop":
-        git("checkout", DEMO.develop_branch)
-
-    git("checkout", ".")
-    git("branch", "-D", starting_demo_branch)
+    """Deletes the release branch of the failed release attempt, if it got as far as creating one.
+
+    The worktree was added detached from develop, which may be checked out in another worktree, so HEAD is detached
+    again instead of returning to develop, and removing the worktree discards anything else the attempt changed.
+    """
+    release_branch: str = get_current_branch()
+    if not release_branch:
+        return
+    git("checkout", "--detach")
+    git("branch", "-D", release_branch)
 
 
 def _create_demo_pr() -> None:
@@ -3,6 +3,7 @@
 # dependencies = [
 #   "cookiecutter",
 #   "cruft",
+#   "platformdirs",
 #   "python-dotenv",
 #   "typer",
 #   "tomli>=2.0.0;python_version<'3.11'",
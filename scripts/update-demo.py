@@ -2,36 +2,45 @@
 # requires-python = ">=3.10"
 # dependencies = [
 #   "cookiecutter",
-#   "cruft",
+#   "cruft>=2.16.0,<2.17",
+#   "platformdirs",
 #   "python-dotenv",
 #   "typer",
 # ]
 # ///
-import itertools
-import subprocess
+import asyncio
 from pathlib import Path
 from subprocess import CompletedProcess
 from typing import Annotated
 from typing import Any
 from typing import Optional
 
-import cruft
 import typer
 from cookiecutter.utils import work_in
+from cruft_update import update_from_cached_renders
 
 from util import _read_cruft_file
 from util import DEMO
 from util import is_ancestor
 from util import get_current_branch
 from util import get_current_commit
+from util import in_demo_worktree
+from util import get_affected_render_paths
 from util import get_demo_name
 from util import get_last_cruft_update_commit
-from util import gh
 from util import git
+from util import git_async
 from util import FolderOption
+from util import GitHubClient
+from util import PullRequest
+from util import profile_phase
+from util import ProfileOption
+from util import profiling
 from util import REPO_FOLDER
 from util import require_clean_and_up_to_date_demo_repo
+from util import run_sync
 from util import TEMPLATE
+from util import TemplateRenderer
 from util import uv
 
 
@@ -44,11 +53,32 @@ def update_demo(
     add_rust_extension: Annotated[bool, typer.Option("--add-rust-extension", "-r")] = False,
     min_python_version: Annotated[str, typer.Option("--min-python-version")] = "3.10",
     max_python_version: Annotated[str, typer.Option("--max-python-version")] = "3.14",
-    branch_override: Annotated[Optional[str], typer.Option("--branch-override")] = None
+    branch_override: Annotated[Optional[str], typer.Option("--branch-override")] = None,
+    profile: Annotated[bool, ProfileOption("--profile")] = False
 ) -> None:
     """Runs precommit in a generated project and matches the template to the results."""
+    with profiling(name="update-demo", enabled=profile):
+        _update_demo(
+            demos_cache_folder=demos_cache_folder,
+            add_rust_extension=add_rust_extension,
+            min_python_version=min_python_version,
+            max_python_version=max_python_version,
+            branch_override=branch_override
+        )
+
+
+def _update_demo(
+    demos_cache_folder: Path,
+    add_rust_extension: bool,
+    min_python_version: str,
+    max_python_version: str,
+    branch_override: Optional[str]
+) -> None:
+    """Updates the demo project to the current template commit and opens a PR for it if needed.
+
+    Works within a worktree of the demo's shared store, so the demo's own checkout is left as is.
+    """
     demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
-    demo_path: Path = demos_cache_folder / demo_name
 
     typer.secho(f"template:\n\tcurrent_branch: {get_current_branch()}\n\tcurrent_commit: {get_current_commit()}")
     if branch_override is not None:
@@ -59,77 +89,167 @@ def update_demo(
     template_commit: str = get_current_commit()
 
     _validate_template_main_not_checked_out(branch=desired_branch_name)
-    require_clean_and_up_to_date_demo_repo(demo_path=demo_path)
-    _checkout_demo_develop_or_existing_branch(demo_path=demo_path, branch=desired_branch_name)
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder,
+        add_rust_extension=add_rust_extension,
+        operation="update-demo",
+        start_point=DEMO.develop_branch
+    ) as demo_path:
+        require_clean_and_up_to_date_demo_repo(demo_path=demo_path)
+        _checkout_demo_develop_or_existing_branch(demo_path=demo_path, branch=desired_branch_name)
+        _update_demo_worktree(
+            demo_path=demo_path,
+            demo_name=demo_name,
+            add_rust_extension=add_rust_extension,
+            min_python_version=min_python_version,
+            max_python_version=max_python_version,
+            desired_branch_name=desired_branch_name,
+            template_commit=template_commit
+        )
+
+
+def _update_demo_worktree(
+    demo_path: Path,
+    demo_name: str,
+    add_rust_extension: bool,
+    min_python_version: str,
+    max_python_version: str,
+    desired_branch_name: str,
+    template_commit: str
+) -> None:
+    """Updates the demo worktree as cruft update would, then commits, pushes and opens a PR for the result.
+
+    Skips the update when the template changes since the demo's last update can't affect any of its files, and only
+    relocks the demo when the update changed its pyproject.toml. The renders the update diffs come from the render
+    cache, which update-demos fills for every demo beforehand.
+    """
     last_update_commit: str = get_last_cruft_update_commit(demo_path=demo_path)
+    extra_context: dict[str, Any] = {
+        "project_name": demo_name,
+        "add_rust_extension": add_rust_extension,
+        "min_python_version": min_python_version,
+        "max_python_version": max_python_version
+    }
 
     if template_commit == last_update_commit:
         typer.secho(
             f"{demo_name} is already up to date with {desired_branch_name} at {last_update_commit}",
             fg=typer.colors.YELLOW
         )
+        return
 
-    if not is_ancestor(last_update_commit, template_commit):
-        raise ValueError(
-            f"The last update commit '{last_update_commit}' is not an ancestor of the current commit "
-            f"'{template_commit}'."
+    with work_in(REPO_FOLDER):
+        if not is_ancestor(last_update_commit, template_commit):
+            raise ValueError(
+                f"The last update commit '{last_update_commit}' is not an ancestor of the current commit "
+                f"'{template_commit}'."
+            )
+
+    with profile_phase("relevance"):
+        is_relevant: bool = _is_update_relevant(
+            demo_path=demo_path,
+            extra_context=extra_context,
+            last_update_commit=last_update_commit,
+            template_commit=template_commit
         )
+    if not is_relevant:
+        typer.secho(
+            f"Template changes from {last_update_commit} to {template_commit} don't affect {demo_name}, skipping.",
+            fg=typer.colors.YELLOW
+        )
+        return
 
     typer.secho(f"Updating demo project at {demo_path=}.", fg="yellow")
     with work_in(demo_path):
         typer.secho(f"demo:\n\tcurrent_branch: {get_current_branch()}\n\tcurrent_commit: {get_current_commit()}")
-        if get_current_branch() != desired_branch_name:
+        if desired_branch_name != DEMO.develop_branch and get_current_branch() != desired_branch_name:
             git("checkout", "-b", desired_branch_name, DEMO.develop_branch)
 
         uv("python", "pin", min_python_version)
         uv("python", "install", min_python_version)
-        cruft.update(
-            project_dir=demo_path,
-            template_path=REPO_FOLDER,
-            extra_context={
-                "project_name": demo_name,
-                "add_rust_extension": add_rust_extension,
-                "min_python_version": min_python_version,
-                "max_python_version": max_python_version
-            },
-        )
-        uv("lock")
+        with profile_phase("cruft update"):
+            update_from_cached_renders(
+                project_path=demo_path, template_commit=template_commit, extra_context=extra_context
+            )
+        if git("status", "--porcelain", "--", "pyproject.toml").stdout.strip():
+            uv("lock")
         git("add", ".")
         git("commit", "-m", f"chore: {last_update_commit} -> {template_commit}", "--no-verify")
-        git("push", "-u", "origin", desired_branch_name)
+        if desired_branch_name == DEMO.develop_branch:
+            # The worktree stays detached rather than holding develop, so the update is pushed from HEAD
+            git("push", DEMO.remote, f"HEAD:{DEMO.develop_branch}")
+        else:
+            git("push", "-u", DEMO.remote, desired_branch_name)
         if desired_branch_name != "develop":
-            _create_demo_pr(demo_path=demo_path, branch=desired_branch_name, commit_start=last_update_commit)
+            with profile_phase("create pr"):
+                _create_demo_pr(demo_path=demo_path, branch=desired_branch_name, commit_start=last_update_commit)
+
+
+def _is_update_relevant(
+    demo_path: Path, extra_context: dict[str, Any], last_update_commit: str, template_commit: str
+) -> bool:
+    """Returns whether updating the demo from the last update commit to the template commit can change its files.
+
+    The update is relevant if the demo's context changes, or if any template change since the last update affects a
+    file rendered for the demo's context. Changes limited to files excluded for the demo, such as rust files for the
+    python demo, are not.
+    """
+    demo_context: dict[str, Any] = _read_cruft_file(demo_path)["context"]["cookiecutter"]
+    if any(demo_context.get(key) != value for key, value in extra_context.items()):
+        return True
+
+    renderer: TemplateRenderer = TemplateRenderer(template_folder=REPO_FOLDER, commit=template_commit)
+    context: dict[str, Any] = renderer.build_context(extra_context={**demo_context, **extra_context})
+    affected_paths: Optional[set[str]] = get_affected_render_paths(
+        renderer=renderer, context=context, start_commit=last_update_commit, end_commit=template_commit
+    )
+    if affected_paths is None:
+        typer.secho("Template changes affect every rendered file.")
+        return True
+
+    typer.secho(f"Template changes affect {len(affected_paths)} rendered file(s): {sorted(affected_paths)}")
+    return bool(affected_paths)
 
 
 def _checkout_demo_develop_or_existing_branch(demo_path: Path, branch: str) -> None:
-    """Checkout either develop or an existing demo branch."""
+    """Checkout either develop or an existing demo branch.
+
+    The demo worktree starts detached at develop and stays that way unless the branch already exists, as checking out
+    develop itself would block the demo store's fetch into develop for every other worktree.
+    """
+    if branch == DEMO.develop_branch:
+        return
+
     with work_in(demo_path):
-        if __has_existing_local_demo_branch(demo_path=demo_path, branch=branch):
+        has_local_branch, has_remote_branch = run_sync(_find_existing_demo_branches(branch=branch))
+        if has_local_branch:
             typer.secho(f"Local demo found, updating demo from base {branch}")
             git("checkout", branch)
             return
 
-        if __has_existing_remote_demo_branch(demo_path=demo_path, branch=branch):
+        if has_remote_branch:
             remote_branch: str = f"{DEMO.remote}/{branch}"
             typer.secho(f"Remote demo found, updating demo from base {remote_branch}")
             git("checkout", "-b", branch, remote_branch)
-            return
 
-        git("checkout", "develop")
+
+async def _find_existing_demo_branches(branch: str) -> tuple[bool, bool]:
+    """Returns whether a local and a remote branch have been made for the given branch, looking both up at once."""
+    return await asyncio.gather(
+        __has_existing_local_demo_branch(branch=branch), __has_existing_remote_demo_branch(branch=branch)
+    )
 
 
-def __has_existing_local_demo_branch(demo_path: Path, branch: str) -> bool:
+async def __has_existing_local_demo_branch(branch: str) -> bool:
     """Returns whether a local branch has been made for the given branch."""
-    with work_in(demo_path):
-        local_result: Optional[CompletedProcess] = git("branch", "--list", branch)
-        return local_result is not None and branch in local_result.stdout
+    local_result: Optional[CompletedProcess] = await git_async("branch", "--list", branch)
+    return local_result is not None and branch in local_result.stdout
 
 
-def __has_existing_remote_demo_branch(demo_path: Path, branch: str) -> bool:
+async def __has_existing_remote_demo_branch(branch: str) -> bool:
     """Returns whether a remote branch has been made for the given branch."""
-    with work_in(demo_path):
-        remote_result: Optional[CompletedProcess] = git("ls-remote", DEMO.remote, branch)
-        return remote_result is not None and branch in remote_result.stdout
+    remote_result: Optional[CompletedProcess] = await git_async("ls-remote", DEMO.remote, branch)
+    return remote_result is not None and branch in remote_result.stdout
 
 
 def _validate_template_main_not_checked_out(branch: str) -> None:
@@ -146,34 +266,20 @@ def _validate_template_main_not_checked_out(branch: str) -> None:
 
 def _create_demo_pr(demo_path: Path, branch: str, commit_start: str) -> None:
     """Creates a PR to merge the given branch into develop."""
-    gh("repo", "set-default", f"{DEMO.app_author}/{DEMO.app_name}")
-    search_results: subprocess.CompletedProcess = gh("pr", "list", "--state", "open", "--search", branch)
-
-    if search_results.returncode == 0:
-        url: str = _get_pr_url(branch=branch)
-        typer.secho(f"Skipping PR creation due to existing PR found for branch {branch} at {url}")
+    client: GitHubClient = GitHubClient()
+    repository: str = f"{DEMO.app_author}/{DEMO.app_name}"
+    existing_pr: Optional[PullRequest] = client.find_pull_request(
+        repository=repository, head=branch, base=DEMO.develop_branch
+    )
+    if existing_pr is not None:
+        typer.secho(f"Skipping PR creation due to existing PR found for branch {branch} at {existing_pr.url}")
         return
 
     body: str = _get_demo_feature_pr_body(demo_path=demo_path, commit_start=commit_start)
-
-    pr_kwargs: dict[str, Any] = {
-        "--title": branch.capitalize(),
-        "--body": body,
-        "--base": DEMO.develop_branch,
-        "--assignee": "@me",
-        "--repo": f"{DEMO.app_author}/{DEMO.app_name}",
-    }
-    gh("pr", "create", *itertools.chain.from_iterable(pr_kwargs.items()))
-    url: str = _get_pr_url(branch=branch)
-    typer.secho(f"Created PR for branch '{branch}' at '{url}'.")
-
-
-def _get_pr_url(branch: str) -> str:
-    """Returns the url of the current branch's PR."""
-    result: subprocess.CompletedProcess = gh("pr", "view", branch, "--json", "url", "--jq", ".url")
-    if result.returncode != 0:
-        raise ValueError(f"Failed to find a PR URL for branch {branch}.")
-    return result.stdout.strip()
+    created_pr: PullRequest = client.create_pull_request(
+        repository=repository, head=branch, base=DEMO.develop_branch, title=branch.capitalize(), body=body
+    )
+    typer.secho(f"Created PR for branch '{branch}' at '{created_pr.url}'.")
 
 
 def _get_demo_feature_pr_body(demo_path: Path, commit_start: str) -> str:
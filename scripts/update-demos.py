@@ -0,0 +1,190 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "cookiecutter",
+#   "cruft",
+#   "platformdirs",
+#   "python-dotenv",
+#   "typer",
+# ]
+# ///
+"""Python script for updating every configured demo project at once."""
+
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated
+from typing import Any
+from typing import Optional
+
+import typer
+from util import COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER
+from util import REPO_FOLDER
+from util import FolderOption
+from util import can_render_commit
+from util import get_current_branch
+from util import get_current_commit
+from util import get_demo_name
+from util import get_demo_store_path
+from util import get_template_state
+from util import get_update_contexts
+from util import read_cruft_file_at
+from util import render_variants
+from util import run_sync
+
+
+UPDATE_DEMO_SCRIPT: Path = Path(__file__).parent / "update-demo.py"
+UPDATE_DEMOS_LOGS_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "logs" / "update-demos"
+
+# Environment variable prefix of each demo's repo metadata in .env, mapped to whether it adds a rust extension
+DEMO_ENV_PREFIXES: dict[str, bool] = {
+    "ROBUST_PYTHON_DEMO": False,
+    "ROBUST_MATURIN_DEMO": True,
+}
+
+# Fields of RepoMetadata, passed to update-demo.py as ROBUST_DEMO__<FIELD>
+DEMO_METADATA_FIELDS: tuple[str, ...] = ("APP_NAME", "APP_AUTHOR", "REMOTE", "MAIN_BRANCH", "DEVELOP_BRANCH")
+
+
+@dataclass
+class DemoUpdate:
+    """Outcome of updating a single demo."""
+    demo_name: str
+    log_path: Path
+    returncode: Optional[int] = None
+    seconds: float = 0.0
+
+
+cli: typer.Typer = typer.Typer()
+
+
+@cli.callback(invoke_without_command=True)
+def update_demos(
+    demos_cache_folder: Annotated[Path, FolderOption("--demos-cache-folder", "-c")],
+    min_python_version: Annotated[str, typer.Option("--min-python-version")] = "3.10",
+    max_python_version: Annotated[str, typer.Option("--max-python-version")] = "3.14",
+    branch_override: Annotated[Optional[str], typer.Option("--branch-override")] = None,
+    jobs: Annotated[
+        int, typer.Option("--jobs", "-j", help="Number of demos to update at once.")
+    ] = len(DEMO_ENV_PREFIXES)
+) -> None:
+    """Updates every configured demo project concurrently and reports how each update went.
+
+    The template branch is resolved once and shared by every update, and the renders each update diffs are rendered
+    into the render cache up front from a single template checkout. Each demo is then updated by its own
+    update-demo.py process within its own demo folder, logging to the update-demos logs cache folder.
+    """
+    branch: str = branch_override if branch_override is not None else get_current_branch()
+    typer.secho(f"template:\n\tcurrent_branch: {branch}\n\tcurrent_commit: {get_current_commit()}")
+    _render_demo_updates(
+        demos_cache_folder=demos_cache_folder,
+        min_python_version=min_python_version,
+        max_python_version=max_python_version,
+        jobs=jobs
+    )
+
+    update_demo_args: list[str] = [
+        *("--demos-cache-folder", str(demos_cache_folder)),
+        *("--min-python-version", min_python_version),
+        *("--max-python-version", max_python_version),
+        *("--branch-override", branch),
+    ]
+    updates: list[DemoUpdate] = run_sync(_update_all_demos(update_demo_args=update_demo_args, jobs=jobs))
+
+    typer.secho(f"\n{'demo':<32}{'status':<10}{'seconds':>10}  log")
+    for update in updates:
+        status: str = "updated" if update.returncode == 0 else "failed"
+        typer.secho(
+            f"{update.demo_name:<32}{status:<10}{update.seconds:>10.1f}  {update.log_path}",
+            fg="green" if update.returncode == 0 else "red"
+        )
+    if any(update.returncode != 0 for update in updates):
+        sys.exit(1)
+
+
+def _render_demo_updates(demos_cache_folder: Path, min_python_version: str, max_python_version: str, jobs: int) -> None:
+    """Renders the current and updated template of every demo into the render cache, batching renders by commit.
+
+    Demos are read from their stores as last fetched, so a demo without a store yet, or whose develop branch has moved
+    on since, has whatever is missing rendered by its own update instead.
+    """
+    template_commit: str = get_current_commit()
+    variants: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for env_prefix, add_rust_extension in DEMO_ENV_PREFIXES.items():
+        demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
+        store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=demo_name)
+        develop_branch: str = os.getenv(f"{env_prefix}__DEVELOP_BRANCH", "")
+        if not develop_branch or not store_path.is_dir():
+            continue
+        cruft_state: Optional[dict[str, Any]] = read_cruft_file_at(repo_path=store_path, revision=develop_branch)
+        if cruft_state is None or cruft_state["commit"] == template_commit:
+            continue
+        if not can_render_commit(cruft_state["commit"]):
+            continue
+
+        # Matches the extra context update-demo.py updates the demo with, so that both look up the same renders
+        extra_context: dict[str, Any] = {
+            "project_name": demo_name,
+            "add_rust_extension": add_rust_extension,
+            "min_python_version": min_python_version,
+            "max_python_version": max_python_version
+        }
+        current_context, updated_context = get_update_contexts(cruft_state=cruft_state, extra_context=extra_context)
+        variants[cruft_state["commit"]].append(current_context)
+        variants[template_commit].append(updated_context)
+
+    for commit, commit_variants in variants.items():
+        render_variants(variants=commit_variants, jobs=jobs, template_state=get_template_state(commit=commit))
+
+
+async def _update_all_demos(update_demo_args: list[str], jobs: int) -> list[DemoUpdate]:
+    """Runs update-demo.py for every configured demo, with no more than the given number at once."""
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max(jobs, 1))
+    UPDATE_DEMOS_LOGS_FOLDER.mkdir(parents=True, exist_ok=True)
+    return await asyncio.gather(*(
+        _update_demo(
+            env_prefix=env_prefix,
+            add_rust_extension=add_rust_extension,
+            update_demo_args=update_demo_args,
+            semaphore=semaphore
+        )
+        for env_prefix, add_rust_extension in DEMO_ENV_PREFIXES.items()
+    ))
+
+
+async def _update_demo(
+    env_prefix: str, add_rust_extension: bool, update_demo_args: list[str], semaphore: asyncio.Semaphore
+) -> DemoUpdate:
+    """Runs update-demo.py for a single demo, logging its output to a file of its own."""
+    demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
+    update: DemoUpdate = DemoUpdate(demo_name=demo_name, log_path=UPDATE_DEMOS_LOGS_FOLDER / f"{demo_name}.log")
+    args: list[str] = [*update_demo_args, "--add-rust-extension"] if add_rust_extension else update_demo_args
+    demo_env: dict[str, str] = {
+        **os.environ,
+        **{f"ROBUST_DEMO__{field}": os.getenv(f"{env_prefix}__{field}", "") for field in DEMO_METADATA_FIELDS},
+    }
+
+    async with semaphore:
+        typer.secho(f"Updating {demo_name}...", fg="yellow")
+        start: float = time.perf_counter()
+        with update.log_path.open("w") as log_file:
+            process: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(UPDATE_DEMO_SCRIPT),
+                *args,
+                cwd=REPO_FOLDER,
+                env=demo_env,
+                stdout=log_file,
+                stderr=log_file
+            )
+            update.returncode = await process.wait()
+        update.seconds = time.perf_counter() - start
+    return update
+
+
+if __name__ == "__main__":
+    cli()
@@ -3,35 +3,79 @@
 # dependencies = [
 #   "cookiecutter",
 #   "cruft",
+#   "platformdirs",
 #   "python-dotenv",
 #   "typer",
 # ]
 # ///
 """Module containing utility functions used throughout cookiecutter_robust_python scripts."""
 
+import asyncio
+import atexit
+import cProfile
+import filecmp
+import hashlib
+import http.client
+import io
+import itertools
 import json
+import multiprocessing
 import os
+import pstats
+import re
 import shutil
 import stat
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import weakref
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
 from functools import partial
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
+from pathlib import PurePosixPath
 from typing import Any
 from typing import Callable
+from typing import Coroutine
 from typing import Generator
+from typing import Iterable
 from typing import Literal
 from typing import Optional
+from typing import TypeVar
 from typing import overload
 
+import cookiecutter
 import cruft
+import platformdirs
 import typer
 
+from binaryornot.check import is_binary
+from cookiecutter.exceptions import UndefinedVariableInTemplate
+from cookiecutter.generate import generate_context
+from cookiecutter.generate import is_copy_only_path
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.utils import create_env_with_context
 from cookiecutter.utils import work_in
 from cruft._commands.utils.cruft import get_cruft_file
+from cruft._commands.utils.cruft import json_dumps
 from dotenv import load_dotenv
+from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import FileSystemLoader
+from jinja2 import Template
+from jinja2 import UndefinedError
+from jinja2 import nodes
+from jinja2.bccache import Bucket
 from typer.models import OptionInfo
 
 
@@ -59,6 +103,9 @@ _load_env()
 FolderOption: partial[OptionInfo] = partial(
     typer.Option, dir_okay=True, file_okay=False, resolve_path=True, path_type=Path
 )
+ProfileOption: partial[OptionInfo] = partial(
+    typer.Option, help="Write cProfile data and per-phase timings for the run to the profiles cache folder."
+)
 
 
 @dataclass
@@ -87,6 +134,60 @@ DEMO: RepoMetadata = RepoMetadata(
     develop_branch=os.getenv("ROBUST_DEMO__DEVELOP_BRANCH")
 )
 
+COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER: Path = Path(
+    platformdirs.user_cache_path(
+        appname="cookiecutter-robust-python",
+        appauthor=os.getenv("COOKIECUTTER_ROBUST_PYTHON__APP_AUTHOR", "robust-python"),
+        ensure_exists=True,
+    )
+).resolve()
+RENDER_CACHE_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "renders"
+RENDER_BLOBS_FOLDER: Path = RENDER_CACHE_FOLDER / "blobs"
+RENDER_MANIFESTS_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "render-manifests"
+BYTECODE_CACHE_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "bytecode"
+PROFILES_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "profiles"
+BENCHMARK_HISTORY_PATH: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "benchmarks" / "history.json"
+CHANGELOG_CACHE_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "changelog"
+
+# uv cache and interpreter pool shared by every demo workflow, with records of each lockfile already warmed up
+UV_CACHE_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "uv"
+UV_PYTHON_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "uv-python"
+UV_WARM_UPS_FOLDER: Path = COOKIECUTTER_ROBUST_PYTHON__CACHE_FOLDER / "uv-warm-ups"
+
+
+TEMPLATE_PROJECT_FOLDER: Path = REPO_FOLDER / "{{cookiecutter.project_name}}"
+
+# Folders within the demos cache holding each demo's bare store and the worktrees checked out from it
+DEMO_STORES_FOLDER_NAME: str = ".stores"
+DEMO_WORKTREES_FOLDER_NAME: str = ".worktrees"
+
+# Start of the lock reason of a demo worktree, followed by the PID of the process using it
+DEMO_WORKTREE_LOCK_REASON_PREFIX: str = "in use by pid "
+
+# How repos in the demos cache fetch from their remotes, either "full" or "partial" to leave blobs on the remote until
+# a checkout reads them
+DEMO_FETCH_MODES: tuple[str, ...] = ("full", "partial")
+DEMO_FETCH_MODE: str = os.getenv("COOKIECUTTER_ROBUST_PYTHON__DEMO_FETCH_MODE") or "partial"
+DEMO_PARTIAL_CLONE_FILTER: str = "blob:none"
+
+# Marks a template file that reads the cookiecutter context as a whole rather than specific variables
+ALL_CONTEXT_VARIABLES: str = "*"
+
+# Paths within the template repo that affect the rendered output of a project
+TEMPLATE_RENDER_INPUTS: tuple[str, ...] = ("cookiecutter.json", "hooks", "{{cookiecutter.project_name}}")
+
+# Linux ioctl request for cloning a file's extents into another file, see ioctl_ficlone(2)
+FICLONE: int = 0x40049409
+
+WRITE_PERMISSIONS: int = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+@dataclass(frozen=True)
+class TemplateState:
+    """Snapshot of the template repo's HEAD as seen by cruft when rendering."""
+    commit: str
+    trees: tuple[str, ...]
+
 
 def remove_readonly(func: Callable[[str], Any], path: str, _: Any) -> None:
     """Clears the readonly bit and attempts to call the provided function.
@@ -98,64 +199,705 @@ def remove_readonly(func: Callable[[str], Any], path: str, _: Any) -> None:
 
 
 @overload
-def run_command(command: str, *args: str, ignore_error: Literal[True]) -> Optional[subprocess.CompletedProcess]:
+def run_command(
+    command: str, *args: str, ignore_error: Literal[True], env: Optional[dict[str, str]] = None
+) -> Optional[subprocess.CompletedProcess]:
     ...
 
 
 @overload
-def run_command(command: str, *args: str, ignore_error: Literal[False] = ...) -> subprocess.CompletedProcess:
+def run_command(
+    command: str, *args: str, ignore_error: Literal[False] = ..., env: Optional[dict[str, str]] = None
+) -> subprocess.CompletedProcess:
     ...
 
 
-def run_command(command: str, *args: str, ignore_error: bool = False) -> Optional[subprocess.CompletedProcess]:
-    """Runs the provided command in a subprocess."""
+def run_command(
+    command: str, *args: str, ignore_error: bool = False, env: Optional[dict[str, str]] = None
+) -> Optional[subprocess.CompletedProcess]:
+    """Runs the provided command in a subprocess, recording it to the command tracer if tracing is enabled.
+
+    Any given environment variables are set for the command on top of the current environment. Cached git queries are
+    invalidated after any command other than a read-only git query, as tools such as nox, uv and pre-commit may change
+    a repository too.
+    """
+    start: float = time.time()
+    command_env: Optional[dict[str, str]] = {**os.environ, **env} if env else None
     try:
-        process = subprocess.run([command, *args], check=True, capture_output=True, text=True)
+        with profile_phase(" ".join([command, *args[:1]])):
+            process = subprocess.run([command, *args], check=True, capture_output=True, text=True, env=command_env)
+        _trace_command(command, args, start=start, process=process)
         return process
     except subprocess.CalledProcessError as error:
+        _trace_command(command, args, start=start, process=error)
         if ignore_error:
             return None
         print(error.stdout, end="")
         print(error.stderr, end="", file=sys.stderr)
         raise error
+    finally:
+        if not is_read_only_git_command(command, *args):
+            invalidate_git_queries()
+
+
+# git subcommands that may move refs, HEAD or the index, after which cached git queries are stale
+MUTATING_GIT_COMMANDS: frozenset[str] = frozenset({
+    "add", "am", "apply", "bisect", "branch", "checkout", "cherry-pick", "clean", "clone", "commit", "fast-import",
+    "fetch", "filter-branch", "gc", "init", "maintenance", "merge", "mv", "notes", "pack-refs", "prune", "pull", "push",
+    "read-tree", "rebase", "reflog", "remote", "repack", "replace", "reset", "restore", "revert", "rm",
+    "sparse-checkout", "stash", "submodule", "switch", "symbolic-ref", "tag", "update-index", "update-ref", "worktree",
+})
+
+
+@overload
+def git(*args: str, ignore_error: Literal[True]) -> Optional[subprocess.CompletedProcess]:
+    ...
+
+
+@overload
+def git(*args: str, ignore_error: Literal[False] = ...) -> subprocess.CompletedProcess:
+    ...
+
+
+def git(*args: str, ignore_error: bool = False) -> Optional[subprocess.CompletedProcess]:
+    """Runs git, with run_command invalidating cached git queries whenever the command may change a repository."""
+    return run_command("git", *args, ignore_error=ignore_error)
+
+
+def is_read_only_git_command(command: str, *args: str) -> bool:
+    """Returns whether the command is a git command that can't change a repository."""
+    return command == "git" and not is_mutating_git_command(*args)
+
+
+def is_mutating_git_command(*args: str) -> bool:
+    """Returns whether the git arguments run a subcommand that may change a repository."""
+    arguments: Iterable[str] = iter(args)
+    for argument in arguments:
+        if argument in ("-C", "-c"):
+            next(arguments, None)
+        elif not argument.startswith("-"):
+            return argument in MUTATING_GIT_COMMANDS
+    return False
+
+
+def get_shared_uv_env() -> dict[str, str]:
+    """Returns the environment variables pointing uv at the uv cache and interpreter pool shared by demo workflows.
+
+    A uv cache or interpreter folder already set in the environment is left as is.
+    """
+    return {
+        "UV_CACHE_DIR": os.getenv("UV_CACHE_DIR") or str(UV_CACHE_FOLDER),
+        "UV_PYTHON_INSTALL_DIR": os.getenv("UV_PYTHON_INSTALL_DIR") or str(UV_PYTHON_FOLDER),
+    }
+
+
+@overload
+def uv(*args: str, ignore_error: Literal[True]) -> Optional[subprocess.CompletedProcess]:
+    ...
+
+
+@overload
+def uv(*args: str, ignore_error: Literal[False] = ...) -> subprocess.CompletedProcess:
+    ...
+
+
+def uv(*args: str, ignore_error: bool = False) -> Optional[subprocess.CompletedProcess]:
+    """Runs uv with the shared uv cache and interpreter pool, so every demo workflow reuses the same wheels."""
+    return run_command("uv", *args, ignore_error=ignore_error, env=get_shared_uv_env())
+
+
+@overload
+def nox(*args: str, ignore_error: Literal[True]) -> Optional[subprocess.CompletedProcess]:
+    ...
+
+
+@overload
+def nox(*args: str, ignore_error: Literal[False] = ...) -> subprocess.CompletedProcess:
+    ...
+
+
+def nox(*args: str, ignore_error: bool = False) -> Optional[subprocess.CompletedProcess]:
+    """Runs nox with the shared uv cache and interpreter pool, which the uv its sessions run then uses too."""
+    return run_command("nox", *args, ignore_error=ignore_error, env=get_shared_uv_env())
 
 
-git: partial[subprocess.CompletedProcess] = partial(run_command, "git")
-uv: partial[subprocess.CompletedProcess] = partial(run_command, "uv")
-nox: partial[subprocess.CompletedProcess] = partial(run_command, "nox")
 gh: partial[subprocess.CompletedProcess] = partial(run_command, "gh")
 
+# Maximum number of commands run_command_async runs at once within an event loop
+MAX_CONCURRENT_COMMANDS: int = int(os.getenv("COOKIECUTTER_ROBUST_PYTHON__MAX_CONCURRENT_COMMANDS", 8))
+
+_COMMAND_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def run_command_async(
+    command: str, *args: str, ignore_error: bool = False
+) -> Optional[subprocess.CompletedProcess]:
+    """Runs the provided command in a subprocess without blocking the event loop.
+
+    Behaves like run_command, except that no more than MAX_CONCURRENT_COMMANDS run at once so that independent
+    queries can be gathered freely.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    semaphore: asyncio.Semaphore = _COMMAND_SEMAPHORES.setdefault(loop, asyncio.Semaphore(MAX_CONCURRENT_COMMANDS))
+    async with semaphore:
+        start: float = time.time()
+        try:
+            process: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+                command, *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+        finally:
+            if not is_read_only_git_command(command, *args):
+                invalidate_git_queries()
+    completed: subprocess.CompletedProcess = subprocess.CompletedProcess(
+        [command, *args], returncode=process.returncode, stdout=stdout.decode(), stderr=stderr.decode()
+    )
+    _trace_command(command, args, start=start, process=completed)
+    if completed.returncode == 0:
+        return completed
+    if ignore_error:
+        return None
+    print(completed.stdout, end="")
+    print(completed.stderr, end="", file=sys.stderr)
+    raise subprocess.CalledProcessError(
+        completed.returncode, completed.args, output=completed.stdout, stderr=completed.stderr
+    )
+
+
+async def git_async(*args: str, ignore_error: bool = False) -> Optional[subprocess.CompletedProcess]:
+    """Async counterpart of git, with run_command_async invalidating cached git queries the same way."""
+    return await run_command_async("git", *args, ignore_error=ignore_error)
+
+
+gh_async: partial[Coroutine[Any, Any, subprocess.CompletedProcess]] = partial(run_command_async, "gh")
+
+_T = TypeVar("_T")
+
+
+def run_sync(coroutine: Coroutine[Any, Any, _T]) -> _T:
+    """Runs the coroutine to completion on a new event loop for a synchronous caller, like asyncio.run.
+
+    Called from within a running event loop, which asyncio.run can't start another loop in, the coroutine is closed
+    unawaited and a RuntimeError tells the caller to await the async counterpart instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    coroutine.close()
+    raise RuntimeError(
+        f"{coroutine.__qualname__} can't be run synchronously from within a running event loop, await it instead."
+    )
+
+
+@dataclass(frozen=True)
+class CommandTrace:
+    """Record of a single command run through run_command."""
+    command: str
+    args: tuple[str, ...]
+    cwd: str
+    start: float
+    duration: float
+    returncode: int
+    output_size: int
+    thread: int
+
+    @property
+    def name(self) -> str:
+        """The command along with its subcommand, such as 'git merge-base'."""
+        return " ".join([self.command, *self.args[:1]])
+
+
+class CommandTracer:
+    """Records every command run through run_command and exports them once the script exits."""
+
+    def __init__(self, trace_path: Path) -> None:
+        """Initializes the tracer to write Chrome trace-event JSON to the given path."""
+        self.trace_path: Path = trace_path
+        self.traces: list[CommandTrace] = []
+
+    def to_trace_events(self) -> list[dict[str, Any]]:
+        """Returns the recorded commands as complete events of the Chrome trace-event format."""
+        return [
+            {
+                "name": trace.name,
+                "cat": trace.command,
+                "ph": "X",
+                "ts": round(trace.start * 1_000_000),
+                "dur": round(trace.duration * 1_000_000),
+                "pid": os.getpid(),
+                "tid": trace.thread,
+                "args": {
+                    "args": list(trace.args),
+                    "cwd": trace.cwd,
+                    "returncode": trace.returncode,
+                    "output_size": trace.output_size,
+                },
+            }
+            for trace in self.traces
+        ]
+
+    def get_summary(self) -> str:
+        """Returns a table of the number of calls, failures and time spent per command, slowest first."""
+        groups: dict[str, list[CommandTrace]] = {}
+        for trace in self.traces:
+            groups.setdefault(trace.name, []).append(trace)
+
+        lines: list[str] = [f"{'calls':>6}{'failed':>8}{'total':>10}{'mean':>10}{'max':>10}  command"]
+        for name, traces in sorted(groups.items(), key=lambda item: sum(t.duration for t in item[1]), reverse=True):
+            durations: list[float] = [trace.duration for trace in traces]
+            failures: int = sum(trace.returncode != 0 for trace in traces)
+            lines.append(
+                f"{len(traces):>6}{failures:>8}{sum(durations):>10.3f}{sum(durations) / len(durations):>10.3f}"
+                f"{max(durations):>10.3f}  {name}"
+            )
+        return "\n".join(lines)
+
+    def write(self) -> None:
+        """Adds the recorded commands to the trace file and prints the aggregate table.
+
+        Events already in the trace file are kept, so scripts run one after another share a single timeline.
+        """
+        if not self.traces:
+            return
+
+        events: list[dict[str, Any]] = []
+        if self.trace_path.is_file() and self.trace_path.stat().st_size > 0:
+            events = json.loads(self.trace_path.read_text()).get("traceEvents", [])
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self.trace_path.write_text(json.dumps({"traceEvents": [*events, *self.to_trace_events()]}))
+        typer.secho(self.get_summary(), err=True)
+        typer.secho(f"Wrote {len(self.traces)} command trace(s) to {self.trace_path}.", fg="green", err=True)
+
+
+def _get_command_tracer() -> Optional[CommandTracer]:
+    """Returns a tracer writing to COOKIECUTTER_ROBUST_PYTHON__TRACE_FILE if it is set, exporting it at exit."""
+    trace_file: str = os.getenv("COOKIECUTTER_ROBUST_PYTHON__TRACE_FILE", "")
+    if not trace_file:
+        return None
+    tracer: CommandTracer = CommandTracer(trace_path=Path(trace_file).resolve())
+    atexit.register(tracer.write)
+    return tracer
+
+
+def _trace_command(
+    command: str,
+    args: tuple[str, ...],
+    start: float,
+    process: subprocess.CompletedProcess | subprocess.CalledProcessError
+) -> None:
+    """Records a finished command to the command tracer if tracing is enabled."""
+    if _TRACER is None:
+        return
+    _TRACER.traces.append(CommandTrace(
+        command=command,
+        args=args,
+        cwd=str(Path.cwd()),
+        start=start,
+        duration=time.time() - start,
+        returncode=process.returncode,
+        output_size=len(process.stdout or "") + len(process.stderr or ""),
+        thread=threading.get_ident()
+    ))
+
+
+# Tracer of every command run through run_command, only set when tracing is enabled through the environment
+_TRACER: Optional[CommandTracer] = _get_command_tracer()
+
+
+class PhaseProfiler:
+    """Collects cProfile data and wall-clock timings of nested phases for a single script run."""
+
+    def __init__(self, name: str) -> None:
+        """Initializes the profiler for the script with the given name."""
+        self.name: str = name
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self.timings: dict[str, list[float]] = {}
+        self._phases: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Returns a context manager timing the enclosed code as a phase nested within any currently running phase."""
+        self._phases.append(name)
+        key: str = " > ".join(self._phases)
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(key, []).append(time.perf_counter() - start)
+            self._phases.pop()
+
+    def get_summary(self, limit: int = 30) -> str:
+        """Returns the phase timings sorted by total time, followed by the slowest functions by cumulative time."""
+        lines: list[str] = [f"{'seconds':>10}{'calls':>8}  phase"]
+        for key, durations in sorted(self.timings.items(), key=lambda item: sum(item[1]), reverse=True):
+            lines.append(f"{sum(durations):>10.3f}{len(durations):>8}  {key}")
+
+        stream: io.StringIO = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return "\n".join([*lines, "", stream.getvalue()])
+
+    def write_report(self, output_folder: Path) -> Path:
+        """Writes the cProfile data as a .prof file alongside a .txt summary and returns the .prof path."""
+        output_folder.mkdir(parents=True, exist_ok=True)
+        timestamp: str = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%S")
+        profile_path: Path = output_folder / f"{self.name}-{timestamp}.prof"
+        self.profile.dump_stats(profile_path)
+        profile_path.with_suffix(".txt").write_text(self.get_summary())
+        return profile_path
+
+
+# Profiler of the running script when profiling was requested, used by profile_phase
+_PROFILER: Optional[PhaseProfiler] = None
+
+
+@contextmanager
+def profiling(name: str, enabled: bool) -> Generator[None, None, None]:
+    """Returns a context manager that profiles the enclosed script run when enabled.
+
+    The cProfile data covers the in-process work such as rendering, cruft and retrocookie, while each phase marked
+    with profile_phase and each command run through run_command is timed by wall clock. Both are written to the
+    profiles cache folder once the run finishes.
+    """
+    global _PROFILER
+    if not enabled:
+        yield
+        return
+
+    _PROFILER = PhaseProfiler(name=name)
+    _PROFILER.profile.enable()
+    try:
+        with _PROFILER.phase(name):
+            yield
+    finally:
+        _PROFILER.profile.disable()
+        profile_path: Path = _PROFILER.write_report(output_folder=PROFILES_FOLDER)
+        typer.secho(_PROFILER.get_summary(limit=15), err=True)
+        typer.secho(f"Wrote profile to {profile_path} and summary to {profile_path.with_suffix('.txt')}.", fg="green")
+        _PROFILER = None
+
+
+@contextmanager
+def profile_phase(name: str) -> Generator[None, None, None]:
+    """Returns a context manager timing the enclosed code as a phase of the run if it is being profiled."""
+    if _PROFILER is None:
+        yield
+        return
+
+    with _PROFILER.phase(name):
+        yield
+
+
+# Full object ids, either SHA-1 or SHA-256
+OBJECT_ID_PATTERN: re.Pattern[str] = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+# Anything git check-ref-format rejects anywhere within a refname
+INVALID_REFNAME_PATTERN: re.Pattern[str] = re.compile(r"\.\.|@\{|//|[\x00-\x20\x7f~^:?*\[\\]")
+
+
+def is_valid_refname(refname: str) -> bool:
+    """Returns whether the refname is HEAD or a well-formed ref under refs/, following `git check-ref-format`."""
+    if refname == "HEAD":
+        return True
+    if not refname.startswith("refs/") or refname.endswith(("/", ".")) or INVALID_REFNAME_PATTERN.search(refname):
+        return False
+    return not any(component.startswith(".") or component.endswith(".lock") for component in refname.split("/"))
+
+
+# Refs that belong to a single worktree rather than the repository they share
+PER_WORKTREE_REFS: tuple[str, ...] = ("HEAD", "refs/bisect/", "refs/worktree/", "refs/rewritten/")
+
+
+class GitRepository:
+    """Answers read-only git queries for a repository without spawning a git process per query.
+
+    Refs are read straight from the files in the git folder, and objects are read through a single long-lived
+    `git cat-file --batch` process whose results are kept in memory. Revisions the files can't answer, such as
+    expressions like 'HEAD~1' or repositories using reftable, fall back to `git rev-parse`.
+
+    Resolved refs and the current branch are memoized until invalidate is called, which run_command does after every
+    command that may change a repository. Ancestry checks are left to `git merge-base --is-ancestor`, with results
+    keyed by the commits the refs resolved to, so they never go stale.
+    """
+
+    def __init__(self, git_folder: Path, common_folder: Path) -> None:
+        """Initializes the reader for the given git folder and the folder it shares objects and refs with."""
+        self.git_folder: Path = git_folder
+        self.common_folder: Path = common_folder
+        self.uses_ref_files: bool = not (common_folder / "reftable").is_dir()
+        self._packed_refs: tuple[int, dict[str, str]] = (-1, {})
+        self._ancestry: dict[tuple[str, str], bool] = {}
+        self._revisions: dict[str, Optional[str]] = {}
+        self._current_branch: Optional[str] = None
+        self._batch_process: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def discover(cls, path: Path) -> Optional["GitRepository"]:
+        """Returns a reader for the repository containing the given path, or None if it isn't in one."""
+        for folder in [path, *path.parents]:
+            dot_git: Path = folder / ".git"
+            if dot_git.is_dir():
+                git_folder: Path = dot_git
+            elif dot_git.is_file() and dot_git.read_text().startswith("gitdir:"):
+                git_folder: Path = (folder / dot_git.read_text().removeprefix("gitdir:").strip()).resolve()
+            elif (folder / "HEAD").is_file() and (folder / "objects").is_dir():
+                git_folder: Path = folder
+            else:
+                continue
+            common_folder: Path = git_folder
+            commondir_file: Path = git_folder / "commondir"
+            if commondir_file.is_file():
+                common_folder: Path = (git_folder / commondir_file.read_text().strip()).resolve()
+            return cls(git_folder=git_folder, common_folder=common_folder)
+        return None
+
+    def get_current_branch(self) -> str:
+        """Returns the checked out branch, or an empty string when HEAD is detached like `git branch --show-current`."""
+        if self._current_branch is None:
+            self._current_branch = self._read_current_branch()
+        return self._current_branch
+
+    def resolve(self, revision: str) -> Optional[str]:
+        """Returns the object id the revision points to, or None if it doesn't exist.
+
+        Short names are looked up in the same order `git rev-parse` uses.
+        """
+        if revision not in self._revisions:
+            self._revisions[revision] = self._resolve(revision)
+        return self._revisions[revision]
+
+    def is_ancestor(self, ancestor: str, descendent: str) -> bool:
+        """Returns whether the ancestor is reachable from the descendent, like `git merge-base --is-ancestor`."""
+        ancestor_id: Optional[str] = self._peel_to_commit(self.resolve(ancestor))
+        descendent_id: Optional[str] = self._peel_to_commit(self.resolve(descendent))
+        if ancestor_id is None or descendent_id is None:
+            return False
+        if (ancestor_id, descendent_id) not in self._ancestry:
+            self._ancestry[ancestor_id, descendent_id] = self._is_ancestor(ancestor_id, descendent_id)
+        return self._ancestry[ancestor_id, descendent_id]
+
+    def invalidate(self) -> None:
+        """Forgets every memoized ref and branch lookup, keeping only what is keyed by immutable object ids."""
+        self._revisions.clear()
+        self._current_branch = None
+        self.uses_ref_files = not (self.common_folder / "reftable").is_dir()
+
+    def _read_current_branch(self) -> str:
+        """Reads the checked out branch from HEAD."""
+        if not self.uses_ref_files:
+            return run_command("git", f"--git-dir={self.git_folder}", "branch", "--show-current").stdout.strip()
+        head: str = (self.git_folder / "HEAD").read_text().strip()
+        return head.removeprefix("ref: refs/heads/") if head.startswith("ref: refs/heads/") else ""
+
+    def _resolve(self, revision: str) -> Optional[str]:
+        """Resolves the revision from the ref files, falling back to `git rev-parse`."""
+        if OBJECT_ID_PATTERN.fullmatch(revision):
+            return revision
+        if self.uses_ref_files:
+            for refname in (
+                revision,
+                f"refs/{revision}",
+                f"refs/tags/{revision}",
+                f"refs/heads/{revision}",
+                f"refs/remotes/{revision}",
+                f"refs/remotes/{revision}/HEAD",
+            ):
+                object_id: Optional[str] = self._read_ref(refname)
+                if object_id is not None:
+                    return object_id
+        result: Optional[subprocess.CompletedProcess] = git(
+            f"--git-dir={self.git_folder}", "rev-parse", "--verify", "--quiet", revision, ignore_error=True
+        )
+        return result.stdout.strip() if result is not None else None
+
+    def _is_ancestor(self, ancestor_id: str, descendent_id: str) -> bool:
+        """Asks `git merge-base --is-ancestor`, which stops walking history early using the commit-graph."""
+        if ancestor_id == descendent_id:
+            return True
+        result: Optional[subprocess.CompletedProcess] = git(
+            f"--git-dir={self.git_folder}", "merge-base", "--is-ancestor", ancestor_id, descendent_id, ignore_error=True
+        )
+        return result is not None
+
+    def close(self) -> None:
+        """Stops the `git cat-file --batch` process if it was started."""
+        if self._batch_process is not None:
+            self._batch_process.stdin.close()
+            self._batch_process.wait()
+            self._batch_process = None
+
+    def _read_ref(self, refname: str, depth: int = 0) -> Optional[str]:
+        """Returns the object id of the ref, following symbolic refs, or None if it doesn't exist.
+
+        Only HEAD and well-formed refs under refs/ are read, so neither a revision nor a symbolic ref's target can
+        point the lookup at a file outside of the refs.
+        """
+        if not is_valid_refname(refname):
+            return None
+        is_per_worktree: bool = any(refname == ref or refname.startswith(ref) for ref in PER_WORKTREE_REFS)
+        ref_path: Path = (self.git_folder if is_per_worktree else self.common_folder) / refname
+        if ref_path.is_file():
+            value: Optional[str] = ref_path.read_text().strip()
+        else:
+            value: Optional[str] = self._get_packed_refs().get(refname)
+
+        if value is None or depth > 5:
+            return None
+        if value.startswith("ref: "):
+            return self._read_ref(value.removeprefix("ref: "), depth=depth + 1)
+        return value
+
+    def _get_packed_refs(self) -> dict[str, str]:
+        """Returns the refs in packed-refs, only re-reading the file after it changes."""
+        packed_refs_path: Path = self.common_folder / "packed-refs"
+        modified: int = packed_refs_path.stat().st_mtime_ns if packed_refs_path.is_file() else 0
+        if self._packed_refs[0] != modified:
+            packed_refs: dict[str, str] = {}
+            if modified:
+                for line in packed_refs_path.read_text().splitlines():
+                    if line and not line.startswith(("#", "^")):
+                        object_id, _, refname = line.partition(" ")
+                        packed_refs[refname] = object_id
+            self._packed_refs = (modified, packed_refs)
+        return self._packed_refs[1]
+
+    def _peel_to_commit(self, object_id: Optional[str]) -> Optional[str]:
+        """Returns the commit an annotated tag points to, or the object id itself for anything else."""
+        for _ in range(5):
+            git_object: Optional[tuple[str, bytes]] = self._read_object(object_id) if object_id else None
+            if git_object is None or git_object[0] != "tag":
+                return object_id
+            object_id = git_object[1].split(b"\n", 1)[0].removeprefix(b"object ").decode("ascii")
+        return None
+
+    def _read_object(self, object_id: str) -> Optional[tuple[str, bytes]]:
+        """Returns the type and contents of the object, or None if it is missing."""
+        if self._batch_process is None:
+            # A fixed git command, resolved from PATH the same way run_command resolves it
+            self._batch_process = subprocess.Popen(  # noqa: S603
+                ["git", f"--git-dir={self.git_folder}", "cat-file", "--batch"],  # noqa: S607
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            atexit.register(self.close)
+        self._batch_process.stdin.write(f"{object_id}\n".encode("ascii"))
+        self._batch_process.stdin.flush()
+        header: list[str] = self._batch_process.stdout.readline().decode("ascii").split()
+        if len(header) != 3:
+            return None
+        _, object_type, size = header
+        contents: bytes = self._batch_process.stdout.read(int(size))
+        self._batch_process.stdout.read(1)
+        return object_type, contents
+
+
+# Readers for every repository queried by this process, keyed by git folder
+_GIT_REPOSITORIES: dict[Path, GitRepository] = {}
+
+# Git folder of the repository containing each queried path, until the next command that may change a repository
+_GIT_FOLDERS: dict[Path, Optional[Path]] = {}
+
+
+def get_git_repository(path: Optional[Path] = None) -> Optional[GitRepository]:
+    """Returns the shared reader for the repository containing the given path, defaulting to the current folder."""
+    path: Path = (path or Path.cwd()).resolve()
+    if path not in _GIT_FOLDERS:
+        repository: Optional[GitRepository] = GitRepository.discover(path)
+        if repository is not None:
+            _GIT_REPOSITORIES.setdefault(repository.git_folder, repository)
+        _GIT_FOLDERS[path] = repository.git_folder if repository is not None else None
+    git_folder: Optional[Path] = _GIT_FOLDERS[path]
+    return _GIT_REPOSITORIES[git_folder] if git_folder is not None else None
+
+
+def invalidate_git_queries() -> None:
+    """Forgets memoized git queries for every repository, for use after anything that may have changed one."""
+    _GIT_FOLDERS.clear()
+    for repository in _GIT_REPOSITORIES.values():
+        repository.invalidate()
+
+
+@contextmanager
+def invalidating_git_queries() -> Generator[None, None, None]:
+    """Returns a context manager that forgets memoized git queries once the work within it is done.
+
+    Meant for in-process tools such as cruft and retrocookie, which change repositories without going through
+    run_command.
+    """
+    try:
+        yield
+    finally:
+        invalidate_git_queries()
+
 
 def require_clean_and_up_to_date_demo_repo(demo_path: Path) -> None:
-    """Checks if the repo is clean and up to date with any important branches."""
+    """Checks if the repo is clean and up to date with any important branches.
+
+    Worktrees of a demo store share the fetch ensure_demo_store made when adding them, so only a regular demo checkout
+    is fetched here first.
+    """
     try:
+        if (demo_path / ".git").is_dir():
+            fetch_demo_remote(repo_path=demo_path, branches=[DEMO.main_branch])
         with work_in(demo_path):
-            git("fetch")
-            git("fetch", "origin", f"{DEMO.main_branch}:{DEMO.main_branch}")
-            git("status", "--porcelain")
-            validate_is_synced_ancestor(ancestor=DEMO.main_branch, descendent=DEMO.develop_branch)
+            run_sync(_check_demo_repo_state())
     except Exception as e:
         typer.secho(f"Failed initial repo state check.")
         raise e
 
 
+async def _check_demo_repo_state() -> None:
+    """Checks the status and branch ancestry of the demo repo concurrently, once it has been fetched."""
+    await asyncio.gather(
+        git_async("status", "--porcelain"),
+        validate_is_synced_ancestor_async(ancestor=DEMO.main_branch, descendent=DEMO.develop_branch)
+    )
+
+
 def validate_is_synced_ancestor(ancestor: str, descendent: str) -> None:
     """Returns whether the given ancestor is actually an up-to-date ancestor of the given descendent branch."""
-    if not is_branch_synced_with_remote(branch=descendent):
+    run_sync(validate_is_synced_ancestor_async(ancestor=ancestor, descendent=descendent))
+
+
+async def validate_is_synced_ancestor_async(ancestor: str, descendent: str) -> None:
+    """Async counterpart of validate_is_synced_ancestor, running every ancestry check at once.
+
+    Failures are still reported in the same order validate_is_synced_ancestor checks them.
+    """
+    descendent_synced, ancestor_synced, is_ancestor_of_descendent = await asyncio.gather(
+        is_branch_synced_with_remote_async(branch=descendent),
+        is_branch_synced_with_remote_async(branch=ancestor),
+        is_ancestor_async(ancestor=ancestor, descendent=descendent)
+    )
+    if not descendent_synced:
         raise ValueError(f"{descendent} is not synced with origin/{descendent}")
-    if not is_branch_synced_with_remote(branch=ancestor):
+    if not ancestor_synced:
         raise ValueError(f"{ancestor} is not synced with origin/{ancestor}")
-    if not is_ancestor(ancestor=ancestor, descendent=descendent):
+    if not is_ancestor_of_descendent:
         raise ValueError(f"{ancestor} is not an ancestor of {descendent}")
 
 
 def is_branch_synced_with_remote(branch: str) -> bool:
     """Checks if the branch is synced with its remote."""
-    return is_ancestor(branch, f"origin/{branch}") and is_ancestor(f"origin/{branch}", branch)
+    return run_sync(is_branch_synced_with_remote_async(branch=branch))
+
+
+async def is_branch_synced_with_remote_async(branch: str) -> bool:
+    """Async counterpart of is_branch_synced_with_remote, checking both directions at once."""
+    results: list[bool] = await asyncio.gather(
+        is_ancestor_async(branch, f"origin/{branch}"), is_ancestor_async(f"origin/{branch}", branch)
+    )
+    return all(results)
 
 
 def is_ancestor(ancestor: str, descendent: str) -> bool:
     """Checks if the branch is synced with its remote."""
+    repository: Optional[GitRepository] = get_git_repository()
+    if repository is not None:
+        return repository.is_ancestor(ancestor=ancestor, descendent=descendent)
     try:
         git("merge-base", "--is-ancestor", ancestor, descendent)
         return True
@@ -163,14 +905,371 @@ def is_ancestor(ancestor: str, descendent: str) -> bool:
         return False
 
 
+async def is_ancestor_async(ancestor: str, descendent: str) -> bool:
+    """Async counterpart of is_ancestor, falling back to a concurrent merge-base outside of a repository reader."""
+    repository: Optional[GitRepository] = get_git_repository()
+    if repository is not None:
+        return repository.is_ancestor(ancestor=ancestor, descendent=descendent)
+    result: Optional[subprocess.CompletedProcess] = await git_async(
+        "merge-base", "--is-ancestor", ancestor, descendent, ignore_error=True
+    )
+    return result is not None
+
+
 def get_current_branch() -> str:
     """Returns the current branch name."""
-    return git("branch", "--show-current").stdout.strip()
+    repository: Optional[GitRepository] = get_git_repository()
+    if repository is None:
+        return git("branch", "--show-current").stdout.strip()
+    return repository.get_current_branch()
 
 
 def get_current_commit() -> str:
     """Returns the current commit reference."""
-    return git("rev-parse", "HEAD").stdout.strip()
+    repository: Optional[GitRepository] = get_git_repository()
+    commit: Optional[str] = repository.resolve("HEAD") if repository is not None else None
+    if commit is None:
+        return git("rev-parse", "HEAD").stdout.strip()
+    return commit
+
+
+GITHUB_API_URL: str = os.getenv("COOKIECUTTER_ROBUST_PYTHON__GITHUB_API_URL") or "https://api.github.com"
+
+FIND_PULL_REQUEST_QUERY: str = """
+query FindPullRequest($owner: String!, $name: String!, $head: String!, $base: String!) {
+  viewer { id }
+  repository(owner: $owner, name: $name) {
+    id
+    pullRequests(headRefName: $head, baseRefName: $base, states: [OPEN], first: 1) {
+      nodes { id number url headRef { id } }
+    }
+  }
+}
+"""
+CREATE_PULL_REQUEST_MUTATION: str = """
+mutation CreatePullRequest($repositoryId: ID!, $head: String!, $base: String!, $title: String!, $body: String!) {
+  createPullRequest(
+    input: {repositoryId: $repositoryId, headRefName: $head, baseRefName: $base, title: $title, body: $body}
+  ) {
+    pullRequest { id number url headRef { id } }
+  }
+}
+"""
+ADD_ASSIGNEES_MUTATION: str = """
+mutation AddAssignees($assignableId: ID!, $assigneeIds: [ID!]!) {
+  addAssigneesToAssignable(input: {assignableId: $assignableId, assigneeIds: $assigneeIds}) { clientMutationId }
+}
+"""
+ENABLE_AUTO_MERGE_MUTATION: str = """
+mutation EnableAutoMerge($pullRequestId: ID!) {
+  enablePullRequestAutoMerge(input: {pullRequestId: $pullRequestId, mergeMethod: MERGE}) { clientMutationId }
+}
+"""
+MERGE_PULL_REQUEST_MUTATION: str = """
+mutation MergePullRequest($pullRequestId: ID!) {
+  mergePullRequest(input: {pullRequestId: $pullRequestId, mergeMethod: MERGE}) { clientMutationId }
+}
+"""
+MERGE_PULL_REQUEST_AND_DELETE_REF_MUTATION: str = """
+mutation MergePullRequestAndDeleteRef($pullRequestId: ID!, $headRefId: ID!) {
+  mergePullRequest(input: {pullRequestId: $pullRequestId, mergeMethod: MERGE}) { clientMutationId }
+  deleteRef(input: {refId: $headRefId}) { clientMutationId }
+}
+"""
+
+
+@dataclass(frozen=True)
+class PullRequest:
+    """Pull request returned by the GitHubClient."""
+    id: str
+    number: int
+    url: str
+    head_ref_id: Optional[str]
+
+    @classmethod
+    def from_node(cls, node: dict[str, Any]) -> "PullRequest":
+        """Creates the pull request from a GraphQL pull request node."""
+        return cls(
+            id=node["id"], number=node["number"], url=node["url"], head_ref_id=(node.get("headRef") or {}).get("id")
+        )
+
+
+class GitHubClient:
+    """GitHub GraphQL client used for the demo PR automation in place of separate gh processes.
+
+    Each decision the scripts make is answered by a single GraphQL round-trip over one reused connection. Query
+    responses are cached until the next mutation, so a lookup repeated within a run is free.
+    """
+
+    def __init__(self, api_url: str = GITHUB_API_URL, token: Optional[str] = None) -> None:
+        """Initializes the client for the given API root, authenticating the same way gh does by default."""
+        url: urllib.parse.SplitResult = urllib.parse.urlsplit(api_url)
+        self.scheme: str = url.scheme
+        self.netloc: str = url.netloc
+        self.graphql_path: str = f"{url.path.rstrip('/')}/graphql"
+        self._token: Optional[str] = token
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._cache: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def find_pull_request(self, repository: str, head: str, base: str) -> Optional[PullRequest]:
+        """Returns the open pull request from the head branch into the base branch of the 'owner/name' repository."""
+        data: dict[str, Any] = self._find_pull_request(repository=repository, head=head, base=base)
+        nodes: list[dict[str, Any]] = data["repository"]["pullRequests"]["nodes"]
+        return PullRequest.from_node(nodes[0]) if nodes else None
+
+    def create_pull_request(
+        self, repository: str, head: str, base: str, title: str, body: str, assign_viewer: bool = True
+    ) -> PullRequest:
+        """Creates a pull request from the head branch into the base branch, assigned to the viewer by default."""
+        data: dict[str, Any] = self._find_pull_request(repository=repository, head=head, base=base)
+        created: dict[str, Any] = self.execute(CREATE_PULL_REQUEST_MUTATION, variables={
+            "repositoryId": data["repository"]["id"], "head": head, "base": base, "title": title, "body": body
+        })
+        pull_request: PullRequest = PullRequest.from_node(created["createPullRequest"]["pullRequest"])
+        if assign_viewer:
+            self.execute(ADD_ASSIGNEES_MUTATION, variables={
+                "assignableId": pull_request.id, "assigneeIds": [data["viewer"]["id"]]
+            })
+        return pull_request
+
+    def merge_pull_request(self, pull_request: PullRequest) -> None:
+        """Enables auto-merge for the pull request, merging it and deleting its branch right away if already clean.
+
+        Mirrors `gh pr merge --auto --delete-branch --merge`. A pull request without a head ref, such as one whose
+        branch is already deleted, is merged without deleting anything.
+        """
+        try:
+            self.execute(ENABLE_AUTO_MERGE_MUTATION, variables={"pullRequestId": pull_request.id})
+        except ValueError as error:
+            if "clean status" not in str(error):
+                raise
+            if pull_request.head_ref_id is None:
+                self.execute(MERGE_PULL_REQUEST_MUTATION, variables={"pullRequestId": pull_request.id})
+            else:
+                self.execute(MERGE_PULL_REQUEST_AND_DELETE_REF_MUTATION, variables={
+                    "pullRequestId": pull_request.id, "headRefId": pull_request.head_ref_id
+                })
+
+    def execute(self, document: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Runs the GraphQL query or mutation and returns its data, raising a ValueError on any GraphQL errors."""
+        operation_name: str = re.search(r"(?:query|mutation)\s+(\w+)", document).group(1)
+        is_query: bool = document.lstrip().startswith("query")
+        cache_key: tuple[str, str] = (operation_name, json.dumps(variables, sort_keys=True))
+        if is_query and cache_key in self._cache:
+            return self._cache[cache_key]
+        if not is_query:
+            self._cache.clear()
+
+        payload: bytes = json.dumps(
+            {"query": document, "operationName": operation_name, "variables": variables}
+        ).encode("utf-8")
+        with profile_phase(f"github {operation_name}"):
+            response: dict[str, Any] = self._post(payload)
+        if response.get("errors"):
+            messages: str = "; ".join(error.get("message", str(error)) for error in response["errors"])
+            raise ValueError(f"GitHub {operation_name} failed: {messages}")
+        if is_query:
+            self._cache[cache_key] = response["data"]
+        return response["data"]
+
+    def close(self) -> None:
+        """Closes the connection to the API if one is open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _find_pull_request(self, repository: str, head: str, base: str) -> dict[str, Any]:
+        """Looks up the viewer, the repository and its open pull request from head into base in one query."""
+        owner, _, name = repository.partition("/")
+        return self.execute(
+            FIND_PULL_REQUEST_QUERY, variables={"owner": owner, "name": name, "head": head, "base": base}
+        )
+
+    def _post(self, payload: bytes) -> dict[str, Any]:
+        """Posts the payload to the GraphQL endpoint, reconnecting once if the kept-alive connection was dropped."""
+        headers: dict[str, str] = {
+            "Authorization": f"bearer {self._get_token()}",
+            "Content-Type": "application/json",
+            "User-Agent": "cookiecutter-robust-python",
+        }
+        for attempt in range(2):
+            connection: http.client.HTTPConnection = self._get_connection()
+            try:
+                connection.request("POST", self.graphql_path, body=payload, headers=headers)
+                response: http.client.HTTPResponse = connection.getresponse()
+                body: bytes = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise ValueError(f"GitHub API responded with {response.status}: {body[:200]!r}")
+            return json.loads(body)
+        raise AssertionError("unreachable")
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """Returns the open connection to the API, opening one if needed."""
+        if self._connection is None:
+            connection_class: type[http.client.HTTPConnection] = (
+                http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            )
+            self._connection = connection_class(self.netloc, timeout=30)
+        return self._connection
+
+    def _get_token(self) -> str:
+        """Returns the token from GH_TOKEN or GITHUB_TOKEN, falling back to the one gh is logged in with."""
+        if self._token is None:
+            self._token = os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or gh("auth", "token").stdout.strip()
+        return self._token
+
+
+class GitHubStandIn(ThreadingHTTPServer):
+    """Local stand-in for the parts of the GitHub GraphQL API that GitHubClient uses.
+
+    Lets the demo PR flows be tested and benchmarked offline by pointing the client, or the scripts through
+    COOKIECUTTER_ROBUST_PYTHON__GITHUB_API_URL, at its url. Operations are dispatched by name rather than by parsing
+    the GraphQL documents.
+    """
+
+    def __init__(self, repositories: Iterable[str] = (), auto_merge: bool = True) -> None:
+        """Initializes the stand-in on a free local port with the given 'owner/name' repositories.
+
+        Enabling auto-merge is rejected as if the pull request were already clean when auto_merge is False.
+        """
+        super().__init__(("127.0.0.1", 0), _GitHubStandInRequestHandler)
+        self.repositories: dict[str, str] = {repository: f"R_{index}" for index, repository in enumerate(repositories)}
+        self.pull_requests: list[dict[str, Any]] = []
+        self.operations: list[str] = []
+        self.auto_merge: bool = auto_merge
+        self.lock: threading.Lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The API root to give to GitHubClient."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "GitHubStandIn":
+        """Starts serving requests in a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stops serving requests and closes the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def handle_operation(self, operation_name: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Returns the GraphQL response the API would give to the named operation."""
+        with self.lock:
+            self.operations.append(operation_name)
+            handler: Optional[Callable[[dict[str, Any]], dict[str, Any]]] = {
+                "FindPullRequest": self._handle_find_pull_request,
+                "CreatePullRequest": self._handle_create_pull_request,
+                "AddAssignees": self._handle_add_assignees,
+                "EnableAutoMerge": self._handle_enable_auto_merge,
+                "MergePullRequest": self._handle_merge_pull_request,
+                "MergePullRequestAndDeleteRef": self._handle_merge_pull_request_and_delete_ref,
+            }.get(operation_name)
+            if handler is None:
+                return {"errors": [{"message": f"Unsupported operation {operation_name}."}]}
+            return handler(variables)
+
+    def _handle_find_pull_request(self, variables: dict[str, Any]) -> dict[str, Any]:
+        repository: str = f"{variables['owner']}/{variables['name']}"
+        if repository not in self.repositories:
+            return {"errors": [{"message": f"Could not resolve to a Repository with the name '{repository}'."}]}
+        nodes: list[dict[str, Any]] = [
+            self._to_node(pull_request) for pull_request in self.pull_requests
+            if pull_request["repository"] == repository
+            and pull_request["state"] == "OPEN"
+            and pull_request["head"] == variables["head"]
+            and pull_request["base"] == variables["base"]
+        ]
+        return {"data": {
+            "viewer": {"id": "U_viewer"},
+            "repository": {"id": self.repositories[repository], "pullRequests": {"nodes": nodes[:1]}},
+        }}
+
+    def _handle_create_pull_request(self, variables: dict[str, Any]) -> dict[str, Any]:
+        repository: str = next(
+            name for name, repository_id in self.repositories.items() if repository_id == variables["repositoryId"]
+        )
+        number: int = len(self.pull_requests) + 1
+        pull_request: dict[str, Any] = {
+            "id": f"PR_{number}",
+            "number": number,
+            "url": f"https://github.com/{repository}/pull/{number}",
+            "repository": repository,
+            "head": variables["head"],
+            "base": variables["base"],
+            "title": variables["title"],
+            "body": variables["body"],
+            "state": "OPEN",
+            "assignees": [],
+            "auto_merge": False,
+            "head_ref_id": f"REF_{variables['head']}",
+        }
+        self.pull_requests.append(pull_request)
+        return {"data": {"createPullRequest": {"pullRequest": self._to_node(pull_request)}}}
+
+    def _handle_add_assignees(self, variables: dict[str, Any]) -> dict[str, Any]:
+        self._get_pull_request(variables["assignableId"])["assignees"].extend(variables["assigneeIds"])
+        return {"data": {"addAssigneesToAssignable": {"clientMutationId": None}}}
+
+    def _handle_enable_auto_merge(self, variables: dict[str, Any]) -> dict[str, Any]:
+        if not self.auto_merge:
+            return {"errors": [{"message": "Pull request Pull request is in clean status"}]}
+        self._get_pull_request(variables["pullRequestId"])["auto_merge"] = True
+        return {"data": {"enablePullRequestAutoMerge": {"clientMutationId": None}}}
+
+    def _handle_merge_pull_request(self, variables: dict[str, Any]) -> dict[str, Any]:
+        self._get_pull_request(variables["pullRequestId"])["state"] = "MERGED"
+        return {"data": {"mergePullRequest": {"clientMutationId": None}}}
+
+    def _handle_merge_pull_request_and_delete_ref(self, variables: dict[str, Any]) -> dict[str, Any]:
+        pull_request: dict[str, Any] = self._get_pull_request(variables["pullRequestId"])
+        if variables.get("headRefId") is None:
+            return {"errors": [{"message": "Variable $headRefId of type ID! was provided invalid value"}]}
+        if pull_request["head_ref_id"] != variables["headRefId"]:
+            message: str = f"Could not resolve to a node with the global id of '{variables['headRefId']}'"
+            return {"errors": [{"message": message}]}
+        pull_request.update(state="MERGED", head_ref_id=None)
+        return {"data": {"mergePullRequest": {"clientMutationId": None}, "deleteRef": {"clientMutationId": None}}}
+
+    def _get_pull_request(self, pull_request_id: str) -> dict[str, Any]:
+        return next(pull_request for pull_request in self.pull_requests if pull_request["id"] == pull_request_id)
+
+    @staticmethod
+    def _to_node(pull_request: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": pull_request["id"],
+            "number": pull_request["number"],
+            "url": pull_request["url"],
+            "headRef": {"id": pull_request["head_ref_id"]} if pull_request["head_ref_id"] else None,
+        }
+
+
+class _GitHubStandInRequestHandler(BaseHTTPRequestHandler):
+    """Serves GraphQL requests for a GitHubStandIn over kept-alive connections."""
+    protocol_version: str = "HTTP/1.1"
+    server: GitHubStandIn
+
+    def do_POST(self) -> None:
+        """Answers a GraphQL request."""
+        request: dict[str, Any] = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body: bytes = json.dumps(
+            self.server.handle_operation(request["operationName"], request.get("variables", {}))
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keeps the stand-in quiet."""
 
 
 def get_last_cruft_update_commit(demo_path: Path) -> str:
@@ -190,11 +1289,21 @@ def _read_cruft_file(project_path: Path) -> dict[str, Any]:
     return cruft_config
 
 
+def read_cruft_file_at(repo_path: Path, revision: str) -> Optional[dict[str, Any]]:
+    """Reads the cruft file as of the given revision of the repo, returning None if it isn't there."""
+    result: Optional[subprocess.CompletedProcess] = git(
+        "-C", str(repo_path), "show", f"{revision}:.cruft.json", ignore_error=True
+    )
+    return json.loads(result.stdout) if result is not None else None
+
+
 @contextmanager
 def in_new_demo(
     demos_cache_folder: Path,
     add_rust_extension: bool,
     no_cache: bool,
+    incremental: bool = False,
+    demo_path: Optional[Path] = None,
     **kwargs: Any
 ) -> Generator[Path, None, None]:
     """Returns a context manager for working within a new demo."""
@@ -202,6 +1311,8 @@ def in_new_demo(
         demos_cache_folder=demos_cache_folder,
         add_rust_extension=add_rust_extension,
         no_cache=no_cache,
+        incremental=incremental,
+        demo_path=demo_path,
         **kwargs
     )
     with work_in(demo_path):
@@ -212,21 +1323,974 @@ def generate_demo(
     demos_cache_folder: Path,
     add_rust_extension: bool,
     no_cache: bool,
+    incremental: bool = False,
+    demo_path: Optional[Path] = None,
     **kwargs: Any
 ) -> Path:
-    """Generates a demo project and returns its root path."""
-    demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
+    """Generates a demo project and returns its root path.
+
+    Renders are looked up in a content-addressed cache first, so generating an unchanged variant only materializes the
+    cached render into the demo folder, cloning or copying just the files that differ. In incremental mode the
+    template working tree is instead rendered directly into an existing demo, touching only the files whose source or
+    inputs changed since the last incremental render.
+
+    The demo is generated into its folder in the demos cache unless given another demo path, such as a demo worktree,
+    which is rendered into as is even when not using the cache. An existing demo checkout has the demo fetch mode
+    applied to it.
+    """
     demos_cache_folder.mkdir(exist_ok=True)
-    if no_cache:
-        _remove_existing_demo(demo_path=demos_cache_folder / demo_name)
-    cruft.create(
-        template_git_url=str(REPO_FOLDER),
-        output_dir=demos_cache_folder,
-        extra_context={"project_name": demo_name, "add_rust_extension": add_rust_extension, **kwargs},
-        no_input=True,
-        overwrite_if_exists=True
+    if demo_path is None:
+        demo_path: Path = demos_cache_folder / get_demo_name(add_rust_extension=add_rust_extension)
+        if no_cache:
+            _remove_existing_demo(demo_path=demo_path)
+        elif (demo_path / ".git").exists():
+            configure_demo_repo(repo_path=demo_path)
+
+    template_state: TemplateState = get_template_state()
+    extra_context: dict[str, Any] = get_demo_extra_context(add_rust_extension=add_rust_extension, **kwargs)
+    if incremental and demo_path.is_dir() and not no_cache:
+        with profile_phase("render incremental"):
+            rendered_files: list[str] = render_incremental(project_path=demo_path, extra_context=extra_context)
+        typer.secho(f"Incrementally rendered {len(rendered_files)} file(s) into {demo_path}.", fg="green")
+        return demo_path
+
+    with profile_phase("render"):
+        cached_render: Path = get_cached_render(
+            extra_context=extra_context, template_state=template_state, refresh=no_cache
+        )
+    with profile_phase("materialize"):
+        materialize_render(render_path=cached_render, project_path=demo_path)
+        _stamp_template_commit(project_path=demo_path, commit=template_state.commit)
+    return demo_path
+
+
+def get_demo_extra_context(add_rust_extension: bool, **kwargs: Any) -> dict[str, Any]:
+    """Returns the extra context used to render a demo, with the copyright year pinned for reproducible renders."""
+    return {
+        "project_name": get_demo_name(add_rust_extension=add_rust_extension),
+        "add_rust_extension": add_rust_extension,
+        "copyright_year": get_copyright_year(),
+        **kwargs
+    }
+
+
+def get_cached_render(extra_context: dict[str, Any], template_state: TemplateState, refresh: bool = False) -> Path:
+    """Returns the path to a cached render of the template for the given context, rendering it if needed."""
+    return render_variants(variants=[extra_context], template_state=template_state, refresh=refresh)[0]
+
+
+def render_variants(
+    variants: list[dict[str, Any]],
+    jobs: int = 1,
+    template_state: Optional[TemplateState] = None,
+    refresh: bool = False
+) -> list[Path]:
+    """Renders each variant's extra context into the render cache and returns the rendered project paths.
+
+    The template is checked out and compiled once for the whole batch. When using more than one job, the variants are
+    rendered by a pool of worker processes that inherit the compiled templates from this process where the platform
+    supports forking, or compile them once per worker otherwise.
+    """
+    template_state: TemplateState = template_state or get_template_state()
+    render_keys: list[str] = [
+        get_render_key(extra_context=variant, template_state=template_state) for variant in variants
+    ]
+    project_paths: list[Path] = [
+        RENDER_CACHE_FOLDER / render_key / variant["project_name"]
+        for render_key, variant in zip(render_keys, variants, strict=True)
+    ]
+    pending: dict[str, dict[str, Any]] = {
+        render_key: variant
+        for render_key, variant, project_path in zip(render_keys, variants, project_paths, strict=True)
+        if refresh or not project_path.is_dir()
+    }
+    for render_key in render_keys:
+        if render_key not in pending:
+            typer.secho(f"Using cached render {render_key[:12]}.", fg="green")
+    if not pending:
+        return project_paths
+
+    RENDER_CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+    with in_template_checkout(commit=template_state.commit) as template_folder:
+        _initialize_render_worker(template_folder=template_folder, commit=template_state.commit)
+        if jobs <= 1 or len(pending) == 1:
+            for render_key, variant in pending.items():
+                _render_variant_to_cache(render_key, variant)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(pending)),
+                mp_context=_get_render_worker_context(),
+                initializer=_initialize_render_worker,
+                initargs=(template_folder, template_state.commit)
+            ) as executor:
+                list(executor.map(_render_variant_to_cache, pending.keys(), pending.values()))
+    return project_paths
+
+
+def get_render_key(extra_context: dict[str, Any], template_state: TemplateState) -> str:
+    """Returns a key identifying a render of the template tree with the given context."""
+    render_inputs: dict[str, Any] = {
+        "template": template_state.trees,
+        "extra_context": extra_context,
+        "cookiecutter": cookiecutter.__version__,
+        "cruft": cruft.__version__,
+    }
+    serialized_inputs: str = json.dumps(render_inputs, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_inputs.encode("utf-8")).hexdigest()
+
+
+def get_template_state(commit: str = "HEAD") -> TemplateState:
+    """Returns the given commit of the template along with the git tree ids of everything that affects a render."""
+    with work_in(REPO_FOLDER):
+        result: subprocess.CompletedProcess = git(
+            "rev-parse", commit, *(f"{commit}:{path}" for path in TEMPLATE_RENDER_INPUTS)
+        )
+    commit, *trees = result.stdout.split()
+    return TemplateState(commit=commit, trees=tuple(trees))
+
+
+def get_update_contexts(
+    cruft_state: dict[str, Any], extra_context: dict[str, Any]
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Returns the extra contexts cruft update renders a project's current and updated template with.
+
+    Like cruft, private variables are left for the template to fill in, and the given extra context only overrides the
+    project's recorded answers in the updated render.
+    """
+    current_context: dict[str, Any] = {
+        key: value for key, value in cruft_state["context"]["cookiecutter"].items() if not key.startswith("_")
+    }
+    return current_context, {**current_context, **extra_context}
+
+
+def can_render_commit(commit: str) -> bool:
+    """Returns whether TemplateRenderer reproduces what cruft would have generated at the given template commit.
+
+    Commits from before cookiecutter.json gained its _exclude_unless rules relied on post_gen_project to remove
+    excluded paths and reformat .cookiecutter.json, neither of which the renderer does.
+    """
+    with work_in(REPO_FOLDER):
+        result: Optional[subprocess.CompletedProcess] = git("show", f"{commit}:cookiecutter.json", ignore_error=True)
+    return result is not None and "_exclude_unless" in json.loads(result.stdout)
+
+
+def get_copyright_year() -> str:
+    """Returns the copyright year the template's {% now %} tag would render, pinned for use in extra_context."""
+    return datetime.now(tz=timezone.utc).strftime("%Y")
+
+
+def get_variant_matrix(*names: str) -> list[dict[str, Any]]:
+    """Returns every combination of the choices cookiecutter.json offers for the given variables."""
+    cookiecutter_json: dict[str, Any] = json.loads((REPO_FOLDER / "cookiecutter.json").read_text())
+    choices: list[list[Any]] = []
+    for name in names:
+        default: Any = cookiecutter_json[name]
+        if isinstance(default, list):
+            choices.append(default)
+        elif isinstance(default, bool):
+            choices.append([False, True])
+        else:
+            raise ValueError(f"{name} is not a choice or boolean variable in cookiecutter.json.")
+    return [dict(zip(names, combination, strict=True)) for combination in itertools.product(*choices)]
+
+
+def parse_variant(spec: str) -> dict[str, Any]:
+    """Parses a variant given as comma separated key=value pairs, such as 'repository_provider=gitlab,license=MIT'."""
+    variant: dict[str, Any] = {}
+    for pair in filter(None, spec.split(",")):
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid variant '{spec}', expected comma separated key=value pairs.")
+        value: str = value.strip()
+        variant[key.strip()] = {"true": True, "false": False}.get(value.lower(), value)
+    return variant
+
+
+@contextmanager
+def in_template_checkout(commit: str) -> Generator[Path, None, None]:
+    """Returns a context manager for working with a temporary clone of the template at the given commit."""
+    temp_folder: Path = Path(tempfile.mkdtemp(prefix="cookiecutter-robust-python-"))
+    checkout_folder: Path = temp_folder / REPO_FOLDER.name
+    try:
+        git("clone", "--quiet", "--no-checkout", str(REPO_FOLDER), str(checkout_folder))
+        with work_in(checkout_folder):
+            git("checkout", "--quiet", commit)
+        yield checkout_folder
+    finally:
+        shutil.rmtree(temp_folder, onerror=remove_readonly)
+
+
+@dataclass(frozen=True)
+class RenderedFile:
+    """A rendered template file, relative to the root of the generated project."""
+    path: str
+    content: bytes
+    mode: int
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Jinja bytecode cache keyed by template name and source hash rather than by absolute file path.
+
+    This lets every checkout of the template, including the temporary ones used for batch renders, share compiled
+    templates across processes. A template is only recompiled once its source actually changes.
+    """
+
+    def get_bucket(
+        self, environment: Environment, name: str, filename: Optional[str], source: str  # noqa: ARG002
+    ) -> Bucket:
+        """Returns the cache bucket for the given template source."""
+        checksum: str = self.get_source_checksum(source)
+        key: str = self.get_cache_key(f"{cookiecutter.__version__}|{name}|{checksum}")
+        bucket: Bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+
+class TemplateRenderer:
+    """Renders a template folder using one Jinja environment shared by every context it is given.
+
+    Both file names and contents are compiled the first time they are needed and reused for every later render, so
+    rendering many variants only pays the template parsing cost once.
+    """
+
+    def __init__(
+        self,
+        template_folder: Path,
+        commit: str,
+        bytecode_cache_folder: Optional[Path] = BYTECODE_CACHE_FOLDER
+    ) -> None:
+        """Initializes the renderer for the template at the given folder and commit.
+
+        Compiled templates are persisted to the bytecode cache folder unless it is None.
+        """
+        self.template_folder: Path = template_folder
+        self.project_folder: Path = template_folder / TEMPLATE_PROJECT_FOLDER.name
+        self.commit: str = commit
+        base_context: dict[str, Any] = generate_context(context_file=template_folder / "cookiecutter.json")
+        self.environment: Environment = create_env_with_context(base_context)
+        self.environment.loader = FileSystemLoader([str(self.project_folder), str(template_folder / "templates")])
+        self.exclusion_rules: dict[str, dict[str, list[Any]]] = base_context["cookiecutter"].get("_exclude_unless", {})
+        if bytecode_cache_folder is not None:
+            bytecode_cache_folder.mkdir(parents=True, exist_ok=True)
+            self.environment.bytecode_cache = TemplateBytecodeCache(str(bytecode_cache_folder))
+        self._path_templates: dict[str, Template] = {}
+        self._newlines: dict[str, Optional[str]] = {}
+
+    def build_context(self, extra_context: dict[str, Any]) -> dict[str, Any]:
+        """Returns the context cruft would render the template with, including updates made by pre_gen_project."""
+        context: dict[str, Any] = generate_context(
+            context_file=self.template_folder / "cookiecutter.json", extra_context=extra_context
+        )
+        context["cookiecutter"] = prompt_for_config(context, no_input=True)
+        context["cookiecutter"]["_template"] = str(REPO_FOLDER)
+        context["cookiecutter"]["_commit"] = self.commit
+
+        # pre_gen_project does its work by updating the context while being rendered, so running it is unnecessary
+        pre_gen_project_hook: Path = self.template_folder / "hooks" / "pre_gen_project.py"
+        self.environment.from_string(pre_gen_project_hook.read_text()).render(**context)
+        return context
+
+    def iter_template_files(self) -> Generator[str, None, None]:
+        """Yields the path of every file in the template's project folder, relative to it."""
+        for root, dirs, files in os.walk(self.project_folder):
+            dirs.sort()
+            for file in sorted(files):
+                yield Path(root, file).relative_to(self.project_folder).as_posix()
+
+    def compile(self) -> None:
+        """Compiles every file name and text file in the template ahead of rendering."""
+        for infile in self.iter_template_files():
+            self._get_path_template(infile)
+            if not is_binary(str(self.project_folder / infile)):
+                self.environment.get_template(infile)
+
+    def render(self, context: dict[str, Any]) -> Generator[RenderedFile, None, None]:
+        """Yields every file the template renders for the given context."""
+        for infile in self.iter_template_files():
+            rendered_file: Optional[RenderedFile] = self.render_file(infile=infile, context=context)
+            if rendered_file is not None:
+                yield rendered_file
+
+    def render_file(self, infile: str, context: dict[str, Any]) -> Optional[RenderedFile]:
+        """Renders a single template file the same way cookiecutter's generate_file would.
+
+        Returns:
+            The rendered file, or None if its name renders empty and it should be skipped.
+        """
+        source_path: Path = self.project_folder / infile
+        try:
+            outfile: str = self._get_path_template(infile).render(**context)
+            if not outfile or outfile.endswith(("/", os.sep)) or self.is_excluded(path=outfile, context=context):
+                return None
+
+            mode: int = stat.S_IMODE(source_path.stat().st_mode)
+            if is_copy_only_path(infile, context) or is_binary(str(source_path)):
+                return RenderedFile(path=outfile, content=source_path.read_bytes(), mode=mode)
+
+            rendered_text: str = self.environment.get_template(infile).render(**context)
+        except UndefinedError as error:
+            raise UndefinedVariableInTemplate(f"Unable to create file '{infile}'", error, context) from error
+
+        newline: str = context["cookiecutter"].get("_new_lines") or self._get_newline(source_path) or os.linesep
+        return RenderedFile(path=outfile, content=rendered_text.replace("\n", newline).encode("utf-8"), mode=mode)
+
+    def render_to(self, output_folder: Path, context: dict[str, Any]) -> Path:
+        """Renders the template into the output folder the same way cruft create would and returns the project path."""
+        return self.render_tree(context=context).write_to(output_folder=output_folder)
+
+    def render_tree(self, context: dict[str, Any]) -> "RenderedTree":
+        """Renders the template into memory, including the .cruft.json that cruft create would write."""
+        cruft_state: dict[str, Any] = {
+            "template": str(REPO_FOLDER),
+            "commit": self.commit,
+            "checkout": None,
+            "context": context,
+            "directory": None,
+        }
+        cruft_file: RenderedFile = RenderedFile(
+            path=".cruft.json", content=json_dumps(cruft_state).encode("utf-8"), mode=0o644
+        )
+        return RenderedTree(
+            name=self._get_path_template(TEMPLATE_PROJECT_FOLDER.name).render(**context),
+            files=[*self.render(context=context), cruft_file]
+        )
+
+    def is_excluded(self, path: str, context: dict[str, Any]) -> bool:
+        """Returns whether the rendered path falls under a path excluded by cookiecutter.json's _exclude_unless rules.
+
+        A path is excluded unless each variable listed in its rule holds one of the listed values. Excluded paths are
+        skipped before their contents are rendered, which replaces deleting them in the post_gen_project hook.
+        """
+        cookiecutter_context: dict[str, Any] = context["cookiecutter"]
+        for excluded_path, conditions in self.exclusion_rules.items():
+            if path != excluded_path and not path.startswith(f"{excluded_path}/"):
+                continue
+            if not all(cookiecutter_context.get(variable) in values for variable, values in conditions.items()):
+                return True
+        return False
+
+    def get_file_variables(self, infile: str) -> set[str]:
+        """Returns the cookiecutter variables read by the given template file's path and contents."""
+        source_path: Path = self.project_folder / infile
+        sources: list[str] = [infile]
+        if not is_binary(str(source_path)):
+            sources.append(source_path.read_text(encoding="utf-8"))
+
+        variables: set[str] = set()
+        for excluded_path, conditions in self.exclusion_rules.items():
+            if infile == excluded_path or infile.startswith(f"{excluded_path}/"):
+                variables.update(conditions)
+        for source in sources:
+            source_variables: Optional[set[str]] = self._get_source_variables(source)
+            if source_variables is None:
+                return {ALL_CONTEXT_VARIABLES}
+            variables.update(source_variables)
+        return variables
+
+    def _get_source_variables(self, source: str) -> Optional[set[str]]:
+        """Returns the cookiecutter variables a template source reads, or None if it may read the whole context."""
+        template: nodes.Template = self.environment.parse(source)
+        if any(template.find_all((nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends))):
+            return None
+
+        variables: set[str] = set()
+        references: int = sum(1 for node in template.find_all(nodes.Name) if node.name == "cookiecutter")
+        for node in template.find_all((nodes.Getattr, nodes.Getitem)):
+            if not isinstance(node.node, nodes.Name) or node.node.name != "cookiecutter":
+                continue
+            if isinstance(node, nodes.Getattr):
+                variables.add(node.attr)
+            elif isinstance(node.arg, nodes.Const):
+                variables.add(str(node.arg.value))
+            references -= 1
+
+        # Any remaining reference uses the context as a whole, such as `cookiecutter | jsonify`
+        if references > 0:
+            return None
+        return variables
+
+    def _get_path_template(self, infile: str) -> Template:
+        """Returns the compiled template for a file's name."""
+        if infile not in self._path_templates:
+            self._path_templates[infile] = self.environment.from_string(infile)
+        return self._path_templates[infile]
+
+    def _get_newline(self, source_path: Path) -> Optional[str]:
+        """Returns the first newline used by the source file, matching cookiecutter's newline detection."""
+        if source_path not in self._newlines:
+            with source_path.open(encoding="utf-8") as source:
+                source.readline()
+            newlines: Optional[str | tuple[str, ...]] = source.newlines
+            self._newlines[source_path] = newlines[0] if isinstance(newlines, tuple) else newlines
+        return self._newlines[source_path]
+
+
+class RenderedTree:
+    """In-memory project produced by TemplateRenderer.render_tree.
+
+    Supports the read-only path queries that checks on a generated project need without touching the disk, and is only
+    written out once something actually has to run inside the project.
+    """
+
+    def __init__(self, name: str, files: Iterable[RenderedFile]) -> None:
+        """Initializes the tree for the project with the given name and rendered files."""
+        self.name: str = name
+        self.files: dict[str, RenderedFile] = {rendered_file.path: rendered_file for rendered_file in files}
+        self.folders: set[str] = {
+            parent.as_posix() for path in self.files for parent in PurePosixPath(path).parents
+        }
+
+    def __truediv__(self, path: str | os.PathLike[str]) -> "RenderedPath":
+        """Returns the path within the tree, relative to the project root."""
+        return RenderedPath(tree=self, path=PurePosixPath(path))
+
+    def get_digest(self) -> str:
+        """Returns a hash of every file's path, mode and content, identifying the project by what was rendered."""
+        digest: Any = hashlib.sha256()
+        for path, rendered_file in sorted(self.files.items()):
+            digest.update(f"{path}\0{rendered_file.mode:o}\0".encode("utf-8"))
+            digest.update(hashlib.sha256(rendered_file.content).digest())
+        return digest.hexdigest()
+
+    def write_to(self, output_folder: Path) -> Path:
+        """Writes the project into the output folder and returns its root path."""
+        project_path: Path = output_folder / self.name
+        for rendered_file in self.files.values():
+            write_rendered_file(project_path=project_path, rendered_file=rendered_file)
+        return project_path
+
+    def link_to(self, output_folder: Path) -> Path:
+        """Writes the project into the output folder as hardlinks into the blob store and returns its root path.
+
+        Only meant for render cache entries, since every file linked to the same blob is read-only and shares content.
+        """
+        project_path: Path = output_folder / self.name
+        for rendered_file in self.files.values():
+            link_rendered_file(project_path=project_path, rendered_file=rendered_file)
+        return project_path
+
+
+@dataclass(frozen=True)
+class RenderedPath:
+    """Path within a RenderedTree, mirroring the read-only parts of pathlib.Path."""
+    tree: RenderedTree = field(repr=False)
+    path: PurePosixPath
+
+    def __truediv__(self, path: str | os.PathLike[str]) -> "RenderedPath":
+        """Returns the joined path within the same tree."""
+        return RenderedPath(tree=self.tree, path=self.path / path)
+
+    def __str__(self) -> str:
+        """Returns the path as it would be written to disk, relative to the project's parent folder."""
+        return (PurePosixPath(self.tree.name) / self.path).as_posix()
+
+    @property
+    def name(self) -> str:
+        """The final component of the path."""
+        return self.path.name
+
+    @property
+    def stem(self) -> str:
+        """The final component of the path without its suffix."""
+        return self.path.stem
+
+    @property
+    def suffix(self) -> str:
+        """The file extension of the final component of the path."""
+        return self.path.suffix
+
+    def exists(self) -> bool:
+        """Returns whether the path is a file or folder in the tree."""
+        return self.is_file() or self.is_dir()
+
+    def is_file(self) -> bool:
+        """Returns whether the path is a file in the tree."""
+        return self.path.as_posix() in self.tree.files
+
+    def is_dir(self) -> bool:
+        """Returns whether the path is a folder in the tree."""
+        return self.path.as_posix() in self.tree.folders
+
+    def iterdir(self) -> Generator["RenderedPath", None, None]:
+        """Yields the files and folders directly within this folder."""
+        children: set[str] = {
+            PurePosixPath(path).relative_to(self.path).parts[0]
+            for path in [*self.tree.files, *self.tree.folders]
+            if path != "." and PurePosixPath(path) != self.path and PurePosixPath(path).is_relative_to(self.path)
+        }
+        for child in sorted(children):
+            yield self / child
+
+    def read_bytes(self) -> bytes:
+        """Returns the rendered contents of the file."""
+        if not self.is_file():
+            raise FileNotFoundError(f"No rendered file at '{self}'.")
+        return self.tree.files[self.path.as_posix()].content
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        """Returns the rendered contents of the file as text, with newlines translated like pathlib.Path.read_text."""
+        return self.read_bytes().decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def write_rendered_file(project_path: Path, rendered_file: RenderedFile) -> None:
+    """Writes a rendered file into the project, creating its parent folders as needed."""
+    path: Path = project_path / rendered_file.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(rendered_file.content)
+    path.chmod(rendered_file.mode)
+
+
+def link_rendered_file(project_path: Path, rendered_file: RenderedFile) -> None:
+    """Hardlinks a rendered file into the project from the blob store, falling back to a read-only copy."""
+    blob_path: Path = store_blob(content=rendered_file.content, mode=rendered_file.mode)
+    path: Path = project_path / rendered_file.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(blob_path, path)
+    except OSError:
+        # Cross-device renders or blobs that reached the filesystem's link limit get their own copy instead
+        shutil.copyfile(blob_path, path)
+        path.chmod(stat.S_IMODE(blob_path.stat().st_mode))
+
+
+def store_blob(content: bytes, mode: int) -> Path:
+    """Adds the content to the blob store as a read-only file if it isn't there already and returns its path.
+
+    Blobs are keyed by content hash and mode, since every hardlink to a blob shares its permissions.
+    """
+    read_only_mode: int = mode & ~WRITE_PERMISSIONS
+    digest: str = hashlib.sha256(content).hexdigest()
+    blob_path: Path = RENDER_BLOBS_FOLDER / digest[:2] / f"{digest[2:]}-{read_only_mode:o}"
+    if blob_path.is_file():
+        return blob_path
+
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, staging_path = tempfile.mkstemp(dir=blob_path.parent)
+    with os.fdopen(file_descriptor, "wb") as staging_file:
+        staging_file.write(content)
+    Path(staging_path).chmod(read_only_mode)
+    Path(staging_path).replace(blob_path)
+    return blob_path
+
+
+def materialize_render(render_path: Path, project_path: Path) -> dict[str, int]:
+    """Materializes a cached render into a project, only writing the files whose content differs.
+
+    Files are cloned where the filesystem supports reflinks and copied otherwise, so without reflinks a demo takes the
+    full size of its render on disk. They are never hardlinked to the read-only blobs even then, since formatters and
+    pre-commit hooks rewrite demo files in place, which fails on a read-only file and, when run as root, ignores the
+    mode and writes through to every render sharing the blob.
+
+    Returns:
+        The number of files that were unchanged, cloned and copied.
+    """
+    counts: dict[str, int] = {"unchanged": 0, "cloned": 0, "copied": 0}
+    for source in sorted(render_path.rglob("*")):
+        if source.is_dir():
+            continue
+        destination: Path = project_path / source.relative_to(render_path)
+        mode: int = stat.S_IMODE(source.stat().st_mode) | stat.S_IWUSR
+        if _has_same_content(source, destination):
+            counts["unchanged"] += 1
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if destination.is_symlink() or destination.exists():
+                destination.unlink()
+            if clone_file(source=source, destination=destination):
+                counts["cloned"] += 1
+            else:
+                shutil.copyfile(source, destination)
+                counts["copied"] += 1
+        if stat.S_IMODE(destination.stat().st_mode) != mode:
+            destination.chmod(mode)
+
+    typer.secho(
+        f"Materialized {project_path.name}: {counts['unchanged']} unchanged, {counts['cloned']} cloned and "
+        f"{counts['copied']} copied file(s).",
+        fg="green"
+    )
+    return counts
+
+
+def clone_file(source: Path, destination: Path) -> bool:
+    """Creates the destination as a copy-on-write clone of the source, returning whether the filesystem allowed it."""
+    if sys.platform != "linux":
+        return False
+
+    import fcntl
+
+    with source.open("rb") as source_file, destination.open("wb") as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def _has_same_content(source: Path, destination: Path) -> bool:
+    """Returns whether the destination is a regular file with the same content as the source."""
+    if destination.is_symlink() or not destination.is_file():
+        return False
+    if source.stat().st_size != destination.stat().st_size:
+        return False
+    return filecmp.cmp(source, destination, shallow=False)
+
+
+# Renderer used by the current process when rendering variants, inherited by forked render workers
+_RENDERER: Optional[TemplateRenderer] = None
+
+
+def _initialize_render_worker(template_folder: Path, commit: str) -> None:
+    """Sets up the renderer used by _render_variant_to_cache unless an equivalent one was inherited."""
+    global _RENDERER
+    if _RENDERER is None or _RENDERER.template_folder != template_folder or _RENDERER.commit != commit:
+        _RENDERER = TemplateRenderer(template_folder=template_folder, commit=commit)
+        _RENDERER.compile()
+
+
+def _get_render_worker_context() -> Optional[multiprocessing.context.BaseContext]:
+    """Returns a fork context where available so that workers inherit already compiled templates."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _render_variant_to_cache(render_key: str, extra_context: dict[str, Any]) -> Path:
+    """Renders the given variant and publishes it to the render cache under its render key."""
+    render_folder: Path = RENDER_CACHE_FOLDER / render_key
+    staging_folder: Path = Path(tempfile.mkdtemp(prefix=f"{render_key[:12]}-", dir=RENDER_CACHE_FOLDER))
+    try:
+        context: dict[str, Any] = _RENDERER.build_context(extra_context=extra_context)
+        _RENDERER.render_tree(context=context).link_to(output_folder=staging_folder)
+        if render_folder.exists():
+            shutil.rmtree(render_folder, onerror=remove_readonly)
+        # Another process may have published the same render in the meantime, which is equally valid to use
+        staging_folder.replace(render_folder)
+    except OSError:
+        if not render_folder.is_dir():
+            raise
+    finally:
+        if staging_folder.exists():
+            shutil.rmtree(staging_folder, onerror=remove_readonly)
+    typer.secho(f"Rendered {extra_context['project_name']} to cache as {render_key[:12]}.", fg="green")
+    return render_folder / extra_context["project_name"]
+
+
+def _stamp_template_commit(project_path: Path, commit: str) -> None:
+    """Points a project materialized from the render cache at the template commit it was generated for.
+
+    Renders are keyed by template tree rather than commit, so a cached render may carry an older commit with an
+    identical tree.
+    """
+    cruft_config: dict[str, Any] = _read_cruft_file(project_path)
+    if cruft_config.get("commit") == commit:
+        return
+
+    cruft_config["commit"] = commit
+    cruft_config["context"]["cookiecutter"]["_commit"] = commit
+    get_cruft_file(project_dir_path=project_path).write_text(json_dumps(cruft_config))
+
+    cookiecutter_json_path: Path = project_path / ".cookiecutter.json"
+    cookiecutter_json: dict[str, Any] = json.loads(cookiecutter_json_path.read_text())
+    cookiecutter_json["_commit"] = commit
+    cookiecutter_json_path.write_text(json.dumps(cookiecutter_json, sort_keys=True, indent=2) + "\n")
+
+
+def render_incremental(project_path: Path, extra_context: dict[str, Any]) -> list[str]:
+    """Renders the template working tree into an existing project, skipping files that would render unchanged.
+
+    A manifest of each template file's source hash, the cookiecutter variables it reads, the hash of those variables'
+    values and the hash of what it rendered to is kept per project. Files are only re-rendered when one of those hashes
+    changes, including when the rendered file on disk no longer matches, such as after a regular regeneration.
+
+    Returns:
+        The template files that were rendered.
+    """
+    renderer: TemplateRenderer = TemplateRenderer(template_folder=REPO_FOLDER, commit=get_template_state().commit)
+    context: dict[str, Any] = renderer.build_context(extra_context=extra_context)
+
+    previous_manifest: dict[str, dict[str, Any]] = _read_render_manifest(project_path)
+    manifest: dict[str, dict[str, Any]] = {}
+    rendered_files: list[str] = []
+    for infile in renderer.iter_template_files():
+        source_hash: str = hashlib.sha256((renderer.project_folder / infile).read_bytes()).hexdigest()
+        previous_entry: dict[str, Any] = previous_manifest.get(infile, {})
+        if previous_entry.get("source") == source_hash:
+            variables: list[str] = previous_entry["variables"]
+        else:
+            variables: list[str] = sorted(renderer.get_file_variables(infile=infile))
+        inputs_hash: str = _hash_context_variables(context=context, variables=variables)
+        outfile: Path = project_path / renderer.environment.from_string(infile).render(**context)
+        manifest[infile] = {"source": source_hash, "variables": variables, "inputs": inputs_hash}
+
+        if (
+            previous_entry.get("source") == source_hash
+            and previous_entry.get("inputs") == inputs_hash
+            and "output" in previous_entry
+            and previous_entry["output"] == _hash_output_file(outfile)
+        ):
+            manifest[infile]["output"] = previous_entry["output"]
+            continue
+        rendered_file: Optional[RenderedFile] = renderer.render_file(infile=infile, context=context)
+        if rendered_file is not None:
+            write_rendered_file(project_path=project_path, rendered_file=rendered_file)
+            manifest[infile]["output"] = hashlib.sha256(rendered_file.content).hexdigest()
+        else:
+            _remove_rendered_file(project_path=project_path, renderer=renderer, infile=infile, context=context)
+            manifest[infile]["output"] = None
+        rendered_files.append(infile)
+
+    for removed_infile in previous_manifest.keys() - manifest.keys():
+        _remove_rendered_file(project_path=project_path, renderer=renderer, infile=removed_infile, context=context)
+
+    _write_render_manifest(project_path=project_path, manifest=manifest)
+    return rendered_files
+
+
+def get_affected_render_paths(
+    renderer: TemplateRenderer, context: dict[str, Any], start_commit: str, end_commit: str
+) -> Optional[set[str]]:
+    """Returns the rendered paths that the template changes between the two commits can affect for the context.
+
+    A changed template file can only affect the path it renders to, and only if that path isn't skipped or excluded
+    for the context. Any other change to the template's render inputs, such as to cookiecutter.json or the hooks, can
+    affect the render as a whole.
+
+    Returns:
+        The affected rendered paths, or None if the changes can affect every rendered path.
+    """
+    changed_files: list[str] = git(
+        "-C",
+        str(renderer.template_folder),
+        "diff",
+        "--name-only",
+        "--no-renames",
+        start_commit,
+        end_commit,
+        "--",
+        *TEMPLATE_RENDER_INPUTS
+    ).stdout.splitlines()
+
+    project_prefix: str = f"{renderer.project_folder.name}/"
+    affected_paths: set[str] = set()
+    for changed_file in changed_files:
+        if not changed_file.startswith(project_prefix):
+            return None
+        outfile: str = renderer.environment.from_string(changed_file.removeprefix(project_prefix)).render(**context)
+        if outfile and not outfile.endswith(("/", os.sep)) and not renderer.is_excluded(path=outfile, context=context):
+            affected_paths.add(outfile)
+    return affected_paths
+
+
+def _remove_rendered_file(
+    project_path: Path, renderer: TemplateRenderer, infile: str, context: dict[str, Any]
+) -> None:
+    """Removes the file a template file would render to, if present, such as when it is now excluded."""
+    outfile: Path = project_path / renderer.environment.from_string(infile).render(**context)
+    if outfile.is_file():
+        outfile.unlink()
+
+
+def _hash_output_file(path: Path) -> Optional[str]:
+    """Returns a hash of the rendered file's content on disk, or None if there is no such file."""
+    if not path.is_file():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _hash_context_variables(context: dict[str, Any], variables: list[str]) -> str:
+    """Returns a hash of the values of the given cookiecutter variables."""
+    cookiecutter_context: dict[str, Any] = context["cookiecutter"]
+    if ALL_CONTEXT_VARIABLES in variables:
+        values: dict[str, Any] = cookiecutter_context
+    else:
+        values: dict[str, Any] = {variable: cookiecutter_context.get(variable) for variable in variables}
+    serialized_values: str = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_values.encode("utf-8")).hexdigest()
+
+
+def _get_render_manifest_path(project_path: Path) -> Path:
+    """Returns the path of the incremental render manifest for the given project."""
+    project_key: str = hashlib.sha256(str(project_path.resolve()).encode("utf-8")).hexdigest()
+    return RENDER_MANIFESTS_FOLDER / f"{project_key[:16]}.json"
+
+
+def _read_render_manifest(project_path: Path) -> dict[str, dict[str, Any]]:
+    """Reads the incremental render manifest for the given project, returning an empty one if none exists."""
+    manifest_path: Path = _get_render_manifest_path(project_path)
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def _write_render_manifest(project_path: Path, manifest: dict[str, dict[str, Any]]) -> None:
+    """Writes the incremental render manifest for the given project."""
+    manifest_path: Path = _get_render_manifest_path(project_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, sort_keys=True, indent=2))
+
+
+def get_demo_store_path(demos_cache_folder: Path, demo_name: str) -> Path:
+    """Returns the path of the bare repository that the demo's worktrees share."""
+    return demos_cache_folder / DEMO_STORES_FOLDER_NAME / f"{demo_name}.git"
+
+
+def ensure_demo_store(demos_cache_folder: Path, demo_name: str) -> Path:
+    """Returns the demo's bare store, creating it on first use and bringing it up to date with the demo's remote.
+
+    The store is cloned from the demo's existing checkout when there is one, reusing its objects rather than cloning
+    from scratch, and is then pointed at the demo's remote with remote-tracking branches like a regular clone. The
+    demo's main and develop branches are fast-forwarded to the remote's on every use, as no checkout pulls them.
+    """
+    store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=demo_name)
+    if not store_path.is_dir():
+        checkout_path: Path = demos_cache_folder / demo_name
+        remote_url: str = _get_demo_remote_url(checkout_path=checkout_path)
+        is_local_source: bool = (checkout_path / ".git").exists()
+        source: str = str(checkout_path) if is_local_source else remote_url
+        clone_args: list[str] = (
+            [f"--filter={DEMO_PARTIAL_CLONE_FILTER}"] if DEMO_FETCH_MODE == "partial" and not is_local_source else []
+        )
+        typer.secho(f"Creating demo store for {demo_name} at {store_path} from {source}.", fg="yellow")
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        git("clone", "--bare", "--quiet", "--origin", DEMO.remote, *clone_args, source, str(store_path))
+        git("-C", str(store_path), "remote", "set-url", DEMO.remote, remote_url)
+        git(
+            "-C",
+            str(store_path),
+            "config",
+            f"remote.{DEMO.remote}.fetch",
+            f"+refs/heads/*:refs/remotes/{DEMO.remote}/*"
+        )
+
+    configure_demo_repo(repo_path=store_path)
+    fetch_demo_remote(repo_path=store_path, branches=[DEMO.main_branch, DEMO.develop_branch])
+    return store_path
+
+
+def configure_demo_repo(repo_path: Path) -> None:
+    """Applies the demo fetch mode to a repo in the demos cache and has its fetches maintain a commit-graph.
+
+    In partial mode the demo's remote becomes a promisor remote filtered to blob:none, so fetches only bring commits
+    and trees while blobs are fetched once something reads them. The commit-graph keeps the ancestry checks fast as
+    the demo's history grows. Shallow fetches are not offered, as those checks walk the demo's full history.
+    """
+    if DEMO_FETCH_MODE not in DEMO_FETCH_MODES:
+        raise ValueError(f"Unknown demo fetch mode '{DEMO_FETCH_MODE}', expected one of {DEMO_FETCH_MODES}.")
+
+    settings: dict[str, str] = {"core.commitGraph": "true", "fetch.writeCommitGraph": "true"}
+    if DEMO_FETCH_MODE == "partial":
+        settings[f"remote.{DEMO.remote}.promisor"] = "true"
+        settings[f"remote.{DEMO.remote}.partialclonefilter"] = DEMO_PARTIAL_CLONE_FILTER
+    for key, value in settings.items():
+        git("-C", str(repo_path), "config", key, value)
+
+
+def fetch_demo_remote(repo_path: Path, branches: list[str]) -> None:
+    """Fetches every branch of the demo's remote and fast-forwards the given local branches in a single fetch."""
+    git(
+        "-C",
+        str(repo_path),
+        "fetch",
+        "--quiet",
+        DEMO.remote,
+        f"+refs/heads/*:refs/remotes/{DEMO.remote}/*",
+        *(f"{branch}:{branch}" for branch in branches)
     )
-    return demos_cache_folder / demo_name
+
+
+@contextmanager
+def in_demo_worktree(
+    demos_cache_folder: Path,
+    add_rust_extension: bool,
+    operation: str,
+    start_point: str,
+    branch: Optional[str] = None
+) -> Generator[Path, None, None]:
+    """Returns a context manager for working within a worktree of the demo dedicated to the given operation.
+
+    Every worktree of a demo shares its bare store, so operations on the same demo never have to share a checkout or
+    clone it again. The worktree is checked out detached at the start point, or on the given branch, which is created
+    or reset to the start point and must be one only this operation uses. The main and develop branches are never
+    checked out, as the store's fetch can't update a branch that any worktree holds.
+
+    The worktree is locked with the PID of the process using it while the operation runs, and is removed again on
+    exit. A worktree left behind by the same operation is only replaced once the process that locked it has exited.
+    """
+    if branch in (DEMO.main_branch, DEMO.develop_branch):
+        raise ValueError(f"Demo worktrees can't check out {branch}, which the demo store fetches into.")
+
+    demo_name: str = get_demo_name(add_rust_extension=add_rust_extension)
+    # Resolved to match the paths git lists its worktrees by
+    worktree_path: Path = (demos_cache_folder / DEMO_WORKTREES_FOLDER_NAME / demo_name / operation).resolve()
+    existing_store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=demo_name)
+    if existing_store_path.is_dir():
+        _remove_stale_demo_worktree(store_path=existing_store_path, worktree_path=worktree_path)
+    store_path: Path = ensure_demo_store(demos_cache_folder=demos_cache_folder, demo_name=demo_name)
+
+    checkout_args: list[str] = ["-B", branch] if branch is not None else ["--detach"]
+    lock_args: list[str] = ["--lock", "--reason", f"{DEMO_WORKTREE_LOCK_REASON_PREFIX}{os.getpid()}"]
+    git("-C", str(store_path), "worktree", "add", "--quiet", *lock_args, *checkout_args, str(worktree_path), start_point)
+    try:
+        with work_in(worktree_path):
+            yield worktree_path
+    finally:
+        # Passing --force twice removes the worktree despite its lock
+        git("-C", str(store_path), "worktree", "remove", "--force", "--force", str(worktree_path), ignore_error=True)
+
+
+def _remove_stale_demo_worktree(store_path: Path, worktree_path: Path) -> None:
+    """Removes the operation's worktree if a previous run left it behind, pruning any worktree whose folder is gone.
+
+    Raises a RuntimeError if the process that locked the worktree is still running, as that run is still using it.
+    """
+    git("-C", str(store_path), "worktree", "prune")
+    locking_pid: Optional[int] = None
+    is_registered: bool = False
+    listed_path: Optional[Path] = None
+    for line in git("-C", str(store_path), "worktree", "list", "--porcelain").stdout.splitlines():
+        if line.startswith("worktree "):
+            listed_path = Path(line.removeprefix("worktree "))
+            is_registered = is_registered or listed_path == worktree_path
+        elif line.startswith("locked ") and listed_path == worktree_path:
+            reason: str = line.removeprefix("locked ")
+            if reason.startswith(DEMO_WORKTREE_LOCK_REASON_PREFIX):
+                locking_pid = int(reason.removeprefix(DEMO_WORKTREE_LOCK_REASON_PREFIX))
+
+    if locking_pid is not None and _is_process_running(locking_pid):
+        raise RuntimeError(f"The demo worktree at {worktree_path} is in use by the running process {locking_pid}.")
+
+    if is_registered:
+        git("-C", str(store_path), "worktree", "remove", "--force", "--force", str(worktree_path), ignore_error=True)
+    shutil.rmtree(worktree_path, ignore_errors=True)
+    git("-C", str(store_path), "worktree", "prune")
+
+
+def _is_process_running(pid: int) -> bool:
+    """Returns whether a process with the given PID is running on this machine."""
+    if os.name == "nt":
+        result: Optional[subprocess.CompletedProcess] = run_command(
+            "tasklist", "/FI", f"PID eq {pid}", "/NH", ignore_error=True
+        )
+        return result is not None and str(pid) in result.stdout.split()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _get_demo_remote_url(checkout_path: Path) -> str:
+    """Returns the url of the demo's remote, preferring the one its existing checkout uses."""
+    if (checkout_path / ".git").exists():
+        result: Optional[subprocess.CompletedProcess] = git(
+            "-C", str(checkout_path), "remote", "get-url", DEMO.remote, ignore_error=True
+        )
+        if result is not None:
+            return result.stdout.strip()
+    return f"https://github.com/{DEMO.app_author}/{DEMO.app_name}.git"
 
 
 def _remove_existing_demo(demo_path: Path) -> None:
@@ -251,10 +2315,169 @@ def get_demo_name(add_rust_extension: bool) -> str:
     return f"robust-{name_modifier}-demo"
 
 
+# Separators between the fields and the records of the git log read by the changelog engine
+GIT_LOG_FIELD_SEPARATOR: str = "\x1f"
+GIT_LOG_RECORD_SEPARATOR: str = "\x1e"
+
+
+def _order_changelog_tree(tree: Iterable[dict[str, Any]], change_type_order: list[str]) -> list[dict[str, Any]]:
+    """Orders the changes of each release in a changelog tree by change type.
+
+    Newer commitizen releases replace order_changelog_tree with the generator generate_ordered_changelog_tree, so this
+    uses whichever the installed version provides.
+    """
+    from commitizen import changelog
+
+    order: Callable[..., Iterable[dict[str, Any]]] = getattr(
+        changelog, "generate_ordered_changelog_tree", None
+    ) or changelog.order_changelog_tree
+    return list(order(tree, change_type_order))
+
+
+class ChangelogEngine:
+    """Builds changelogs with commitizen as a library, caching the changes parsed from each commit by its SHA.
+
+    A commit's message never changes, so once it has been parsed with the configured commit rules its changes are
+    reused by every later changelog, leaving only new commits to read and parse. Parsed changes are cached under the
+    template cache folder per set of commit rules.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the engine with the commitizen config found from the current directory."""
+        from commitizen import factory
+        from commitizen.config import read_cfg
+
+        self.config: Any = read_cfg()
+        self.cz: Any = factory.committer_factory(self.config)
+        self.change_type_map: Optional[dict[str, str]] = (
+            self.config.settings.get("change_type_map") or self.cz.change_type_map
+        )
+        self.cache_path: Path = CHANGELOG_CACHE_FOLDER / f"{self._get_rules_key()}.json"
+        self._parsed_commits: Optional[dict[str, list[list[Any]]]] = None
+        self._has_new_commits: bool = False
+
+    def get_version(self) -> str:
+        """Returns the project's current version as found by its commitizen version provider."""
+        from commitizen.providers import get_provider
+
+        return get_provider(self.config).get_version()
+
+    def get_unreleased_notes(self, start_rev: Optional[str], version: str) -> str:
+        """Renders the changelog of the commits since the start revision as the release of the given version.
+
+        Matches `cz changelog --dry-run --unreleased-version` for the same commits, without any subprocess beyond
+        reading the git log.
+        """
+        from commitizen import changelog
+        from commitizen import defaults
+        from commitizen.changelog_formats import get_changelog_format
+
+        changes: dict[Optional[str], list[dict[str, Any]]] = defaultdict(list)
+        for change_type, change in self._get_changes(start_rev=start_rev):
+            changes[change_type].append(change)
+        # The local date, as cz changelog dates an unreleased version
+        release_date: str = datetime.now().astimezone().date().isoformat()
+        release: dict[str, Any] = {"version": version, "date": release_date, "changes": changes}
+        if self.cz.changelog_release_hook:
+            release = self.cz.changelog_release_hook(release, None)
+
+        change_type_order: list[str] = (
+            self.config.settings.get("change_type_order") or self.cz.change_type_order or defaults.CHANGE_TYPE_ORDER
+        )
+        tree: list[dict[str, Any]] = _order_changelog_tree([release], change_type_order)
+
+        changelog_format: Any = get_changelog_format(self.config, self.config.settings.get("changelog_file"))
+        template: str = self.config.settings.get("template") or changelog_format.template
+        extras: dict[str, Any] = {**self.cz.template_extras, **self.config.settings["extras"]}
+        notes: str = changelog.render_changelog(tree, loader=self.cz.template_loader, template=template, **extras)
+        notes = notes.lstrip("\n")
+        if self.cz.changelog_hook:
+            notes = self.cz.changelog_hook(notes, "")
+        self.save()
+        return notes
+
+    def save(self) -> None:
+        """Writes any newly parsed commits to the cache."""
+        if not self._has_new_commits or self._parsed_commits is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path: Path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(self._parsed_commits, default=str))
+        temp_path.replace(self.cache_path)
+        self._has_new_commits = False
+
+    def _get_changes(self, start_rev: Optional[str]) -> list[tuple[Optional[str], dict[str, Any]]]:
+        """Returns the change type and entry of every change since the start revision, newest commit first."""
+        rev_range: str = f"{start_rev}..HEAD" if start_rev else "HEAD"
+        commits: list[str] = git("rev-list", "--topo-order", rev_range).stdout.split()
+        if not commits:
+            raise ValueError(f"No commits found in {rev_range}.")
+
+        parsed_commits: dict[str, list[list[Any]]] = self._get_parsed_commits()
+        if any(commit not in parsed_commits for commit in commits):
+            self._parse_commits(rev_range=rev_range)
+        return [(change_type, change) for commit in commits for change_type, change in parsed_commits[commit]]
+
+    def _parse_commits(self, rev_range: str) -> None:
+        """Parses every commit in the range that isn't cached yet, the same way commitizen's changelog would."""
+        from commitizen.changelog import process_commit_message
+        from commitizen.git import GitCommit
+
+        changelog_pattern: re.Pattern[str] = re.compile(self.cz.changelog_pattern)
+        subject_pattern: re.Pattern[str] = re.compile(self.cz.commit_parser, re.MULTILINE)
+        body_pattern: re.Pattern[str] = re.compile(self.cz.commit_parser, re.MULTILINE | re.DOTALL)
+        log_format: str = GIT_LOG_FIELD_SEPARATOR.join(["%H", "%P", "%s", "%an", "%ae", "%b"])
+        log: str = git("log", "--topo-order", f"--format={log_format}{GIT_LOG_RECORD_SEPARATOR}", rev_range).stdout
+
+        parsed_commits: dict[str, list[list[Any]]] = self._get_parsed_commits()
+        for record in log.split(GIT_LOG_RECORD_SEPARATOR):
+            if not record.strip():
+                continue
+            rev, parents, title, author, author_email, body = record.lstrip("\n").split(GIT_LOG_FIELD_SEPARATOR)
+            if rev in parsed_commits:
+                continue
+
+            commit: Any = GitCommit(
+                rev=rev, title=title, body=body, author=author, author_email=author_email, parents=parents.split()
+            )
+            changes: dict[Optional[str], list[dict[str, Any]]] = defaultdict(list)
+            if changelog_pattern.match(commit.message):
+                messages: list[Optional[re.Match[str]]] = [
+                    subject_pattern.match(commit.message),
+                    *(body_pattern.match(body_part) for body_part in commit.body.split("\n\n"))
+                ]
+                for message in filter(None, messages):
+                    process_commit_message(
+                        self.cz.changelog_message_builder_hook, message, commit, changes, self.change_type_map
+                    )
+            parsed_commits[rev] = [
+                [change_type, change] for change_type, entries in changes.items() for change in entries
+            ]
+            self._has_new_commits = True
+
+    def _get_parsed_commits(self) -> dict[str, list[list[Any]]]:
+        """Returns the cached changes of each parsed commit, reading the cache the first time."""
+        if self._parsed_commits is None:
+            self._parsed_commits = json.loads(self.cache_path.read_text()) if self.cache_path.exists() else {}
+        return self._parsed_commits
+
+    def _get_rules_key(self) -> str:
+        """Returns a hash of everything that decides which changes are parsed from a commit's message."""
+        from commitizen.__version__ import __version__
+
+        rules: dict[str, Any] = {
+            "commitizen": __version__,
+            "name": self.config.settings["name"],
+            "changelog_pattern": self.cz.changelog_pattern,
+            "commit_parser": self.cz.commit_parser,
+            "change_type_map": self.change_type_map,
+        }
+        return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
 def get_package_version() -> str:
     """Gets the current package version using commitizen."""
-    result = run_command("uvx", "--from", "commitizen", "cz", "version", "-p")
-    return result.stdout.strip()
+    return ChangelogEngine().get_version()
 
 
 def calculate_calver(current_version: str, micro_override: Optional[int] = None) -> str:
@@ -321,13 +2544,11 @@ def get_latest_release_notes() -> str:
 
     Assumes the tag hasn't been applied yet.
     """
+    engine: ChangelogEngine = ChangelogEngine()
     latest_tag: Optional[str] = get_latest_tag()
-    latest_version: str = get_package_version()
+    latest_version: str = engine.get_version()
 
-    # Build the revision range for changelog
-    if latest_tag is None:
-        rev_range = ""
-    else:
+    if latest_tag is not None:
         # Strip 'v' prefix if present for comparison
         tag_version = latest_tag.lstrip("v")
         if tag_version == latest_version:
@@ -335,12 +2556,5 @@ def get_latest_release_notes() -> str:
                 "The latest tag and version are the same. "
                 "Please ensure the release notes are taken before tagging."
             )
-        rev_range = f"{latest_tag}.."
 
-    result = run_command(
-        "uvx", "--from", "commitizen", "cz", "changelog",
-        rev_range,
-        "--dry-run",
-        "--unreleased-version", latest_version
-    )
-    return result.stdout
+    return engine.get_unreleased_notes(start_rev=latest_tag, version=latest_version)
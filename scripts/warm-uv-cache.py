@@ -0,0 +1,99 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "cookiecutter",
+#   "cruft",
+#   "platformdirs",
+#   "python-dotenv",
+#   "typer",
+# ]
+# ///
+"""Python script for pre-populating the shared uv cache and interpreter pool used by the demo workflows."""
+
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from util import UV_WARM_UPS_FOLDER
+from util import FolderOption
+from util import get_demo_name
+from util import remove_readonly
+from util import uv
+
+
+# Files of a demo that uv needs to sync its locked dependencies without the demo's own sources
+LOCK_INPUT_FILES: tuple[str, ...] = ("pyproject.toml", "uv.lock")
+
+cli: typer.Typer = typer.Typer()
+
+
+@cli.callback(invoke_without_command=True)
+def warm_uv_cache(
+    demos_cache_folder: Annotated[Path, FolderOption("--demos-cache-folder", "-c")],
+    min_python_version: Annotated[str, typer.Option("--min-python-version")] = "3.10",
+    max_python_version: Annotated[str, typer.Option("--max-python-version")] = "3.14",
+    force: Annotated[bool, typer.Option("--force", "-f", help="Sync lockfiles that were already warmed up.")] = False
+) -> None:
+    """Installs every supported interpreter into the shared pool and caches the wheels each demo's lockfile needs.
+
+    Each demo's locked dependencies are synced into a throwaway environment once per Python version and uv.lock hash,
+    recorded under the uv warm-ups cache folder, so warming up again after an unchanged lockfile does nothing.
+    """
+    python_versions: list[str] = _get_python_versions(min_python_version, max_python_version)
+    typer.secho(f"Installing Python {', '.join(python_versions)} into the shared interpreter pool.", fg="yellow")
+    uv("python", "install", *python_versions)
+
+    for add_rust_extension in (False, True):
+        demo_path: Path = demos_cache_folder / get_demo_name(add_rust_extension=add_rust_extension)
+        if not (demo_path / "uv.lock").exists():
+            typer.secho(f"Skipping {demo_path.name} as it has no uv.lock.", fg="yellow")
+            continue
+        _warm_lockfile(demo_path=demo_path, python_versions=python_versions, force=force)
+
+
+def _get_python_versions(min_python_version: str, max_python_version: str) -> list[str]:
+    """Returns every minor Python version from the min to the max version, inclusive."""
+    major, min_minor = min_python_version.split(".")
+    _, max_minor = max_python_version.split(".")
+    return [f"{major}.{minor}" for minor in range(int(min_minor), int(max_minor) + 1)]
+
+
+def _warm_lockfile(demo_path: Path, python_versions: list[str], force: bool) -> None:
+    """Syncs the demo's locked dependencies for each Python version not yet warmed up for its current uv.lock."""
+    lock_hash: str = hashlib.sha256((demo_path / "uv.lock").read_bytes()).hexdigest()
+    warm_ups_folder: Path = UV_WARM_UPS_FOLDER / demo_path.name / lock_hash
+    pending_versions: list[str] = [
+        version for version in python_versions if force or not (warm_ups_folder / version).exists()
+    ]
+    if not pending_versions:
+        typer.secho(f"{demo_path.name} is already warmed up for uv.lock {lock_hash[:12]}.", fg="green")
+        return
+
+    project_folder: Path = Path(tempfile.mkdtemp(prefix=f"{demo_path.name}-uv-warm-up-"))
+    try:
+        for name in LOCK_INPUT_FILES:
+            shutil.copy2(demo_path / name, project_folder / name)
+        warm_ups_folder.mkdir(parents=True, exist_ok=True)
+        for version in pending_versions:
+            typer.secho(f"Warming up {demo_path.name} uv.lock {lock_hash[:12]} for Python {version}.", fg="yellow")
+            uv(
+                "sync",
+                "--directory",
+                str(project_folder),
+                "--frozen",
+                "--all-extras",
+                "--all-groups",
+                "--no-install-project",
+                "--python",
+                version
+            )
+            (warm_ups_folder / version).touch()
+    finally:
+        shutil.rmtree(project_folder, onerror=remove_readonly)
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,5 +1,6 @@
 """Fixtures used in all tests for cookiecutter-robust-python."""
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Any
@@ -7,25 +8,45 @@ from typing import Literal
 
 import pytest
 import toml
+import util
 import yaml
 from _pytest.fixtures import FixtureRequest
 from _pytest.tmpdir import TempPathFactory
-from cookiecutter.main import cookiecutter
+from filelock import FileLock
+from util import RenderedPath
+from util import RenderedTree
+from util import TemplateRenderer
+from util import get_template_state
+from util import git
 
 from tests.constants import REPO_FOLDER
 
 
 pytest_plugins: list[str] = ["pytester"]
 
+# Written into a demo's cache folder once it has been fully written and set up
+DEMO_READY_MARKER: str = ".demo-ready"
+
 
 @pytest.fixture(scope="session")
 def demos_folder(tmp_path_factory: TempPathFactory) -> Path:
-    """Temp Folder used for storing demos while testing."""
-    path: Path = tmp_path_factory.mktemp("demos")
+    """Temp Folder used for storing demos while testing, shared by every pytest-xdist worker of the test run."""
+    base_folder: Path = tmp_path_factory.getbasetemp()
+    if os.getenv("PYTEST_XDIST_WORKER") is not None:
+        # Each worker's base temp folder lives within the one the whole test run shares
+        base_folder = base_folder.parent
+    path: Path = base_folder / "demos"
+    path.mkdir(exist_ok=True)
     os.environ["COOKIECUTTER_ROBUST_PYTHON__DEMOS_CACHE_FOLDER"] = str(path)
     return path
 
 
+@pytest.fixture(scope="session")
+def template_renderer() -> TemplateRenderer:
+    """Renderer shared by every demo, backed by the persistent Jinja bytecode cache."""
+    return TemplateRenderer(template_folder=REPO_FOLDER, commit=get_template_state().commit)
+
+
 @pytest.fixture(scope="session")
 def robust_yaml(request: FixtureRequest, robust_file: str) -> dict[str, Any]:
     return getattr(request, "param", yaml.safe_load(robust_file))
@@ -43,8 +64,10 @@ def robust_file(request: FixtureRequest, robust_file__path: Path) -> str:
 
 
 @pytest.fixture(scope="session")
-def robust_file__path(request: FixtureRequest, robust_demo: Path, robust_file__path__relative: str) -> Path:
-    return getattr(request, "param", robust_demo / robust_file__path__relative)
+def robust_file__path(
+    request: FixtureRequest, robust_tree: RenderedTree, robust_file__path__relative: str
+) -> RenderedPath:
+    return getattr(request, "param", robust_tree / robust_file__path__relative)
 
 
 @pytest.fixture(scope="session")
@@ -53,34 +76,45 @@ def robust_file__path__relative(request: FixtureRequest) -> str:
 
 
 @pytest.fixture(scope="session")
-def robust_demo(
-    demos_folder: Path,
-    robust_demo__path: Path,
-    robust_demo__extra_context: dict[str, Any],
-    robust_demo__is_setup: bool
-) -> Path:
-    cookiecutter(
-        str(REPO_FOLDER),
-        no_input=True,
-        overwrite_if_exists=True,
-        output_dir=demos_folder,
-        extra_context=robust_demo__extra_context,
-    )
-    if robust_demo__is_setup:
-        subprocess.run(["nox", "-s", "setup-git"], cwd=robust_demo__path, capture_output=True)
-        subprocess.run(["nox", "-s", "setup-venv"], cwd=robust_demo__path, capture_output=True)
+def robust_tree(template_renderer: TemplateRenderer, robust_demo__extra_context: dict[str, Any]) -> RenderedTree:
+    """In-memory render of the demo, for tests that only inspect the generated files."""
+    context: dict[str, Any] = template_renderer.build_context(extra_context=robust_demo__extra_context)
+    return template_renderer.render_tree(context=context)
+
+
+@pytest.fixture(scope="session")
+def robust_demo(robust_tree: RenderedTree, robust_demo__path: Path, robust_demo__is_setup: bool) -> Path:
+    """Demo written to disk, for tests that need to run commands within it.
+
+    Each rendered demo is written and set up exactly once per test run, under a lock that every pytest-xdist worker
+    needing the same demo waits on, while a demo left half built by a failed worker is built again from scratch.
+    """
+    cache_folder: Path = robust_demo__path.parent
+    with FileLock(cache_folder.with_suffix(".lock")):
+        if not (cache_folder / DEMO_READY_MARKER).exists():
+            shutil.rmtree(cache_folder, ignore_errors=True)
+            robust_tree.write_to(output_folder=cache_folder)
+            if robust_demo__is_setup:
+                subprocess.run(["nox", "-s", "setup-git"], cwd=robust_demo__path, capture_output=True)
+                subprocess.run(["nox", "-s", "setup-venv"], cwd=robust_demo__path, capture_output=True)
+            (cache_folder / DEMO_READY_MARKER).touch()
     return robust_demo__path
 
 
 @pytest.fixture(scope="session")
-def robust_demo__path(demos_folder: Path, robust_demo__name: str) -> Path:
-    return demos_folder / robust_demo__name
+def robust_demo__path(demos_folder: Path, robust_tree: RenderedTree, robust_demo__name: str) -> Path:
+    """Path of the demo within a cache folder keyed by its rendered content."""
+    return demos_folder / robust_tree.get_digest()[:16] / robust_demo__name
 
 
 @pytest.fixture(scope="session")
-def robust_demo__name(robust_demo__add_rust_extension: str, robust_demo__is_setup: bool) -> str:
+def robust_demo__name(
+    robust_demo__add_rust_extension: str,
+    robust_demo__repository_provider: Literal["github", "gitlab", "bitbucket"],
+    robust_demo__is_setup: bool
+) -> str:
     build: str = "maturin" if robust_demo__add_rust_extension else "python"
-    name_parts: list[str] = ["robust", "python", "demo", build]
+    name_parts: list[str] = ["robust", "python", "demo", build, robust_demo__repository_provider]
     if robust_demo__is_setup:
         name_parts.append("setup")
     return "-".join(name_parts)
@@ -112,3 +146,26 @@ def robust_demo__repository_provider(request: FixtureRequest) -> Literal["github
 @pytest.fixture(scope="session")
 def robust_demo__is_setup(request: FixtureRequest) -> bool:
     return getattr(request, "param", True)
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Empty git repository on a main branch, used as the working directory and committed to as a test author."""
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Tester")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "tester@example.com")
+    repo_path: Path = tmp_path / "repo"
+    repo_path.mkdir()
+    monkeypatch.chdir(repo_path)
+    git("init", "--quiet", "--initial-branch=main")
+    return repo_path
+
+
+@pytest.fixture
+def render_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Empty render cache that renders are published to in place of the user's own."""
+    render_cache_folder: Path = tmp_path / "renders"
+    monkeypatch.setattr(util, "RENDER_CACHE_FOLDER", render_cache_folder)
+    monkeypatch.setattr(util, "RENDER_BLOBS_FOLDER", render_cache_folder / "blobs")
+    return render_cache_folder
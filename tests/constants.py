@@ -34,6 +34,25 @@ IDEMPOTENT_NOX_SESSIONS: list[str] = [
     "tox",
     "coverage",
 ]
+
+# Files and folders within a demo that each nox session writes to, where sessions sharing any can't run at once,
+# SOURCES_RESOURCE stands for the project's own files that formatters and fixers may rewrite and NOX_ENVDIR_RESOURCE
+# for the .nox folder every session with its own virtualenv creates that virtualenv in
+SOURCES_RESOURCE: str = "sources"
+NOX_ENVDIR_RESOURCE: str = ".nox"
+NOX_SESSION_RESOURCES: dict[str, tuple[str, ...]] = {
+    "pre-commit": (SOURCES_RESOURCE, ".ruff_cache", NOX_ENVDIR_RESOURCE),
+    "lint-python": (SOURCES_RESOURCE, ".ruff_cache"),
+    "format-python": (SOURCES_RESOURCE, ".ruff_cache"),
+    **dict.fromkeys(TYPE_CHECK_NOX_SESSIONS, (NOX_ENVDIR_RESOURCE,)),
+    **dict.fromkeys(TESTS_NOX_SESSIONS, (".coverage", "coverage.xml", NOX_ENVDIR_RESOURCE)),
+    "build-docs": ("docs/_build", NOX_ENVDIR_RESOURCE),
+    "build-python": ("dist", ".venv"),
+    "build-container": ("dist",),
+    "tox": (".tox",),
+    "coverage": (".coverage", "coverage-html", NOX_ENVDIR_RESOURCE),
+}
+
 CONTEXT_DEPENDENT_NOX_SESSIONS: list[str] = [
     "coverage",
     "publish-python",
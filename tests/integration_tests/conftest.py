@@ -1 +1,32 @@
 """Fixtures used in integration tests for cookiecutter-robust-python."""
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+from filelock import FileLock
+
+from tests.constants import IDEMPOTENT_NOX_SESSIONS
+from tests.util import NoxSessionResult
+from tests.util import run_nox_sessions
+
+
+# Written into a demo's cache folder once every idempotent nox session has been run against the demo
+NOX_SESSION_RESULTS_FILE: str = ".nox-session-results.json"
+
+
+@pytest.fixture(scope="session")
+def robust_demo__nox_session_results(robust_demo: Path) -> dict[str, NoxSessionResult]:
+    """Outcome of every idempotent nox session, run concurrently against the demo.
+
+    The sessions are run once per demo by whichever pytest-xdist worker gets there first, while every other worker
+    waits for and reuses the recorded outcomes.
+    """
+    results_path: Path = robust_demo.parent / NOX_SESSION_RESULTS_FILE
+    with FileLock(results_path.with_suffix(".lock")):
+        if not results_path.exists():
+            results: dict[str, NoxSessionResult] = run_nox_sessions(
+                project_path=robust_demo, sessions=IDEMPOTENT_NOX_SESSIONS
+            )
+            results_path.write_text(json.dumps([asdict(result) for result in results.values()]))
+    return {result["session"]: NoxSessionResult(**result) for result in json.loads(results_path.read_text())}
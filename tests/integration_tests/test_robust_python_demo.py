@@ -6,25 +6,16 @@ from pathlib import Path
 import pytest
 
 from tests.constants import IDEMPOTENT_NOX_SESSIONS
+from tests.util import NoxSessionResult
 
 
 @pytest.mark.parametrize("session", IDEMPOTENT_NOX_SESSIONS)
-def test_demo_project_nox_session(robust_demo: Path, session: str) -> None:
-    command: list[str] = ["nox", "-s", session]
-    try:
-        subprocess.run(
-            command,
-            cwd=robust_demo,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            check=True
-        )
-    except subprocess.CalledProcessError as e:
+def test_demo_project_nox_session(robust_demo__nox_session_results: dict[str, NoxSessionResult], session: str) -> None:
+    result: NoxSessionResult = robust_demo__nox_session_results[session]
+    if result.returncode != 0:
         pytest.fail(
-            f"nox session '{session}' failed with exit code {e.returncode}\n"
-            f"{'-'*20} STDOUT {'-'*20}\n{e.stdout}\n"
-            f"{'-'*20} STDERR {'-'*20}\n{e.stderr}"
+            f"nox session '{session}' failed with exit code {result.returncode} after {result.seconds:.1f}s\n"
+            f"{'-'*20} STDOUT {'-'*20}\n{result.output}"
         )
 
 
@@ -0,0 +1,96 @@
+"""Tests the async git helpers and the synchronous wrappers around them."""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import util
+from util import git
+from util import git_async
+from util import is_ancestor
+from util import is_ancestor_async
+from util import is_branch_synced_with_remote
+from util import is_branch_synced_with_remote_async
+from util import run_command_async
+from util import run_sync
+from util import validate_is_synced_ancestor
+from util import validate_is_synced_ancestor_async
+
+
+@pytest.fixture
+def synced_repo(git_repo: Path, tmp_path: Path) -> Path:
+    """Repository whose main and develop branches match those of its origin remote."""
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: initial commit")
+    git("checkout", "--quiet", "-b", "develop")
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: develop commit")
+    git("clone", "--quiet", "--bare", str(git_repo), str(tmp_path / "origin.git"))
+    git("remote", "add", "origin", str(tmp_path / "origin.git"))
+    git("fetch", "--quiet", "origin")
+    return git_repo
+
+
+def test_run_sync_returns_result() -> None:
+    async def add(left: int, right: int) -> int:
+        return left + right
+
+    assert run_sync(add(1, 2)) == 3
+
+
+def test_run_sync_within_running_loop_raises(synced_repo: Path) -> None:
+    async def call_sync_wrapper() -> bool:
+        return is_branch_synced_with_remote(branch="develop")
+
+    with pytest.raises(RuntimeError, match="is_branch_synced_with_remote_async can't be run synchronously"):
+        asyncio.run(call_sync_wrapper())
+
+
+def test_synced_branches(synced_repo: Path) -> None:
+    assert is_branch_synced_with_remote(branch="develop")
+    assert asyncio.run(is_branch_synced_with_remote_async(branch="main"))
+    validate_is_synced_ancestor(ancestor="main", descendent="develop")
+    asyncio.run(validate_is_synced_ancestor_async(ancestor="main", descendent="develop"))
+
+
+def test_unsynced_branch(synced_repo: Path) -> None:
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: unpushed commit")
+
+    assert not asyncio.run(is_branch_synced_with_remote_async(branch="develop"))
+    with pytest.raises(ValueError, match="develop is not synced with origin/develop"):
+        asyncio.run(validate_is_synced_ancestor_async(ancestor="main", descendent="develop"))
+
+
+def test_non_ancestor(synced_repo: Path) -> None:
+    with pytest.raises(ValueError, match="develop is not an ancestor of main"):
+        validate_is_synced_ancestor(ancestor="develop", descendent="main")
+
+
+@pytest.mark.parametrize(
+    argnames=("ancestor", "descendent"),
+    argvalues=[("main", "develop"), ("develop", "main"), ("origin/main", "develop"), ("missing", "main")],
+)
+def test_is_ancestor_async_matches_sync(synced_repo: Path, ancestor: str, descendent: str) -> None:
+    assert asyncio.run(is_ancestor_async(ancestor=ancestor, descendent=descendent)) is is_ancestor(
+        ancestor=ancestor, descendent=descendent
+    )
+
+
+def test_git_async_errors(synced_repo: Path) -> None:
+    assert asyncio.run(git_async("rev-parse", "--verify", "missing", ignore_error=True)) is None
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(git_async("rev-parse", "--verify", "missing"))
+
+
+def test_run_command_async_limits_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(util, "MAX_CONCURRENT_COMMANDS", 2)
+    command: list[str] = [sys.executable, "-c", "import time; print(time.time()); time.sleep(0.2); print(time.time())"]
+
+    async def run_all() -> list[subprocess.CompletedProcess]:
+        return await asyncio.gather(*(run_command_async(*command) for _ in range(4)))
+
+    spans: list[tuple[float, float]] = [
+        tuple(float(line) for line in result.stdout.split()) for result in asyncio.run(run_all())
+    ]
+    overlaps: list[int] = [sum(start <= moment < end for start, end in spans) for moment, _ in spans]
+    assert max(overlaps) == 2
@@ -0,0 +1,75 @@
+"""Tests that the cached changelog engine renders the same release notes as commitizen's own changelog command."""
+
+import sys
+from pathlib import Path
+
+import pytest
+import util
+from util import ChangelogEngine
+from util import git
+from util import run_command
+
+
+pytest.importorskip("commitizen")
+
+PYPROJECT: str = """\
+[project]
+name = "fixture"
+version = "0.2.0"
+
+[tool.commitizen]
+name = "cz_conventional_commits"
+version_provider = "pep621"
+tag_format = "v$version"
+"""
+
+COMMIT_MESSAGES: list[str] = [
+    "feat: add the first feature",
+    "fix: repair the first feature",
+    "feat(cli): add a command\n\nfix: handle an empty argument",
+    "docs: describe the command",
+    "refactor!: rename the command\n\nBREAKING CHANGE: the old name is gone",
+    "chore: tidy up",
+]
+
+
+@pytest.fixture
+def changelog_repo(git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Repository with one tagged release followed by a few conventional commits."""
+    (git_repo / "pyproject.toml").write_text(PYPROJECT)
+    git("add", "pyproject.toml")
+    git("commit", "--quiet", "-m", "feat: initial release")
+    git("tag", "v0.1.0")
+    for message in COMMIT_MESSAGES:
+        git("commit", "--quiet", "--allow-empty", "-m", message)
+
+    monkeypatch.setattr(util, "CHANGELOG_CACHE_FOLDER", tmp_path / "changelog-cache")
+    return git_repo
+
+
+def _cz_changelog(start_rev: str, version: str) -> str:
+    return run_command(
+        sys.executable, "-m", "commitizen", "changelog",
+        "--start-rev", start_rev,
+        "--dry-run",
+        "--unreleased-version", version,
+    ).stdout
+
+
+def test_unreleased_notes_match_cz_changelog(changelog_repo: Path) -> None:
+    notes: str = ChangelogEngine().get_unreleased_notes(start_rev="v0.1.0", version="0.2.0")
+
+    assert notes.strip() == _cz_changelog(start_rev="v0.1.0", version="0.2.0").strip()
+    assert "### BREAKING CHANGE" in notes
+
+
+def test_unreleased_notes_reuse_parsed_commits(changelog_repo: Path) -> None:
+    first_notes: str = ChangelogEngine().get_unreleased_notes(start_rev="v0.1.0", version="0.2.0")
+    git("commit", "--quiet", "--allow-empty", "-m", "perf: speed up the command")
+
+    engine: ChangelogEngine = ChangelogEngine()
+    notes: str = engine.get_unreleased_notes(start_rev="v0.1.0", version="0.2.0")
+
+    assert first_notes != notes
+    assert notes.strip() == _cz_changelog(start_rev="v0.1.0", version="0.2.0").strip()
+    assert engine.cache_path.exists()
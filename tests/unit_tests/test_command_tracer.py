@@ -0,0 +1,61 @@
+"""Tests the command tracing that run_command does when COOKIECUTTER_ROBUST_PYTHON__TRACE_FILE is set."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+import util
+from util import CommandTracer
+from util import run_command
+
+
+@pytest.fixture
+def tracer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CommandTracer:
+    """Tracer that run_command records to, as if tracing were enabled through the environment."""
+    command_tracer: CommandTracer = CommandTracer(trace_path=tmp_path / "trace.json")
+    monkeypatch.setattr(util, "_TRACER", command_tracer)
+    return command_tracer
+
+
+def test_commands_are_traced(tracer: CommandTracer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    run_command(sys.executable, "-c", "print('output')")
+    run_command(sys.executable, "-c", "raise SystemExit(3)", ignore_error=True)
+
+    assert [trace.returncode for trace in tracer.traces] == [0, 3]
+    assert tracer.traces[0].name == f"{sys.executable} -c"
+    assert tracer.traces[0].cwd == str(tmp_path)
+    assert tracer.traces[0].output_size == len("output\n")
+    calls, failures, *_, command, subcommand = tracer.get_summary().splitlines()[1].split()
+    assert (calls, failures, command, subcommand) == ("2", "1", sys.executable, "-c")
+
+
+def test_trace_events(tracer: CommandTracer) -> None:
+    run_command(sys.executable, "-c", "pass")
+
+    event: dict[str, Any] = tracer.to_trace_events()[0]
+
+    assert (event["name"], event["ph"], event["cat"]) == (f"{sys.executable} -c", "X", sys.executable)
+    assert event["args"]["args"] == ["-c", "pass"]
+    assert event["dur"] >= 0
+
+
+def test_write_appends_to_existing_trace(tracer: CommandTracer) -> None:
+    tracer.trace_path.write_text(json.dumps({"traceEvents": [{"name": "earlier script"}]}))
+    run_command(sys.executable, "-c", "pass")
+
+    tracer.write()
+
+    events: list[dict[str, Any]] = json.loads(tracer.trace_path.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["earlier script", f"{sys.executable} -c"]
+
+
+def test_tracing_is_opt_in(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("COOKIECUTTER_ROBUST_PYTHON__TRACE_FILE", raising=False)
+    assert util._get_command_tracer() is None
+
+    monkeypatch.setenv("COOKIECUTTER_ROBUST_PYTHON__TRACE_FILE", str(tmp_path / "trace.json"))
+    assert util._get_command_tracer().trace_path == tmp_path / "trace.json"
@@ -0,0 +1,106 @@
+"""Tests that updating a project from the render cache matches cruft update."""
+
+import filecmp
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import cruft
+import pytest
+from _pytest.fixtures import FixtureRequest
+from cookiecutter.utils import work_in
+from cruft_update import update_from_cached_renders
+from util import REPO_FOLDER
+from util import can_render_commit
+from util import get_template_state
+from util import git
+
+from tests.constants import COOKIECUTTER_FOLDER
+from tests.constants import COOKIECUTTER_JSON
+
+
+EXTRA_CONTEXT: dict[str, Any] = {"project_name": "robust-python-demo", "add_rust_extension": False}
+UPDATED_EXTRA_CONTEXT: dict[str, Any] = {
+    **EXTRA_CONTEXT, "min_python_version": COOKIECUTTER_JSON["max_python_version"]
+}
+
+
+def _get_previous_template_commit() -> Optional[str]:
+    """Returns the last commit before HEAD that changed the template, if the history has one the renderer supports."""
+    with work_in(REPO_FOLDER):
+        if git("rev-parse", "--verify", "--quiet", "HEAD~1", ignore_error=True) is None:
+            return None
+        commit: str = git("log", "-1", "--format=%H", "HEAD~1", "--", COOKIECUTTER_FOLDER.name).stdout.strip()
+    return commit if commit and can_render_commit(commit) else None
+
+
+@pytest.fixture(params=["head", "previous"])
+def start_commit(request: FixtureRequest) -> str:
+    """Template commit the project is created at, either HEAD itself or an earlier commit that changed the template."""
+    if request.param == "head":
+        return get_template_state().commit
+    commit: Optional[str] = _get_previous_template_commit()
+    if commit is None:
+        pytest.skip("The template's history has no earlier commit the renderer supports.")
+    return commit
+
+
+@pytest.fixture
+def cruft_project(git_repo: Path, tmp_path: Path, start_commit: str) -> Path:
+    """Project created by cruft at the start commit and committed to its own repository."""
+    project_path: Path = Path(
+        cruft.create(
+            template_git_url=str(REPO_FOLDER),
+            checkout=start_commit,
+            no_input=True,
+            extra_context=EXTRA_CONTEXT,
+            output_dir=tmp_path / "created",
+        )
+    )
+    git("-C", str(project_path), "init", "--quiet")
+    git("-C", str(project_path), "add", ".")
+    git("-C", str(project_path), "commit", "--quiet", "-m", "chore: initial commit")
+    return project_path
+
+
+def _copy_project(project_path: Path, destination: Path) -> Path:
+    return Path(shutil.copytree(project_path, destination, symlinks=True))
+
+
+def _assert_same_tree(left: Path, right: Path) -> None:
+    comparison: filecmp.dircmp = filecmp.dircmp(left, right, ignore=[".git"])
+    pending: list[filecmp.dircmp] = [comparison]
+    while pending:
+        current: filecmp.dircmp = pending.pop()
+        mismatched: list[str] = filecmp.cmpfiles(current.left, current.right, current.common_files, shallow=False)[1]
+        assert (current.left_only, current.right_only, mismatched) == ([], [], []), current.left
+        pending.extend(current.subdirs.values())
+
+
+def test_update_matches_cruft_update(cruft_project: Path, tmp_path: Path) -> None:
+    cruft_updated: Path = _copy_project(cruft_project, tmp_path / "cruft-updated")
+    cache_updated: Path = _copy_project(cruft_project, tmp_path / "cache-updated")
+    template_commit: str = get_template_state().commit
+
+    cruft.update(project_dir=cruft_updated, template_path=REPO_FOLDER, extra_context=UPDATED_EXTRA_CONTEXT)
+    update_from_cached_renders(
+        project_path=cache_updated, template_commit=template_commit, extra_context=UPDATED_EXTRA_CONTEXT
+    )
+
+    _assert_same_tree(cruft_updated, cache_updated)
+    cruft_state: dict[str, Any] = json.loads((cache_updated / ".cruft.json").read_text())
+    assert cruft_state["commit"] == template_commit
+    assert cruft_state["context"]["cookiecutter"]["min_python_version"] == UPDATED_EXTRA_CONTEXT["min_python_version"]
+
+
+def test_update_refuses_unclean_project(cruft_project: Path) -> None:
+    (cruft_project / "README.md").write_text("local edit")
+
+    with pytest.raises(ValueError, match="unclean"):
+        update_from_cached_renders(
+            project_path=cruft_project,
+            template_commit=get_template_state().commit,
+            extra_context=UPDATED_EXTRA_CONTEXT
+        )
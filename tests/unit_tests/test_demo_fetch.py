@@ -0,0 +1,77 @@
+"""Tests that demo stores fetch from the demo's remote in the configured demo fetch mode."""
+
+from pathlib import Path
+
+import pytest
+import util
+from util import RepoMetadata
+from util import configure_demo_repo
+from util import ensure_demo_store
+from util import get_demo_name
+from util import git
+
+
+DEMO: RepoMetadata = RepoMetadata(
+    app_name="robust-python-demo", app_author="tester", remote="origin", main_branch="main", develop_branch="develop"
+)
+
+
+@pytest.fixture
+def demos_cache_folder(git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Demos cache holding a checkout of a demo whose remote serves filtered fetches over file://."""
+    monkeypatch.setattr(util, "DEMO", DEMO)
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: initial commit")
+    git("checkout", "--quiet", "-b", "develop")
+    git("clone", "--quiet", "--bare", str(git_repo), str(tmp_path / "origin.git"))
+    git("-C", str(tmp_path / "origin.git"), "config", "uploadpack.allowFilter", "true")
+
+    cache_folder: Path = tmp_path / "demos"
+    checkout_path: Path = cache_folder / get_demo_name(add_rust_extension=False)
+    git("clone", "--quiet", (tmp_path / "origin.git").as_uri(), str(checkout_path))
+    return cache_folder
+
+
+def _push_develop_file(git_repo: Path, content: str) -> str:
+    """Pushes a commit adding a file to the remote's develop branch, returning the file's blob id."""
+    (git_repo / "added.txt").write_text(content)
+    git("add", "added.txt")
+    git("commit", "--quiet", "-m", "feat: add a file")
+    git("push", "--quiet", str(git_repo.parent / "origin.git"), "develop")
+    return git("rev-parse", "HEAD:added.txt").stdout.strip()
+
+
+def _get_missing_objects(store_path: Path, revision: str) -> list[str]:
+    result: str = git("-C", str(store_path), "rev-list", "--objects", "--missing=print", revision).stdout
+    return [line.removeprefix("?") for line in result.splitlines() if line.startswith("?")]
+
+
+def test_partial_store_leaves_blobs_on_remote(demos_cache_folder: Path, git_repo: Path) -> None:
+    store_path: Path = ensure_demo_store(demos_cache_folder=demos_cache_folder, demo_name=DEMO.app_name)
+    blob_id: str = _push_develop_file(git_repo, content="partial")
+
+    ensure_demo_store(demos_cache_folder=demos_cache_folder, demo_name=DEMO.app_name)
+
+    assert git("-C", str(store_path), "rev-parse", "develop").stdout.strip() == git("rev-parse", "HEAD").stdout.strip()
+    assert _get_missing_objects(store_path, revision="develop") == [blob_id]
+    assert git("-C", str(store_path), "config", "remote.origin.partialclonefilter").stdout.strip() == "blob:none"
+    assert git("-C", str(store_path), "config", "fetch.writeCommitGraph").stdout.strip() == "true"
+
+
+def test_full_store_fetches_blobs(
+    demos_cache_folder: Path, git_repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(util, "DEMO_FETCH_MODE", "full")
+    store_path: Path = ensure_demo_store(demos_cache_folder=demos_cache_folder, demo_name=DEMO.app_name)
+    _push_develop_file(git_repo, content="full")
+
+    ensure_demo_store(demos_cache_folder=demos_cache_folder, demo_name=DEMO.app_name)
+
+    assert _get_missing_objects(store_path, revision="develop") == []
+    assert git("-C", str(store_path), "config", "remote.origin.promisor", ignore_error=True) is None
+
+
+def test_unknown_fetch_mode_raises(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(util, "DEMO_FETCH_MODE", "shallow")
+
+    with pytest.raises(ValueError, match="Unknown demo fetch mode 'shallow'"):
+        configure_demo_repo(repo_path=tmp_path)
@@ -0,0 +1,136 @@
+"""Tests the demo worktrees that demo operations share a bare store through."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import util
+from util import RepoMetadata
+from util import get_current_branch
+from util import get_demo_name
+from util import get_demo_store_path
+from util import git
+from util import in_demo_worktree
+
+
+DEMO: RepoMetadata = RepoMetadata(
+    app_name="robust-python-demo", app_author="tester", remote="origin", main_branch="main", develop_branch="develop"
+)
+
+
+@pytest.fixture
+def demos_cache_folder(git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Demos cache holding a checkout of a demo whose remote has a main and a develop branch."""
+    monkeypatch.setattr(util, "DEMO", DEMO)
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: initial commit")
+    git("checkout", "--quiet", "-b", "develop")
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: develop commit")
+    git("clone", "--quiet", "--bare", str(git_repo), str(tmp_path / "origin.git"))
+
+    cache_folder: Path = tmp_path / "demos"
+    git("clone", "--quiet", str(tmp_path / "origin.git"), str(cache_folder / get_demo_name(add_rust_extension=False)))
+    return cache_folder
+
+
+def _push_develop_commit(git_repo: Path, message: str) -> str:
+    git("-C", str(git_repo), "commit", "--quiet", "--allow-empty", "-m", message)
+    git("-C", str(git_repo), "push", "--quiet", str(git_repo.parent / "origin.git"), "develop")
+    return git("-C", str(git_repo), "rev-parse", "develop").stdout.strip()
+
+
+def _lock_worktree(store_path: Path, worktree_path: Path, pid: int) -> None:
+    git(
+        "-C", str(store_path),
+        "worktree", "add", "--quiet", "--detach",
+        "--lock", "--reason", f"{util.DEMO_WORKTREE_LOCK_REASON_PREFIX}{pid}",
+        str(worktree_path), "develop",
+    )
+
+
+def test_worktrees_in_use_at_once(demos_cache_folder: Path, git_repo: Path) -> None:
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="update-demo", start_point="develop"
+    ) as update_path:
+        develop_commit: str = _push_develop_commit(git_repo, message="feat: pushed while updating")
+
+        with in_demo_worktree(
+            demos_cache_folder=demos_cache_folder,
+            add_rust_extension=False,
+            operation="lint-from-demo",
+            start_point="develop",
+            branch="temp/lint-from-demo"
+        ) as lint_path:
+            # The second worktree's store fetch moved develop even though the first worktree is still in use
+            assert git("rev-parse", "HEAD").stdout.strip() == develop_commit
+            assert get_current_branch() == "temp/lint-from-demo"
+            assert update_path.is_dir()
+
+        assert Path.cwd() == update_path
+        assert get_current_branch() == ""
+        assert not lint_path.exists()
+
+    assert not update_path.exists()
+
+
+def test_running_operation_worktree_is_kept(demos_cache_folder: Path) -> None:
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="update-demo", start_point="develop"
+    ) as worktree_path:
+        (worktree_path / "work.txt").write_text("in progress")
+
+        with pytest.raises(RuntimeError, match="in use by the running process"), in_demo_worktree(
+            demos_cache_folder=demos_cache_folder,
+            add_rust_extension=False,
+            operation="update-demo",
+            start_point="develop"
+        ):
+            pass
+
+        assert (worktree_path / "work.txt").read_text() == "in progress"
+
+
+def test_stale_worktree_is_replaced(demos_cache_folder: Path) -> None:
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="update-demo", start_point="develop"
+    ) as worktree_path:
+        pass
+    store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=worktree_path.parent.name)
+    exited_process: subprocess.Popen = subprocess.Popen([sys.executable, "-c", ""])
+    exited_process.wait()
+    _lock_worktree(store_path=store_path, worktree_path=worktree_path, pid=exited_process.pid)
+    (worktree_path / "leftover.txt").write_text("left behind")
+
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="update-demo", start_point="develop"
+    ) as replaced_path:
+        assert replaced_path == worktree_path
+        assert not (replaced_path / "leftover.txt").exists()
+
+
+def test_other_worktrees_are_left_alone(demos_cache_folder: Path, tmp_path: Path) -> None:
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="update-demo", start_point="develop"
+    ) as worktree_path:
+        pass
+    store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=worktree_path.parent.name)
+    git("-C", str(store_path), "worktree", "add", "--quiet", "--detach", str(tmp_path / "manual-checkout"), "main")
+
+    with in_demo_worktree(
+        demos_cache_folder=demos_cache_folder, add_rust_extension=False, operation="release-demo", start_point="develop"
+    ):
+        pass
+
+    assert (tmp_path / "manual-checkout").is_dir()
+
+
+@pytest.mark.parametrize(argnames="branch", argvalues=["main", "develop"])
+def test_fetched_branches_are_not_checked_out(demos_cache_folder: Path, branch: str) -> None:
+    with pytest.raises(ValueError, match="fetches into"), in_demo_worktree(
+        demos_cache_folder=demos_cache_folder,
+        add_rust_extension=False,
+        operation="update-demo",
+        start_point="develop",
+        branch=branch
+    ):
+        pass
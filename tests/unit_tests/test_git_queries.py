@@ -0,0 +1,60 @@
+"""Tests that memoized git queries are invalidated by any command that may change a repository."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from util import get_current_branch
+from util import get_current_commit
+from util import git
+from util import is_mutating_git_command
+from util import run_command
+
+
+@pytest.fixture
+def committed_repo(git_repo: Path) -> Path:
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: initial commit")
+    git("branch", "other")
+    return git_repo
+
+
+@pytest.mark.parametrize(
+    argnames=("args", "expected"),
+    argvalues=[
+        (("symbolic-ref", "HEAD", "refs/heads/other"), True),
+        (("-C", "repo", "repack", "-ad"), True),
+        (("-c", "core.commitGraph=true", "worktree", "add", "path"), True),
+        (("--git-dir=.git", "update-index", "--refresh"), True),
+        (("rev-parse", "HEAD"), False),
+        (("-C", "commit", "log"), False),
+        (("--no-pager", "show", "HEAD"), False),
+    ],
+)
+def test_is_mutating_git_command(args: tuple[str, ...], expected: bool) -> None:
+    assert is_mutating_git_command(*args) is expected
+
+
+def test_mutating_git_command_invalidates_branch(committed_repo: Path) -> None:
+    assert get_current_branch() == "main"
+
+    git("symbolic-ref", "HEAD", "refs/heads/other")
+
+    assert get_current_branch() == "other"
+
+
+def test_other_commands_invalidate_commit(committed_repo: Path) -> None:
+    first_commit: str = get_current_commit()
+
+    # Not a git command, so run_command can't tell that it commits
+    run_command(sys.executable, "-c", "import subprocess; subprocess.run(['git', 'commit', '-qm', 'x', '--allow-empty'])")
+
+    assert get_current_commit() != first_commit
+
+
+def test_read_only_git_command_keeps_memo(committed_repo: Path) -> None:
+    assert get_current_branch() == "main"
+    (committed_repo / ".git" / "HEAD").write_text("ref: refs/heads/other\n")
+
+    git("rev-parse", "HEAD")
+
+    assert get_current_branch() == "main"
@@ -0,0 +1,98 @@
+"""Tests the git repository reader against a real temporary repository."""
+
+from pathlib import Path
+
+import pytest
+from util import GitRepository
+from util import git
+from util import is_valid_refname
+
+
+@pytest.fixture
+def history(git_repo: Path) -> dict[str, str]:
+    """Repository where a feature branch is merged back into main, returning the commit of each step by name."""
+    commits: dict[str, str] = {}
+
+    def commit(name: str) -> None:
+        git("commit", "--quiet", "--allow-empty", "-m", name)
+        commits[name] = git("rev-parse", "HEAD").stdout.strip()
+
+    commit("root")
+    git("checkout", "--quiet", "-b", "feature")
+    commit("feature")
+    git("checkout", "--quiet", "main")
+    commit("main")
+    git("merge", "--quiet", "--no-ff", "-m", "merge", "feature")
+    commits["merge"] = git("rev-parse", "HEAD").stdout.strip()
+    git("tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    git("checkout", "--quiet", "--orphan", "unrelated")
+    commit("unrelated")
+    git("checkout", "--quiet", "main")
+    return commits
+
+
+@pytest.fixture
+def repository(git_repo: Path, history: dict[str, str]) -> GitRepository:
+    reader: GitRepository = GitRepository.discover(git_repo)
+    yield reader
+    reader.close()
+
+
+@pytest.mark.parametrize(argnames="packed", argvalues=[False, True], ids=["loose", "packed"])
+def test_resolve_matches_rev_parse(repository: GitRepository, history: dict[str, str], packed: bool) -> None:
+    if packed:
+        git("pack-refs", "--all")
+        repository.invalidate()
+
+    for revision in ("HEAD", "main", "feature", "refs/heads/feature", "heads/unrelated", "v1.0.0", "tags/v1.0.0"):
+        assert repository.resolve(revision) == git("rev-parse", revision).stdout.strip(), revision
+    assert repository.resolve("missing") is None
+
+
+def test_symbolic_refs(repository: GitRepository, history: dict[str, str], git_repo: Path) -> None:
+    git("symbolic-ref", "refs/heads/alias", "refs/heads/feature")
+    git("pack-refs", "--all")
+    (git_repo / ".git" / "refs" / "heads" / "escape").write_text("ref: refs/../config\n")
+    repository.invalidate()
+
+    assert repository.resolve("alias") == history["feature"]
+    assert repository.resolve("refs/heads/escape") is None
+    assert repository.get_current_branch() == "main"
+
+    git("checkout", "--quiet", "--detach", "feature")
+    repository.invalidate()
+
+    assert repository.get_current_branch() == ""
+    assert repository.resolve("HEAD") == history["feature"]
+
+
+def test_merge_ancestry(repository: GitRepository, history: dict[str, str]) -> None:
+    assert repository.is_ancestor(history["feature"], "main")
+    assert repository.is_ancestor(history["main"], "v1.0.0")
+    assert repository.is_ancestor(history["root"], history["merge"])
+    assert repository.is_ancestor("main", "main")
+    assert not repository.is_ancestor("main", "feature")
+    assert not repository.is_ancestor(history["main"], "feature")
+    assert not repository.is_ancestor("unrelated", "main")
+    assert not repository.is_ancestor("missing", "main")
+
+
+@pytest.mark.parametrize(
+    argnames=("refname", "expected"),
+    argvalues=[
+        ("HEAD", True),
+        ("refs/heads/feature", True),
+        ("refs/remotes/origin/release/1.0", True),
+        ("main", False),
+        ("config", False),
+        ("ORIG_HEAD", False),
+        ("refs/../config", False),
+        ("refs/heads/.hidden", False),
+        ("refs/heads/branch.lock", False),
+        ("refs/heads/a..b", False),
+        ("refs/heads/with space", False),
+        ("refs/heads/", False),
+    ],
+)
+def test_is_valid_refname(refname: str, expected: bool) -> None:
+    assert is_valid_refname(refname) is expected
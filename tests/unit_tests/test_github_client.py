@@ -0,0 +1,86 @@
+"""Tests the GitHub client used by the demo PR automation against the local stand-in."""
+
+from typing import Optional
+
+import pytest
+from util import GitHubClient
+from util import GitHubStandIn
+from util import PullRequest
+
+
+REPOSITORY: str = "robust-python/robust-python-demo"
+
+# The stand-in accepts any token, so this is never a real credential
+TOKEN: str = "test"  # noqa: S105
+
+
+@pytest.fixture
+def github_stand_in() -> GitHubStandIn:
+    with GitHubStandIn(repositories=[REPOSITORY]) as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def github_client(github_stand_in: GitHubStandIn) -> GitHubClient:
+    client: GitHubClient = GitHubClient(api_url=github_stand_in.url, token=TOKEN)
+    yield client
+    client.close()
+
+
+def test_create_pull_request_reuses_lookup(github_stand_in: GitHubStandIn, github_client: GitHubClient) -> None:
+    assert github_client.find_pull_request(repository=REPOSITORY, head="feature", base="develop") is None
+
+    created: PullRequest = github_client.create_pull_request(
+        repository=REPOSITORY, head="feature", base="develop", title="Feature", body="a..b"
+    )
+    found: Optional[PullRequest] = github_client.find_pull_request(repository=REPOSITORY, head="feature", base="develop")
+
+    assert found == created
+    assert github_stand_in.pull_requests[0]["assignees"] == ["U_viewer"]
+    assert github_stand_in.operations == ["FindPullRequest", "CreatePullRequest", "AddAssignees", "FindPullRequest"]
+
+
+@pytest.mark.parametrize(argnames="auto_merge", argvalues=[True, False], ids=["auto", "clean"])
+def test_merge_pull_request(github_stand_in: GitHubStandIn, github_client: GitHubClient, auto_merge: bool) -> None:
+    github_stand_in.auto_merge = auto_merge
+    pull_request: PullRequest = github_client.create_pull_request(
+        repository=REPOSITORY, head="feature", base="develop", title="Feature", body="a..b", assign_viewer=False
+    )
+
+    github_client.merge_pull_request(pull_request=pull_request)
+
+    assert github_stand_in.pull_requests[0]["auto_merge"] is auto_merge
+    assert github_stand_in.pull_requests[0]["state"] == ("OPEN" if auto_merge else "MERGED")
+
+
+def test_merge_clean_pull_request_deletes_branch(github_stand_in: GitHubStandIn, github_client: GitHubClient) -> None:
+    github_stand_in.auto_merge = False
+    pull_request: PullRequest = github_client.create_pull_request(
+        repository=REPOSITORY, head="feature", base="develop", title="Feature", body="a..b", assign_viewer=False
+    )
+
+    github_client.merge_pull_request(pull_request=pull_request)
+
+    assert github_stand_in.operations[-1] == "MergePullRequestAndDeleteRef"
+    assert github_stand_in.pull_requests[0]["head_ref_id"] is None
+
+
+def test_merge_pull_request_without_head_ref(github_stand_in: GitHubStandIn, github_client: GitHubClient) -> None:
+    github_stand_in.auto_merge = False
+    github_client.create_pull_request(
+        repository=REPOSITORY, head="feature", base="develop", title="Feature", body="a..b", assign_viewer=False
+    )
+    # As when the head branch lives in a fork or has already been deleted
+    github_stand_in.pull_requests[0]["head_ref_id"] = None
+    pull_request: PullRequest = github_client.find_pull_request(repository=REPOSITORY, head="feature", base="develop")
+
+    github_client.merge_pull_request(pull_request=pull_request)
+
+    assert pull_request.head_ref_id is None
+    assert github_stand_in.operations[-1] == "MergePullRequest"
+    assert github_stand_in.pull_requests[0]["state"] == "MERGED"
+
+
+def test_missing_repository_raises(github_client: GitHubClient) -> None:
+    with pytest.raises(ValueError, match="Could not resolve"):
+        github_client.find_pull_request(repository="robust-python/missing", head="feature", base="develop")
@@ -0,0 +1,111 @@
+"""Tests how lint-from-demo picks the files and pre-commit hooks it runs within a demo."""
+
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+from util import git
+from util import run_sync
+
+from tests.util import load_script
+
+
+@pytest.fixture(scope="module")
+def lint_from_demo() -> ModuleType:
+    return load_script("lint-from-demo")
+
+
+@pytest.fixture
+def demo_repo(git_repo: Path) -> Path:
+    """Demo whose last cruft update is followed by a commit and by local changes."""
+    for name in ("README.md", "kept.py", "deleted.py"):
+        (git_repo / name).write_text(f"{name}\n")
+    (git_repo / ".cruft.json").write_text("{}\n")
+    git("add", ".")
+    git("commit", "--quiet", "-m", "chore: cruft update")
+    (git_repo / "kept.py").write_text("changed\n")
+    git("commit", "--quiet", "-am", "feat: change a file")
+    (git_repo / "deleted.py").unlink()
+    (git_repo / "untracked.py").write_text("untracked\n")
+    return git_repo
+
+
+def test_changed_files_since_cruft_update(lint_from_demo: ModuleType, demo_repo: Path) -> None:
+    assert lint_from_demo._get_changed_files() == ["deleted.py", "kept.py", "untracked.py"]
+
+
+def test_changed_files_require_cruft_update(lint_from_demo: ModuleType, git_repo: Path) -> None:
+    git("commit", "--quiet", "--allow-empty", "-m", "feat: initial commit")
+
+    with pytest.raises(ValueError, match=r"Could not find a commit updating \.cruft\.json"):
+        lint_from_demo._get_changed_files()
+
+
+def test_pre_commit_file_args(lint_from_demo: ModuleType, demo_repo: Path) -> None:
+    assert lint_from_demo._get_pre_commit_file_args(changed_files=None) == ["--all-files"]
+    assert lint_from_demo._get_pre_commit_file_args(changed_files=["deleted.py", "kept.py", "untracked.py"]) == [
+        "--files", "kept.py", "untracked.py"
+    ]
+
+
+PRE_COMMIT_CONFIG: str = """\
+repos:
+  - repo: local
+    hooks:
+      - {id: python-first, name: python-first, entry: "true", language: system, files: \\.py$}
+      - {id: rust, name: rust, entry: "true", language: system, files: \\.rs$}
+      - {id: python-second, name: python-second, entry: "true", language: system, files: \\.py$}
+      - {id: everything, name: everything, entry: "true", language: system}
+      - {id: push-only, name: push-only, entry: "false", language: system, stages: [pre-push]}
+      - {id: markdown, name: markdown, entry: "false", language: system, files: \\.md$}
+"""
+
+
+@pytest.fixture
+def hooks_repo(git_repo: Path) -> Path:
+    """Demo with local pre-commit hooks, of which only the markdown hook fails."""
+    (git_repo / ".pre-commit-config.yaml").write_text(PRE_COMMIT_CONFIG)
+    for name in ("module.py", "lib.rs", "README.md"):
+        (git_repo / name).write_text(f"{name}\n")
+    git("add", ".")
+    git("commit", "--quiet", "-m", "chore: add hooks")
+    return git_repo
+
+
+def test_hook_waves_keep_hooks_sharing_files_apart(lint_from_demo: ModuleType, hooks_repo: Path) -> None:
+    waves: list[list[str]] = lint_from_demo._get_hook_waves(filenames=["module.py", "lib.rs", "README.md"])
+
+    # The markdown hook is configured after the hook running on every file, so it has to wait for it
+    assert waves == [["python-first", "rust"], ["python-second"], ["everything"], ["markdown"]]
+
+
+def test_hook_waves_only_share_selected_files(lint_from_demo: ModuleType, hooks_repo: Path) -> None:
+    waves: list[list[str]] = lint_from_demo._get_hook_waves(filenames=["lib.rs"])
+
+    assert waves == [["python-first", "rust", "python-second", "markdown"], ["everything"]]
+
+
+def test_run_pre_commit_reports_failed_hooks(
+    lint_from_demo: ModuleType, hooks_repo: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    wave = lint_from_demo._run_hook_wave(hook_ids=["python-first", "markdown"], file_args=["--all-files"])
+    assert run_sync(wave) == [True, False]
+
+    lint_from_demo._run_pre_commit(changed_files=["module.py"])
+    assert "made changes or failed" not in capsys.readouterr().out
+
+    lint_from_demo._run_pre_commit(changed_files=None)
+    assert "made changes or failed" in capsys.readouterr().out
+
+
+def test_run_pre_commit_skips_deleted_files(
+    lint_from_demo: ModuleType, hooks_repo: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def fail_get_hook_waves(filenames: list[str]) -> list[list[str]]:
+        raise AssertionError("pre-commit was run without any files.")
+
+    monkeypatch.setattr(lint_from_demo, "_get_hook_waves", fail_get_hook_waves)
+
+    lint_from_demo._run_pre_commit(changed_files=["deleted.py"])
+
+    assert "Every changed file was deleted" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+"""Tests that the nox session runner only runs sessions at once that share no resource."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from tests import util
+from tests.constants import NOX_ENVDIR_RESOURCE
+from tests.constants import NOX_SESSION_RESOURCES
+from tests.constants import TESTS_NOX_SESSIONS
+from tests.util import NoxSessionResult
+from tests.util import run_nox_sessions
+
+
+RESOURCES: dict[str, tuple[str, ...]] = {
+    "tests": (".coverage",),
+    "docs": ("docs/_build",),
+    "lint": ("sources",),
+    "format": ("sources",),
+    "coverage": (".coverage", "coverage-html"),
+}
+
+
+@pytest.fixture
+def session_log(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str]]:
+    """Log of every session's start and end, filled in by a stand-in for running a nox session."""
+    log: list[tuple[str, str]] = []
+
+    async def fake_run_nox_session(project_path: Path, session: str) -> NoxSessionResult:
+        log.append(("start", session))
+        await asyncio.sleep(0.01)
+        log.append(("end", session))
+        return NoxSessionResult(session=session, returncode=0, output="", seconds=0.01)
+
+    monkeypatch.setattr(util, "_run_nox_session", fake_run_nox_session)
+    return log
+
+
+def _get_overlapping_sessions(log: list[tuple[str, str]]) -> set[frozenset[str]]:
+    """Returns every pair of sessions that were running at the same time."""
+    running: set[str] = set()
+    overlapping: set[frozenset[str]] = set()
+    for event, session in log:
+        if event == "start":
+            overlapping.update(frozenset((session, other)) for other in running)
+            running.add(session)
+        else:
+            running.remove(session)
+    return overlapping
+
+
+def test_sessions_sharing_a_resource_run_in_order(tmp_path: Path, session_log: list[tuple[str, str]]) -> None:
+    results: dict[str, NoxSessionResult] = run_nox_sessions(
+        project_path=tmp_path, sessions=list(RESOURCES), resources=RESOURCES, jobs=len(RESOURCES)
+    )
+
+    assert list(results) == list(RESOURCES)
+    overlapping: set[frozenset[str]] = _get_overlapping_sessions(session_log)
+    assert frozenset(("lint", "format")) not in overlapping
+    assert frozenset(("tests", "coverage")) not in overlapping
+    assert frozenset(("tests", "docs")) in overlapping
+    assert session_log.index(("end", "lint")) < session_log.index(("start", "format"))
+    assert session_log.index(("end", "tests")) < session_log.index(("start", "coverage"))
+
+
+def test_jobs_limit_sessions_running_at_once(tmp_path: Path, session_log: list[tuple[str, str]]) -> None:
+    run_nox_sessions(project_path=tmp_path, sessions=list(RESOURCES), resources=RESOURCES, jobs=1)
+
+    assert not _get_overlapping_sessions(session_log)
+
+
+def test_virtualenv_sessions_share_nox_envdir() -> None:
+    for session in (*TESTS_NOX_SESSIONS, "pre-commit", "build-docs", "coverage"):
+        assert NOX_ENVDIR_RESOURCE in NOX_SESSION_RESOURCES[session], session
@@ -0,0 +1,53 @@
+"""Tests the per-phase profiling the scripts enable through their --profile option."""
+
+import sys
+from pathlib import Path
+
+import pytest
+import util
+from util import PhaseProfiler
+from util import profile_phase
+from util import profiling
+from util import run_command
+
+
+def test_phases_are_timed_by_nesting() -> None:
+    profiler: PhaseProfiler = PhaseProfiler(name="generate-demo")
+
+    with profiler.phase("generate-demo"):
+        for _ in range(2):
+            with profiler.phase("render"):
+                pass
+        with profiler.phase("materialize"):
+            pass
+
+    assert {key: len(durations) for key, durations in profiler.timings.items()} == {
+        "generate-demo > render": 2,
+        "generate-demo > materialize": 1,
+        "generate-demo": 1,
+    }
+    assert sum(profiler.timings["generate-demo"]) >= sum(profiler.timings["generate-demo > render"])
+
+
+def test_profiling_writes_report(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(util, "PROFILES_FOLDER", tmp_path / "profiles")
+
+    with profiling(name="update-demo", enabled=True):
+        with profile_phase("render"):
+            run_command(sys.executable, "-c", "pass")
+        profiler: PhaseProfiler = util._PROFILER
+
+    assert util._PROFILER is None
+    assert f"update-demo > render > {sys.executable} -c" in profiler.timings
+    profile_paths: list[Path] = list((tmp_path / "profiles").glob("update-demo-*.prof"))
+    assert len(profile_paths) == 1
+    assert "update-demo > render" in profile_paths[0].with_suffix(".txt").read_text()
+
+
+def test_disabled_profiling_records_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(util, "PROFILES_FOLDER", tmp_path / "profiles")
+
+    with profiling(name="update-demo", enabled=False), profile_phase("render"):
+        assert util._PROFILER is None
+
+    assert not (tmp_path / "profiles").exists()
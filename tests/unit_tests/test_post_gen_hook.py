@@ -1,6 +1,13 @@
 from pathlib import Path
+from typing import Any
 
 import pytest
+from cookiecutter.main import cookiecutter
+from util import RenderedPath
+from util import RenderedTree
+from util import TemplateRenderer
+
+from tests.constants import REPO_FOLDER
 
 
 @pytest.mark.parametrize(
@@ -12,8 +19,8 @@ import pytest
     argvalues=["github"],
     indirect=True
 )
-def test_files_removed_for_github(robust_demo: Path, removed_relative_path: str) -> None:
-    path: Path = robust_demo / removed_relative_path
+def test_files_removed_for_github(robust_tree: RenderedTree, removed_relative_path: str) -> None:
+    path: RenderedPath = robust_tree / removed_relative_path
     assert not path.exists()
 
 
@@ -26,8 +33,8 @@ def test_files_removed_for_github(robust_demo: Path, removed_relative_path: str)
     argvalues=["gitlab"],
     indirect=True
 )
-def test_files_removed_for_gitlab(robust_demo: Path, removed_relative_path: str) -> None:
-    path: Path = robust_demo / removed_relative_path
+def test_files_removed_for_gitlab(robust_tree: RenderedTree, removed_relative_path: str) -> None:
+    path: RenderedPath = robust_tree / removed_relative_path
     assert not path.exists()
 
 
@@ -40,8 +47,8 @@ def test_files_removed_for_gitlab(robust_demo: Path, removed_relative_path: str)
     argvalues=["bitbucket"],
     indirect=True
 )
-def test_files_removed_for_bitbucket(robust_demo: Path, removed_relative_path: str) -> None:
-    path: Path = robust_demo / removed_relative_path
+def test_files_removed_for_bitbucket(robust_tree: RenderedTree, removed_relative_path: str) -> None:
+    path: RenderedPath = robust_tree / removed_relative_path
     assert not path.exists()
 
 
@@ -65,6 +72,31 @@ def test_files_removed_for_bitbucket(robust_demo: Path, removed_relative_path: s
     argvalues=["github"],
     indirect=True,
 )
-def test_files_removed_for_no_rust_extension(robust_demo: Path, removed_relative_path: str) -> None:
-    path: Path = robust_demo / removed_relative_path
+def test_files_removed_for_no_rust_extension(robust_tree: RenderedTree, removed_relative_path: str) -> None:
+    path: RenderedPath = robust_tree / removed_relative_path
     assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    argnames="extra_context",
+    argvalues=[
+        {"repository_provider": "github", "add_rust_extension": False},
+        {"repository_provider": "gitlab", "add_rust_extension": True},
+        {"repository_provider": "bitbucket", "add_rust_extension": False},
+    ],
+    ids=["github-python", "gitlab-maturin", "bitbucket-python"]
+)
+def test_post_gen_hook_matches_render_time_exclusions(
+    tmp_path: Path, extra_context: dict[str, Any]
+) -> None:
+    cookiecutter_path: Path = Path(
+        cookiecutter(str(REPO_FOLDER), no_input=True, output_dir=tmp_path / "cookiecutter", extra_context=extra_context)
+    )
+    renderer: TemplateRenderer = TemplateRenderer(template_folder=REPO_FOLDER, commit="")
+    rendered_paths: set[str] = {
+        rendered_file.path for rendered_file in renderer.render(renderer.build_context(extra_context=extra_context))
+    }
+    generated_paths: set[str] = {
+        path.relative_to(cookiecutter_path).as_posix() for path in cookiecutter_path.rglob("*") if path.is_file()
+    }
+    assert generated_paths == rendered_paths
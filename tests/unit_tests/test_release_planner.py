@@ -0,0 +1,129 @@
+"""Tests the generated project's ReleasePlanner against a temporary git repository with tagged releases."""
+
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+from util import git
+
+from tests.constants import COOKIECUTTER_FOLDER
+
+
+pytest.importorskip("commitizen")
+
+RELEASE_UTIL_PATH: Path = COOKIECUTTER_FOLDER / "scripts" / "util.py"
+
+CZ_TOML: str = """\
+[tool.commitizen]
+tag_format = "v$version"
+version_scheme = "pep440"
+version_provider = "pep621"
+major_version_zero = true
+update_changelog_on_bump = true
+"""
+
+PYPROJECT: str = """\
+[project]
+name = "fixture"
+version = "0.1.0"
+"""
+
+
+def _commit(*messages: str) -> None:
+    for message in messages:
+        git("commit", "--quiet", "--allow-empty", "-m", message)
+
+
+@pytest.fixture
+def release_repo(git_repo: Path) -> Path:
+    """Project released as v0.1.0 with a changelog, followed by a feature and a fix."""
+    (git_repo / ".cz.toml").write_text(CZ_TOML)
+    (git_repo / "pyproject.toml").write_text(PYPROJECT)
+    (git_repo / "CHANGELOG.md").write_text("## v0.1.0 (2025-01-01)\n\n### Feat\n\n- initial release\n")
+    git("add", ".")
+    git("commit", "--quiet", "-m", "feat: initial release")
+    git("tag", "v0.1.0")
+    _commit("feat(cli): add a command", "fix: handle an empty argument", "docs: describe the command")
+    return git_repo
+
+
+@pytest.fixture
+def release_util(release_repo: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """The generated project's scripts/util.py, loaded as its own module and pointed at the release repo."""
+    module: ModuleType = importlib.util.module_from_spec(
+        importlib.util.spec_from_file_location("project_release_util", RELEASE_UTIL_PATH)
+    )
+    module.__spec__.loader.exec_module(module)
+    monkeypatch.setattr(module, "REPO_FOLDER", release_repo)
+    return module
+
+
+def test_plan_follows_commits_since_latest_tag(release_util: ModuleType) -> None:
+    planner = release_util.ReleasePlanner()
+    plan = planner.plan()
+
+    assert planner.get_latest_tag() == "v0.1.0"
+    assert (plan.current_version, plan.new_version, plan.increment) == ("0.1.0", "0.2.0", "MINOR")
+    assert plan.changelog.startswith("## v0.2.0 (")
+    assert "- **cli**: add a command" in plan.changelog
+    assert "- handle an empty argument" in plan.changelog
+    assert "initial release" not in plan.changelog
+    assert plan.version_files == ["pyproject.toml"]
+
+
+def test_plan_keeps_major_version_zero(release_util: ModuleType) -> None:
+    _commit("feat!: rename the command")
+
+    assert release_util.ReleasePlanner().plan().new_version == "0.2.0"
+
+
+@pytest.mark.parametrize(
+    argnames=("increment", "expected_version"),
+    argvalues=[("PATCH", "0.1.1"), ("MAJOR", "1.0.0"), ("PRERELEASE", "0.2.0rc0")],
+)
+def test_plan_with_increment(release_util: ModuleType, increment: str, expected_version: str) -> None:
+    assert release_util.ReleasePlanner().plan(increment=increment).new_version == expected_version
+
+
+def test_plan_without_eligible_commits_raises(release_util: ModuleType) -> None:
+    git("tag", "v0.2.0")
+    git("commit", "--quiet", "--allow-empty", "-m", "docs: describe the release")
+    (release_util.REPO_FOLDER / "pyproject.toml").write_text(PYPROJECT.replace("0.1.0", "0.2.0"))
+
+    with pytest.raises(ValueError, match=r"No commits since version 0\.2\.0"):
+        release_util.ReleasePlanner().plan()
+
+
+def test_apply_bumps_version_and_changelog(release_util: ModuleType, release_repo: Path) -> None:
+    planner = release_util.ReleasePlanner()
+    plan = planner.plan()
+
+    planner.apply(plan)
+
+    assert 'version = "0.2.0"' in (release_repo / "pyproject.toml").read_text()
+    changelog: str = (release_repo / "CHANGELOG.md").read_text()
+    assert changelog.index("## v0.2.0") < changelog.index("## v0.1.0")
+    assert release_util.ReleasePlanner().get_version() == "0.2.0"
+
+
+def test_release_notes_and_tag(release_util: ModuleType, release_repo: Path) -> None:
+    planner = release_util.ReleasePlanner()
+    planner.apply(planner.plan())
+
+    notes: str = release_util.get_latest_release_notes()
+    release_util.tag_release()
+
+    assert notes.startswith("## 0.2.0 (")
+    assert "- **cli**: add a command" in notes
+    assert git("tag", "--points-at", "HEAD").stdout.split() == ["v0.2.0"]
+
+
+def test_planner_keeps_working_directory(
+    release_util: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    release_util.ReleasePlanner().plan()
+
+    assert Path.cwd() == tmp_path
@@ -0,0 +1,104 @@
+"""Tests that cached renders share read-only blobs while the demos materialized from them get their own files."""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+import util
+from util import RenderedFile
+from util import link_rendered_file
+from util import materialize_render
+from util import store_blob
+
+
+RENDERED_FILES: list[RenderedFile] = [
+    RenderedFile(path="README.md", content=b"# Demo\n", mode=0o644),
+    RenderedFile(path="scripts/run.sh", content=b"#!/bin/sh\n", mode=0o755),
+    RenderedFile(path="docs/README.md", content=b"# Demo\n", mode=0o644),
+]
+
+
+@pytest.fixture(autouse=True)
+def blobs_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    folder: Path = tmp_path / "blobs"
+    monkeypatch.setattr(util, "RENDER_BLOBS_FOLDER", folder)
+    return folder
+
+
+@pytest.fixture
+def render_path(tmp_path: Path) -> Path:
+    """Render whose files are hardlinked from the blob store."""
+    path: Path = tmp_path / "render"
+    for rendered_file in RENDERED_FILES:
+        link_rendered_file(project_path=path, rendered_file=rendered_file)
+    return path
+
+
+def _get_mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_store_blob_is_keyed_by_content_and_mode(blobs_folder: Path) -> None:
+    blob_path: Path = store_blob(content=b"content", mode=0o644)
+
+    assert blob_path.is_relative_to(blobs_folder)
+    assert blob_path.read_bytes() == b"content"
+    assert _get_mode(blob_path) == 0o444
+    assert store_blob(content=b"content", mode=0o664) == blob_path
+    assert store_blob(content=b"content", mode=0o755) != blob_path
+    assert store_blob(content=b"other", mode=0o644) != blob_path
+
+
+def test_link_rendered_file_shares_blob(render_path: Path) -> None:
+    readme: Path = render_path / "README.md"
+
+    assert readme.samefile(render_path / "docs" / "README.md")
+    assert readme.samefile(store_blob(content=b"# Demo\n", mode=0o644))
+    assert _get_mode(render_path / "scripts" / "run.sh") == 0o555
+
+
+def test_link_rendered_file_falls_back_to_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail_link(source: Path, destination: Path) -> None:
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", fail_link)
+    link_rendered_file(project_path=tmp_path / "render", rendered_file=RENDERED_FILES[1])
+
+    copied: Path = tmp_path / "render" / "scripts" / "run.sh"
+    assert not copied.samefile(store_blob(content=b"#!/bin/sh\n", mode=0o755))
+    assert copied.read_bytes() == b"#!/bin/sh\n"
+    assert _get_mode(copied) == 0o555
+
+
+@pytest.mark.parametrize(argnames="reflinks", argvalues=[True, False], ids=["reflink", "no-reflink"])
+def test_materialize_render(
+    render_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, reflinks: bool
+) -> None:
+    def fail_clone(source: Path, destination: Path) -> bool:
+        return False
+
+    if not reflinks:
+        monkeypatch.setattr(util, "clone_file", fail_clone)
+    project_path: Path = tmp_path / "project"
+
+    counts: dict[str, int] = materialize_render(render_path=render_path, project_path=project_path)
+
+    assert counts["unchanged"] == 0
+    assert counts["cloned"] + counts["copied"] == len(RENDERED_FILES)
+    if not reflinks:
+        assert counts["copied"] == len(RENDERED_FILES)
+    for rendered_file in RENDERED_FILES:
+        path: Path = project_path / rendered_file.path
+        assert path.read_bytes() == rendered_file.content
+        assert not path.samefile(render_path / rendered_file.path)
+        assert _get_mode(path) == rendered_file.mode
+
+    (project_path / "README.md").write_bytes(b"# Edited\n")
+    assert (render_path / "README.md").read_bytes() == b"# Demo\n"
+
+    counts = materialize_render(render_path=render_path, project_path=project_path)
+
+    assert counts["unchanged"] == len(RENDERED_FILES) - 1
+    assert counts["cloned"] + counts["copied"] == 1
+    assert (project_path / "README.md").read_bytes() == b"# Demo\n"
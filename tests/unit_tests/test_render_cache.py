@@ -0,0 +1,70 @@
+"""Tests that renders are keyed by what affects them and reused from the render cache."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import util
+from cookiecutter.utils import work_in
+from util import TemplateState
+from util import get_cached_render
+from util import get_demo_extra_context
+from util import get_render_key
+from util import get_template_state
+from util import git
+
+from tests.constants import REPO_FOLDER
+
+
+EXTRA_CONTEXT: dict[str, Any] = get_demo_extra_context(add_rust_extension=False)
+
+
+def test_template_state_matches_git() -> None:
+    template_state: TemplateState = get_template_state()
+
+    with work_in(REPO_FOLDER):
+        assert template_state.commit == git("rev-parse", "HEAD").stdout.strip()
+        assert template_state.trees == tuple(
+            git("rev-parse", f"HEAD:{path}").stdout.strip() for path in util.TEMPLATE_RENDER_INPUTS
+        )
+    assert get_template_state(commit=template_state.commit) == template_state
+
+
+def test_render_key_depends_on_trees_and_context() -> None:
+    template_state: TemplateState = get_template_state()
+    render_key: str = get_render_key(extra_context=EXTRA_CONTEXT, template_state=template_state)
+    # Commits with the same template trees render the same project
+    same_trees: TemplateState = TemplateState(commit="other", trees=template_state.trees)
+    other_trees: TemplateState = TemplateState(commit=template_state.commit, trees=("other",))
+    reordered_context: dict[str, Any] = dict(reversed(EXTRA_CONTEXT.items()))
+    other_context: dict[str, Any] = {**EXTRA_CONTEXT, "license": "MIT"}
+
+    assert get_render_key(extra_context=reordered_context, template_state=template_state) == render_key
+    assert get_render_key(extra_context=EXTRA_CONTEXT, template_state=same_trees) == render_key
+    assert get_render_key(extra_context=EXTRA_CONTEXT, template_state=other_trees) != render_key
+    assert get_render_key(extra_context=other_context, template_state=template_state) != render_key
+
+
+def test_cached_render_is_reused(render_cache: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    template_state: TemplateState = get_template_state()
+    render_path: Path = get_cached_render(extra_context=EXTRA_CONTEXT, template_state=template_state)
+
+    render_key: str = get_render_key(extra_context=EXTRA_CONTEXT, template_state=template_state)
+    assert render_path == render_cache / render_key / "robust-python-demo"
+    assert json.loads((render_path / ".cruft.json").read_text())["commit"] == template_state.commit
+
+    rendered_keys: list[str] = []
+    render_variant_to_cache = util._render_variant_to_cache
+
+    def record_render(key: str, extra_context: dict[str, Any]) -> Path:
+        rendered_keys.append(key)
+        return render_variant_to_cache(key, extra_context)
+
+    monkeypatch.setattr(util, "_render_variant_to_cache", record_render)
+
+    assert get_cached_render(extra_context=EXTRA_CONTEXT, template_state=template_state) == render_path
+    assert rendered_keys == []
+    assert get_cached_render(extra_context=EXTRA_CONTEXT, template_state=template_state, refresh=True) == render_path
+    assert rendered_keys == [render_key]
+    assert (render_path / "pyproject.toml").is_file()
@@ -0,0 +1,75 @@
+"""Tests that incremental renders only touch the files whose source or inputs changed."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+import util
+from util import get_demo_extra_context
+from util import render_incremental
+
+from tests.constants import COOKIECUTTER_FOLDER
+
+
+EXTRA_CONTEXT: dict[str, Any] = get_demo_extra_context(add_rust_extension=False, license="MIT")
+
+
+@pytest.fixture(autouse=True)
+def render_manifests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    folder: Path = tmp_path / "render-manifests"
+    monkeypatch.setattr(util, "RENDER_MANIFESTS_FOLDER", folder)
+    return folder
+
+
+@pytest.fixture
+def project_path(tmp_path: Path) -> Path:
+    """Project rendered incrementally once."""
+    path: Path = tmp_path / "robust-python-demo"
+    render_incremental(project_path=path, extra_context=EXTRA_CONTEXT)
+    return path
+
+
+def test_first_render_writes_every_file(tmp_path: Path) -> None:
+    path: Path = tmp_path / "robust-python-demo"
+    template_files: list[Path] = [file for file in COOKIECUTTER_FOLDER.rglob("*") if file.is_file()]
+
+    rendered_files: list[str] = render_incremental(project_path=path, extra_context=EXTRA_CONTEXT)
+
+    assert len(rendered_files) == len(template_files)
+    assert (path / "pyproject.toml").is_file()
+    assert "MIT License" in (path / "LICENSE").read_text()
+    assert not (path / "bitbucket-pipelines.yml").exists()
+    assert not (path / "rust").exists()
+
+
+def test_unchanged_render_skips_every_file(project_path: Path) -> None:
+    assert render_incremental(project_path=project_path, extra_context=EXTRA_CONTEXT) == []
+
+
+def test_edited_output_is_rendered_again(project_path: Path) -> None:
+    readme: Path = project_path / "README.md"
+    rendered_readme: str = readme.read_text()
+    readme.write_text("local edit")
+
+    assert render_incremental(project_path=project_path, extra_context=EXTRA_CONTEXT) == ["README.md"]
+    assert readme.read_text() == rendered_readme
+
+
+def test_changed_variable_renders_dependent_files(project_path: Path) -> None:
+    rendered_files: list[str] = render_incremental(
+        project_path=project_path, extra_context={**EXTRA_CONTEXT, "license": "GPL-3.0"}
+    )
+
+    assert "{% if cookiecutter.license == 'GPL-3.0' -%} LICENSE {%- endif %}" in rendered_files
+    assert "noxfile.py" not in rendered_files
+    assert "GNU GENERAL PUBLIC LICENSE" in (project_path / "LICENSE").read_text()
+
+
+def test_newly_excluded_files_are_removed(project_path: Path) -> None:
+    rendered_files: list[str] = render_incremental(
+        project_path=project_path, extra_context={**EXTRA_CONTEXT, "repository_provider": "bitbucket"}
+    )
+
+    assert "bitbucket-pipelines.yml" in rendered_files
+    assert (project_path / "bitbucket-pipelines.yml").is_file()
+    assert not [path for path in (project_path / ".github").rglob("*") if path.is_file()]
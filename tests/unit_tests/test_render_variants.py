@@ -0,0 +1,93 @@
+"""Tests batch rendering of template variants into the render cache."""
+
+import filecmp
+from pathlib import Path
+from typing import Any
+
+import pytest
+import util
+from util import ALL_CONTEXT_VARIABLES
+from util import TemplateRenderer
+from util import get_demo_extra_context
+from util import get_template_state
+from util import get_variant_matrix
+from util import parse_variant
+from util import render_variants
+
+from tests.constants import REPO_FOLDER
+
+
+VARIANTS: list[dict[str, Any]] = [
+    get_demo_extra_context(add_rust_extension=False, license="MIT"),
+    get_demo_extra_context(add_rust_extension=True, license="GPL-3.0"),
+]
+
+
+def _assert_same_tree(left: Path, right: Path) -> None:
+    comparison: filecmp.dircmp = filecmp.dircmp(left, right)
+    pending: list[filecmp.dircmp] = [comparison]
+    while pending:
+        current: filecmp.dircmp = pending.pop()
+        mismatched: list[str] = filecmp.cmpfiles(current.left, current.right, current.common_files, shallow=False)[1]
+        assert (current.left_only, current.right_only, mismatched) == ([], [], []), current.left
+        pending.extend(current.subdirs.values())
+
+
+def test_process_pool_matches_serial_render(
+    render_cache: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pooled_paths: list[Path] = render_variants(variants=VARIANTS, jobs=2)
+    monkeypatch.setattr(util, "RENDER_CACHE_FOLDER", tmp_path / "serial-renders")
+    serial_paths: list[Path] = render_variants(variants=VARIANTS, jobs=1)
+
+    assert len(set(pooled_paths)) == len(VARIANTS)
+    assert all(path.is_relative_to(render_cache) for path in pooled_paths)
+    assert (pooled_paths[1] / "rust").is_dir()
+    assert not (pooled_paths[0] / "rust").exists()
+    for pooled_path, serial_path in zip(pooled_paths, serial_paths, strict=True):
+        _assert_same_tree(pooled_path, serial_path)
+
+
+def test_only_uncached_variants_are_rendered(render_cache: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cached_path: Path = render_variants(variants=VARIANTS[:1])[0]
+    rendered_variants: list[dict[str, Any]] = []
+    render_variant_to_cache = util._render_variant_to_cache
+
+    def record_render(key: str, extra_context: dict[str, Any]) -> Path:
+        rendered_variants.append(extra_context)
+        return render_variant_to_cache(key, extra_context)
+
+    monkeypatch.setattr(util, "_render_variant_to_cache", record_render)
+
+    paths: list[Path] = render_variants(variants=VARIANTS, template_state=get_template_state())
+
+    assert paths[0] == cached_path
+    assert rendered_variants == VARIANTS[1:]
+
+
+def test_get_file_variables() -> None:
+    renderer: TemplateRenderer = TemplateRenderer(
+        template_folder=REPO_FOLDER, commit=get_template_state().commit, bytecode_cache_folder=None
+    )
+
+    assert renderer.get_file_variables("README.md") >= {"project_name", "package_name", "repository_host"}
+    assert "license" in renderer.get_file_variables("{% if cookiecutter.license == 'MIT' -%} LICENSE {%- endif %}")
+    assert renderer.get_file_variables(".cookiecutter.json") == {ALL_CONTEXT_VARIABLES}
+    assert "add_rust_extension" in renderer.get_file_variables("rust/Cargo.toml")
+
+
+def test_get_variant_matrix() -> None:
+    matrix: list[dict[str, Any]] = get_variant_matrix("add_rust_extension", "license")
+
+    assert len(matrix) == 6
+    assert {"add_rust_extension": True, "license": "GPL-3.0"} in matrix
+    with pytest.raises(ValueError, match="not a choice or boolean"):
+        get_variant_matrix("project_name")
+
+
+def test_parse_variant() -> None:
+    assert parse_variant("repository_provider=gitlab, add_rust_extension=True") == {
+        "repository_provider": "gitlab", "add_rust_extension": True
+    }
+    with pytest.raises(ValueError, match="Invalid variant"):
+        parse_variant("license")
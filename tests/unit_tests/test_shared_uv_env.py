@@ -0,0 +1,41 @@
+"""Tests that the shared uv cache is only given to the commands that ask for it."""
+
+import os
+import sys
+
+import pytest
+import util
+from util import get_shared_uv_env
+from util import run_command
+
+from tests.constants import SCRIPTS_FOLDER
+
+
+PRINT_UV_CACHE_DIR: str = "import os; print(os.getenv('UV_CACHE_DIR'))"
+
+
+def test_import_leaves_environment_alone(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+    monkeypatch.setenv("PYTHONPATH", str(SCRIPTS_FOLDER))
+
+    result = run_command(sys.executable, "-c", f"import util; {PRINT_UV_CACHE_DIR}")
+
+    assert result.stdout.strip() == "None"
+
+
+def test_shared_uv_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+    assert get_shared_uv_env()["UV_CACHE_DIR"] == str(util.UV_CACHE_FOLDER)
+
+    monkeypatch.setenv("UV_CACHE_DIR", "custom")
+    assert get_shared_uv_env()["UV_CACHE_DIR"] == "custom"
+
+
+def test_run_command_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+
+    result = run_command(sys.executable, "-c", PRINT_UV_CACHE_DIR, env=get_shared_uv_env())
+
+    assert result.stdout.strip() == str(util.UV_CACHE_FOLDER)
+    assert "UV_CACHE_DIR" not in os.environ
+    assert run_command(sys.executable, "-c", PRINT_UV_CACHE_DIR).stdout.strip() == "None"
@@ -0,0 +1,53 @@
+"""Tests that compiled templates are shared between template checkouts through the bytecode cache."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from jinja2 import Environment
+from jinja2 import FileSystemLoader
+from util import TemplateBytecodeCache
+
+
+def _create_environment(template_folder: Path, cache_folder: Path) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(template_folder)),
+        bytecode_cache=TemplateBytecodeCache(str(cache_folder)),
+        autoescape=True
+    )
+
+
+def _write_template(folder: Path, source: str) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "README.md").write_text(source)
+    return folder
+
+
+def _fail_compile(*args: Any, **kwargs: Any) -> None:
+    raise AssertionError("Template was compiled instead of loaded from the bytecode cache.")
+
+
+def test_checkouts_share_compiled_templates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_folder: Path = tmp_path / "bytecode"
+    cache_folder.mkdir()
+    first_checkout: Path = _write_template(tmp_path / "first", "# {{ name }}")
+    second_checkout: Path = _write_template(tmp_path / "second", "# {{ name }}")
+
+    assert _create_environment(first_checkout, cache_folder).get_template("README.md").render(name="a") == "# a"
+    environment: Environment = _create_environment(second_checkout, cache_folder)
+    monkeypatch.setattr(environment, "compile", _fail_compile)
+
+    assert environment.get_template("README.md").render(name="b") == "# b"
+    assert len(list(cache_folder.iterdir())) == 1
+
+
+def test_changed_source_is_compiled_again(tmp_path: Path) -> None:
+    cache_folder: Path = tmp_path / "bytecode"
+    cache_folder.mkdir()
+    checkout: Path = _write_template(tmp_path / "checkout", "# {{ name }}")
+    _create_environment(checkout, cache_folder).get_template("README.md")
+
+    _write_template(checkout, "## {{ name }}")
+
+    assert _create_environment(checkout, cache_folder).get_template("README.md").render(name="a") == "## a"
+    assert len(list(cache_folder.iterdir())) == 2
@@ -0,0 +1,147 @@
+"""Tests how update-demos renders every demo's update up front and runs each demo's update concurrently."""
+
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from typing import Optional
+
+import pytest
+from typer.testing import CliRunner
+from typer.testing import Result
+from util import TemplateState
+from util import get_demo_store_path
+from util import git
+from util import run_sync
+
+from tests.util import load_script
+
+
+# Stands in for update-demo.py, logging when it ran and failing for the maturin demo
+FAKE_UPDATE_DEMO: str = """\
+import os
+import sys
+import time
+
+start = time.time()
+time.sleep(0.2)
+print(os.environ["ROBUST_DEMO__APP_NAME"], start, time.time(), *sys.argv[1:])
+sys.exit(1 if "--add-rust-extension" in sys.argv else 0)
+"""
+
+LAST_UPDATE_COMMIT: str = "last-update"
+TEMPLATE_COMMIT: str = "template"
+
+
+@pytest.fixture
+def update_demos(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """The update-demos script, running a stand-in for update-demo.py and logging to a temporary folder."""
+    module: ModuleType = load_script("update-demos")
+    (tmp_path / "update-demo.py").write_text(FAKE_UPDATE_DEMO)
+    monkeypatch.setattr(module, "UPDATE_DEMO_SCRIPT", tmp_path / "update-demo.py")
+    monkeypatch.setattr(module, "UPDATE_DEMOS_LOGS_FOLDER", tmp_path / "logs")
+    for env_prefix in module.DEMO_ENV_PREFIXES:
+        monkeypatch.setenv(f"{env_prefix}__APP_NAME", env_prefix.lower())
+        monkeypatch.setenv(f"{env_prefix}__DEVELOP_BRANCH", "develop")
+    return module
+
+
+def _read_log(log_path: Path) -> tuple[str, float, float, list[str]]:
+    app_name, start, end, *args = log_path.read_text().split()
+    return app_name, float(start), float(end), args
+
+
+@pytest.mark.parametrize(argnames="jobs", argvalues=[1, 2])
+def test_update_all_demos(update_demos: ModuleType, jobs: int) -> None:
+    updates = run_sync(update_demos._update_all_demos(update_demo_args=["--branch-override", "feature"], jobs=jobs))
+
+    assert [(update.demo_name, update.returncode) for update in updates] == [
+        ("robust-python-demo", 0), ("robust-maturin-demo", 1)
+    ]
+    python_log, maturin_log = (_read_log(update.log_path) for update in updates)
+    assert (python_log[0], python_log[3]) == ("robust_python_demo", ["--branch-override", "feature"])
+    assert (maturin_log[0], maturin_log[3]) == (
+        "robust_maturin_demo", ["--branch-override", "feature", "--add-rust-extension"]
+    )
+    ran_at_once: bool = python_log[1] < maturin_log[2] and maturin_log[1] < python_log[2]
+    assert ran_at_once is (jobs == 2)
+
+
+def test_failed_update_fails_run(update_demos: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(update_demos, "get_current_commit", lambda: TEMPLATE_COMMIT)
+
+    result: Result = CliRunner().invoke(
+        update_demos.cli, ["--demos-cache-folder", str(tmp_path / "demos"), "--branch-override", "feature"]
+    )
+
+    assert result.exit_code == 1
+    assert f"{'robust-python-demo':<32}updated" in result.output
+    assert f"{'robust-maturin-demo':<32}failed" in result.output
+
+
+def _create_demo_store(demos_cache_folder: Path, demo_name: str, cruft_commit: Optional[str]) -> None:
+    """Creates a demo store whose develop branch was last updated from the given template commit."""
+    checkout_path: Path = demos_cache_folder / demo_name
+    store_path: Path = get_demo_store_path(demos_cache_folder=demos_cache_folder, demo_name=demo_name)
+    git("init", "--quiet", "--initial-branch=develop", str(checkout_path))
+    if cruft_commit is not None:
+        context: dict[str, Any] = {"project_name": demo_name, "license": "MIT", "_template": "private"}
+        cruft_state: dict[str, Any] = {"commit": cruft_commit, "context": {"cookiecutter": context}}
+        (checkout_path / ".cruft.json").write_text(json.dumps(cruft_state))
+        git("-C", str(checkout_path), "add", ".")
+    git("-C", str(checkout_path), "commit", "--quiet", "--allow-empty", "-m", "chore: cruft update")
+    git("clone", "--quiet", "--bare", str(checkout_path), str(store_path))
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_demo_updates_are_rendered_by_commit(
+    update_demos: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    demos_cache_folder: Path = tmp_path / "demos"
+    for demo_name in ("robust-python-demo", "robust-maturin-demo"):
+        _create_demo_store(demos_cache_folder, demo_name=demo_name, cruft_commit=LAST_UPDATE_COMMIT)
+    renders: list[tuple[str, list[dict[str, Any]]]] = []
+
+    def record_render_variants(variants: list[dict[str, Any]], jobs: int, template_state: TemplateState) -> None:
+        renders.append((template_state.commit, variants))
+
+    def can_render_commit(commit: str) -> bool:
+        return commit == LAST_UPDATE_COMMIT
+
+    monkeypatch.setattr(update_demos, "get_current_commit", lambda: TEMPLATE_COMMIT)
+    monkeypatch.setattr(update_demos, "can_render_commit", can_render_commit)
+    monkeypatch.setattr(update_demos, "get_template_state", lambda commit: TemplateState(commit=commit, trees=()))
+    monkeypatch.setattr(update_demos, "render_variants", record_render_variants)
+
+    update_demos._render_demo_updates(
+        demos_cache_folder=demos_cache_folder, min_python_version="3.10", max_python_version="3.14", jobs=2
+    )
+
+    assert [(commit, [variant["project_name"] for variant in variants]) for commit, variants in renders] == [
+        (LAST_UPDATE_COMMIT, ["robust-python-demo", "robust-maturin-demo"]),
+        (TEMPLATE_COMMIT, ["robust-python-demo", "robust-maturin-demo"]),
+    ]
+    assert all(variant["license"] == "MIT" for _, variants in renders for variant in variants)
+    assert not any("_template" in variant for _, variants in renders for variant in variants)
+    assert "min_python_version" not in renders[0][1][0]
+    assert renders[1][1][0]["min_python_version"] == "3.10"
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_demos_without_renderable_update_are_skipped(
+    update_demos: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    demos_cache_folder: Path = tmp_path / "demos"
+    _create_demo_store(demos_cache_folder, demo_name="robust-python-demo", cruft_commit=TEMPLATE_COMMIT)
+    _create_demo_store(demos_cache_folder, demo_name="robust-maturin-demo", cruft_commit=None)
+
+    def fail_render_variants(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("Rendered a demo that is already up to date or has no cruft file.")
+
+    monkeypatch.setattr(update_demos, "get_current_commit", lambda: TEMPLATE_COMMIT)
+    monkeypatch.setattr(update_demos, "render_variants", fail_render_variants)
+
+    update_demos._render_demo_updates(
+        demos_cache_folder=demos_cache_folder, min_python_version="3.10", max_python_version="3.14", jobs=2
+    )
+
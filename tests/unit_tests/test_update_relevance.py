@@ -0,0 +1,113 @@
+"""Tests that demo updates are skipped when the template changes can't affect the demo's files."""
+
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from typing import Optional
+
+import pytest
+from util import TemplateRenderer
+from util import get_affected_render_paths
+from util import git
+
+from tests.util import load_script
+
+
+COOKIECUTTER_JSON: dict[str, Any] = {
+    "project_name": "demo",
+    "add_rust_extension": False,
+    "_exclude_unless": {"rust": {"add_rust_extension": [True]}},
+}
+DEMO_CONTEXT: dict[str, Any] = {"project_name": "demo", "add_rust_extension": False}
+PROJECT_FOLDER: str = "{{cookiecutter.project_name}}"
+README_TEMPLATE: str = "# {{ cookiecutter.project_name }}\n"
+
+
+def _commit_template_file(template_path: Path, path: str, content: str) -> str:
+    (template_path / path).parent.mkdir(parents=True, exist_ok=True)
+    (template_path / path).write_text(content)
+    git("add", ".")
+    git("commit", "--quiet", "-m", f"feat: change {path}")
+    return git("rev-parse", "HEAD").stdout.strip()
+
+
+@pytest.fixture
+def template_commits(git_repo: Path) -> dict[str, str]:
+    """Template history changing a rendered file, then a file excluded for the demo, then cookiecutter.json."""
+    _commit_template_file(git_repo, "hooks/pre_gen_project.py", "")
+    _commit_template_file(git_repo, f"{PROJECT_FOLDER}/rust/lib.rs", "// lib\n")
+    updated_cookiecutter_json: str = json.dumps({**COOKIECUTTER_JSON, "license": "MIT"})
+    return {
+        "initial": _commit_template_file(git_repo, "cookiecutter.json", json.dumps(COOKIECUTTER_JSON)),
+        "rendered": _commit_template_file(git_repo, f"{PROJECT_FOLDER}/README.md", README_TEMPLATE),
+        "excluded": _commit_template_file(git_repo, f"{PROJECT_FOLDER}/rust/lib.rs", "// changed\n"),
+        "cookiecutter": _commit_template_file(git_repo, "cookiecutter.json", updated_cookiecutter_json),
+    }
+
+
+def _get_affected_paths(
+    template_path: Path, commits: dict[str, str], start: str, end: str, add_rust_extension: bool = False
+) -> Optional[set[str]]:
+    renderer: TemplateRenderer = TemplateRenderer(template_folder=template_path, commit=commits[end])
+    extra_context: dict[str, Any] = {**DEMO_CONTEXT, "add_rust_extension": add_rust_extension}
+    context: dict[str, Any] = renderer.build_context(extra_context=extra_context)
+    return get_affected_render_paths(
+        renderer=renderer, context=context, start_commit=commits[start], end_commit=commits[end]
+    )
+
+
+def test_affected_render_paths(git_repo: Path, template_commits: dict[str, str]) -> None:
+    assert _get_affected_paths(git_repo, template_commits, "initial", "rendered") == {"README.md"}
+    assert _get_affected_paths(git_repo, template_commits, "rendered", "excluded") == set()
+    assert _get_affected_paths(
+        git_repo, template_commits, "rendered", "excluded", add_rust_extension=True
+    ) == {"rust/lib.rs"}
+    assert _get_affected_paths(git_repo, template_commits, "excluded", "cookiecutter") is None
+
+
+@pytest.fixture
+def update_demo(git_repo: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """The update-demo script, pointed at the temporary template."""
+    module: ModuleType = load_script("update-demo")
+    monkeypatch.setattr(module, "REPO_FOLDER", git_repo)
+    return module
+
+
+@pytest.fixture
+def demo_path(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "demo"
+    path.mkdir()
+    (path / ".cruft.json").write_text(json.dumps({"context": {"cookiecutter": DEMO_CONTEXT}}))
+    return path
+
+
+@pytest.mark.parametrize(
+    argnames=("start", "end", "expected"),
+    argvalues=[("initial", "rendered", True), ("rendered", "excluded", False), ("excluded", "cookiecutter", True)],
+)
+def test_is_update_relevant(
+    update_demo: ModuleType,
+    demo_path: Path,
+    template_commits: dict[str, str],
+    start: str,
+    end: str,
+    expected: bool
+) -> None:
+    assert update_demo._is_update_relevant(
+        demo_path=demo_path,
+        extra_context=DEMO_CONTEXT,
+        last_update_commit=template_commits[start],
+        template_commit=template_commits[end]
+    ) is expected
+
+
+def test_changed_context_is_relevant(
+    update_demo: ModuleType, demo_path: Path, template_commits: dict[str, str]
+) -> None:
+    assert update_demo._is_update_relevant(
+        demo_path=demo_path,
+        extra_context={**DEMO_CONTEXT, "add_rust_extension": True},
+        last_update_commit=template_commits["rendered"],
+        template_commit=template_commits["excluded"]
+    )
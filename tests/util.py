@@ -1,9 +1,98 @@
 """Module containing utility functions used by tests."""
+import asyncio
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import Optional
 
 from tests.constants import COOKIECUTTER_FOLDER
+from tests.constants import NOX_SESSION_RESOURCES
+from tests.constants import SCRIPTS_FOLDER
+
+
+@dataclass(frozen=True)
+class NoxSessionResult:
+    """Outcome of running a nox session within a demo."""
+    session: str
+    returncode: int
+    output: str
+    seconds: float
 
 
 def templates_matching(pattern: str) -> list[Path]:
     """Return a list of relative file paths matching the given pattern."""
     return [path.relative_to(COOKIECUTTER_FOLDER) for path in COOKIECUTTER_FOLDER.glob(pattern)]
+
+
+def load_script(name: str) -> ModuleType:
+    """Loads one of the template's scripts, whose hyphenated names can't be imported, as a module of its own."""
+    spec: importlib.machinery.ModuleSpec = importlib.util.spec_from_file_location(
+        name.replace("-", "_"), SCRIPTS_FOLDER / f"{name}.py"
+    )
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_nox_sessions(
+    project_path: Path,
+    sessions: list[str],
+    resources: Optional[dict[str, tuple[str, ...]]] = None,
+    jobs: Optional[int] = None
+) -> dict[str, NoxSessionResult]:
+    """Runs the nox sessions within the project concurrently, returning the outcome of each.
+
+    A session waits for every session before it that shares one of its resources, so sessions sharing a resource run
+    one at a time in the given order, letting one such as coverage consume what the test sessions before it wrote. Every
+    other session runs right away, with no more than the given number of jobs at once.
+    """
+    resources: dict[str, tuple[str, ...]] = NOX_SESSION_RESOURCES if resources is None else resources
+    jobs: int = jobs or os.cpu_count() or 1
+    results: list[NoxSessionResult] = asyncio.run(
+        _run_nox_sessions(project_path=project_path, sessions=sessions, resources=resources, jobs=jobs)
+    )
+    return {result.session: result for result in results}
+
+
+async def _run_nox_sessions(
+    project_path: Path, sessions: list[str], resources: dict[str, tuple[str, ...]], jobs: int
+) -> list[NoxSessionResult]:
+    """Runs every session once the sessions before it sharing its resources have finished."""
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max(jobs, 1))
+    finished: dict[str, asyncio.Event] = {session: asyncio.Event() for session in sessions}
+
+    async def run_when_unblocked(index: int, session: str) -> NoxSessionResult:
+        session_resources: set[str] = set(resources.get(session, ()))
+        for earlier_session in sessions[:index]:
+            if session_resources.intersection(resources.get(earlier_session, ())):
+                await finished[earlier_session].wait()
+        try:
+            async with semaphore:
+                return await _run_nox_session(project_path=project_path, session=session)
+        finally:
+            finished[session].set()
+
+    return await asyncio.gather(*(run_when_unblocked(index, session) for index, session in enumerate(sessions)))
+
+
+async def _run_nox_session(project_path: Path, session: str) -> NoxSessionResult:
+    """Runs a single nox session within the project, capturing its combined output."""
+    start: float = time.perf_counter()
+    process: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+        "nox",
+        "-s",
+        session,
+        cwd=project_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    stdout, _ = await process.communicate()
+    return NoxSessionResult(
+        session=session,
+        returncode=process.returncode,
+        output=stdout.decode("utf-8", errors="replace"),
+        seconds=time.perf_counter() - start
+    )
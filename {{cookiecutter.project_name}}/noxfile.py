@@ -23,6 +23,9 @@ TESTS_FOLDER: Path = REPO_ROOT / "tests"
 SCRIPTS_FOLDER: Path = REPO_ROOT / "scripts"
 CRATES_FOLDER: Path = REPO_ROOT / "rust"
 
+# Runs a release script in a single throwaway environment providing commitizen, which the script uses in process
+RELEASE_SCRIPT_RUNNER: List[str] = ["uv", "run", "--no-project", "--with", "commitizen>=4.8.2,<5", "python"]
+
 PROJECT_NAME: str = "{{cookiecutter.project_name}}"
 PACKAGE_NAME: str = "{{cookiecutter.package_name}}"
 REPOSITORY_HOST: str = "{{cookiecutter.repository_host}}"
@@ -284,14 +287,14 @@ def setup_release(session: Session) -> None:
     """
     session.log("Setting up release...")
 
-    session.run("python", SCRIPTS_FOLDER / "setup-release.py", *session.posargs, external=True)
+    session.run(*RELEASE_SCRIPT_RUNNER, SCRIPTS_FOLDER / "setup-release.py", *session.posargs, external=True)
 
 
 @nox.session(python=False, name="get-release-notes", tags=[RELEASE])
 def get_release_notes(session: Session) -> None:
     """Gets the latest release notes if between bumping the version and tagging the release."""
     session.log("Getting release notes...")
-    session.run("python", SCRIPTS_FOLDER / "get-release-notes.py", *session.posargs, external=True)
+    session.run(*RELEASE_SCRIPT_RUNNER, SCRIPTS_FOLDER / "get-release-notes.py", *session.posargs, external=True)
 
 
 @nox.session(python=False, name="publish-python", tags=[RELEASE])
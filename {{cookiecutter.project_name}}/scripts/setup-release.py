@@ -5,11 +5,10 @@ import subprocess
 from typing import Optional
 
 from util import REPO_FOLDER
-from util import bump_version
+from util import ReleasePlan
+from util import ReleasePlanner
 from util import check_dependencies
 from util import create_release_branch
-from util import get_bumped_package_version
-from util import get_package_version
 from util import require_clean_and_up_to_date_repo
 
 
@@ -44,28 +43,28 @@ def setup_release(increment: Optional[str] = None) -> None:
     check_dependencies(path=REPO_FOLDER, dependencies=["git"])
     require_clean_and_up_to_date_repo()
 
-    current_version: str = get_package_version()
-    new_version: str = get_bumped_package_version(increment=increment)
+    planner: ReleasePlanner = ReleasePlanner()
+    plan: ReleasePlan = planner.plan(increment=increment)
     try:
-        _setup_release(increment=increment, current_version=current_version, new_version=new_version)
+        _setup_release(planner=planner, plan=plan)
     except Exception as error:
-        _rollback_release(version=new_version)
+        _rollback_release(version=plan.new_version)
         raise error
 
 
-def _setup_release(increment: str, current_version: str, new_version: str) -> None:
+def _setup_release(planner: ReleasePlanner, plan: ReleasePlan) -> None:
     """Prepares a release of the {{cookiecutter.project_name}} package.
 
     Sets up a release branch from the branch develop, bumps the version, and creates a release commit. Does not tag the
     release or push any changes.
     """
-    create_release_branch(new_version=new_version)
-    bump_version(increment=increment)
+    create_release_branch(new_version=plan.new_version)
+    planner.apply(plan)
 
     commands: list[list[str]] = [
         ["uv", "sync", "--all-groups"],
         ["git", "add", "."],
-        ["git", "commit", "-m", f"bump: version {current_version} → {new_version}", "--no-verify"],
+        ["git", "commit", "-m", f"bump: version {plan.current_version} → {plan.new_version}", "--no-verify"],
     ]
 
     for command in commands:
@@ -1,11 +1,15 @@
 """Module containing util."""
 
 import argparse
+import os
 import stat
 import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 from typing import Callable
+from typing import Generator
 from typing import Optional
 
 
@@ -73,23 +77,6 @@ def remove_readonly(func: Callable[[str], Any], path: str, _: Any) -> None:
     func(path)
 
 
-def get_package_version() -> str:
-    """Gets the package version."""
-    result: subprocess.CompletedProcess = subprocess.run(
-        ["uvx", "--from", "commitizen", "cz", "version", "-p"], cwd=REPO_FOLDER, capture_output=True
-    )
-    return result.stdout.decode("utf-8").strip()
-
-
-def get_bumped_package_version(increment: Optional[str] = None) -> str:
-    """Gets the bumped package version."""
-    args: list[str] = ["uvx", "--from", "commitizen", "cz", "bump", "--get-next", "--yes", "--dry-run"]
-    if increment is not None:
-        args.extend(["--increment", increment])
-    result: subprocess.CompletedProcess = subprocess.run(args, cwd=REPO_FOLDER, capture_output=True)
-    return result.stdout.decode("utf-8").strip()
-
-
 def create_release_branch(new_version: str) -> None:
     """Creates a release branch."""
     commands: list[list[str]] = [
@@ -100,26 +87,246 @@ def create_release_branch(new_version: str) -> None:
         subprocess.run(command, cwd=REPO_FOLDER, capture_output=True, check=True)
 
 
+@contextmanager
+def _in_repo_folder() -> Generator[None, None, None]:
+    """Returns a context manager for working within the repo folder, returning to the previous folder afterwards."""
+    previous_folder: Path = Path.cwd()
+    os.chdir(REPO_FOLDER)
+    try:
+        yield
+    finally:
+        os.chdir(previous_folder)
+
+
+@dataclass(frozen=True)
+class ReleasePlan:
+    """The next release of the package, as planned by ReleasePlanner."""
+
+    current_version: str
+    new_version: str
+    increment: Optional[str]
+    changelog: str
+    version_files: list[str]
+
+
+class ReleasePlanner:
+    """Plans and applies releases with commitizen as a library.
+
+    The commitizen config, current version, tags and commits since the last release are read once, and every release
+    step is computed from them within this process rather than resolving and running commitizen with uvx per step.
+    commitizen finds its config, version files and git repo from the current folder, so each step works within the
+    repo folder while it runs.
+    """
+
+    def __init__(self) -> None:
+        """Initializes ReleasePlanner from the commitizen config and tags of the repo."""
+        from commitizen import factory
+        from commitizen import git
+        from commitizen.config import read_cfg
+        from commitizen.providers import get_provider
+        from commitizen.tags import TagRules
+        from commitizen.version_schemes import get_version_scheme
+
+        with _in_repo_folder():
+            self.config: Any = read_cfg()
+            self.settings: Any = self.config.settings
+            self.cz: Any = factory.committer_factory(self.config)
+            self.provider: Any = get_provider(self.config)
+            self.scheme: Any = get_version_scheme(self.settings)
+            self.rules: Any = TagRules.from_settings(self.settings)
+            self.tags: list[Any] = list(self.rules.get_version_tags(git.get_tags()))
+
+    def get_version(self) -> str:
+        """Gets the current package version from the commitizen version provider."""
+        with _in_repo_folder():
+            return self.provider.get_version()
+
+    def get_latest_tag(self) -> Optional[str]:
+        """Gets the most recently created version tag, or None if no version tags exist."""
+        if not self.tags:
+            return None
+        return self.tags[0].name
+
+    def plan(self, increment: Optional[str] = None) -> ReleasePlan:
+        """Plans the release following the current version.
+
+        The increment is found from the commits since the current version's tag unless one is given, where PRERELEASE
+        makes a release candidate of the increment found from the commits.
+        """
+        from commitizen import git
+
+        with _in_repo_folder():
+            current_version: str = self.get_version()
+            current_tag: Optional[Any] = self.rules.find_tag_for(self.tags, current_version)
+            commits: list[Any] = git.get_commits(None if current_tag is None else current_tag.name)
+
+            prerelease: Optional[str] = None
+            if increment == "PRERELEASE":
+                increment, prerelease = None, "rc"
+            if increment is None:
+                bump_map: Any = (
+                    self.cz.bump_map_major_version_zero if self.settings["major_version_zero"] else self.cz.bump_map
+                )
+                increment = _find_increment(commits, regex=self.cz.bump_pattern, increments_map=bump_map)
+            new_version: str = str(self.scheme(current_version).bump(increment, prerelease=prerelease))
+            if new_version == current_version:
+                raise ValueError(f"No commits since version {current_version} are eligible to be bumped.")
+
+            # A changelog without any releases yet is started from the whole history, as cz bump --changelog would
+            if self._get_changelog_metadata().latest_version is None:
+                commits = git.get_commits()
+            return ReleasePlan(
+                current_version=current_version,
+                new_version=new_version,
+                increment=increment,
+                changelog=self._render_changelog(commits=commits, version=self.rules.normalize_tag(new_version)),
+                version_files=self._get_version_files(),
+            )
+
+    def apply(self, plan: ReleasePlan) -> None:
+        """Bumps the version files to the planned version and adds the planned release to the changelog."""
+        from commitizen import bump
+
+        with _in_repo_folder():
+            bump.update_version_in_files(
+                plan.current_version,
+                plan.new_version,
+                self.settings["version_files"],
+                check_consistency=False,
+                encoding=self.settings["encoding"]
+            )
+            self.provider.set_version(plan.new_version)
+            self._write_changelog(plan.changelog)
+
+    def get_release_notes(self, start_tag: Optional[str], version: str) -> str:
+        """Renders the commits since the start tag as the release notes of the given version."""
+        from commitizen import git
+
+        with _in_repo_folder():
+            notes: str = self._render_changelog(commits=git.get_commits(start_tag), version=version)
+            if self.cz.changelog_hook:
+                notes = self.cz.changelog_hook(notes, "")
+            return notes
+
+    def tag(self, version: str) -> None:
+        """Tags the current commit as the release of the given version."""
+        tag: str = self.rules.normalize_tag(version)
+        command: list[str] = ["git", "tag", tag]
+        if self.settings.get("gpg_sign"):
+            command = ["git", "tag", "-s", tag, "-m", tag]
+        elif self.settings.get("annotated_tag"):
+            command = ["git", "tag", "-a", tag, "-m", tag]
+        subprocess.run(command, cwd=REPO_FOLDER, check=True)
+
+    def _render_changelog(self, commits: list[Any], version: str) -> str:
+        """Renders the commits as the changelog entry of the given version, as cz changelog would."""
+        from commitizen import changelog
+        from commitizen import defaults
+
+        tree: Any = changelog.generate_tree_from_commits(
+            commits,
+            self.tags,
+            self.cz.commit_parser,
+            self.cz.changelog_pattern,
+            version,
+            change_type_map=self.settings.get("change_type_map") or self.cz.change_type_map,
+            changelog_message_builder_hook=self.cz.changelog_message_builder_hook,
+            changelog_release_hook=self.cz.changelog_release_hook,
+            rules=self.rules,
+        )
+        change_type_order: list[str] = (
+            self.settings.get("change_type_order") or self.cz.change_type_order or defaults.CHANGE_TYPE_ORDER
+        )
+        tree = _order_changelog_tree(tree, change_type_order)
+
+        extras: dict[str, Any] = {**self.cz.template_extras, **self.settings["extras"]}
+        template: str = self.settings.get("template") or self._get_changelog_format().template
+        rendered: str = changelog.render_changelog(tree, loader=self.cz.template_loader, template=template, **extras)
+        return rendered.lstrip("\n")
+
+    def _write_changelog(self, entry: str) -> None:
+        """Adds the changelog entry to the changelog file, replacing any unreleased section."""
+        from commitizen import changelog
+
+        path: Path = REPO_FOLDER / self.settings["changelog_file"]
+        encoding: str = self.settings["encoding"]
+        lines: list[str] = path.read_text(encoding=encoding).splitlines(keepends=True) if path.is_file() else []
+        content: str = "".join(changelog.incremental_build(entry, lines, self._get_changelog_metadata()))
+        if self.cz.changelog_hook:
+            content = self.cz.changelog_hook(content, content)
+        path.write_text(content, encoding=encoding)
+
+    def _get_changelog_metadata(self) -> Any:
+        """Gets the commitizen metadata of the changelog file, such as its latest release and unreleased section."""
+        return self._get_changelog_format().get_metadata(str(REPO_FOLDER / self.settings["changelog_file"]))
+
+    def _get_changelog_format(self) -> Any:
+        """Gets the commitizen changelog format of the changelog file."""
+        from commitizen.changelog_formats import get_changelog_format
+
+        return get_changelog_format(self.config, self.settings["changelog_file"])
+
+    def _get_version_files(self) -> list[str]:
+        """Gets the files whose version is bumped by a release."""
+        files: list[str] = [version_file.partition(":")[0] for version_file in self.settings["version_files"]]
+        provider_file: Optional[Path] = getattr(self.provider, "file", None)
+        if provider_file is not None:
+            files.insert(0, provider_file.as_posix())
+        return files
+
+
+def _find_increment(commits: list[Any], regex: str, increments_map: Any) -> Optional[str]:
+    """Finds the highest increment that the commits call for, or None if none of them call for a release.
+
+    Newer commitizen releases replace bump.find_increment with VersionIncrement, so this uses whichever the installed
+    version provides.
+    """
+    from commitizen import bump
+
+    if hasattr(bump, "find_increment"):
+        return bump.find_increment(commits, regex=regex, increments_map=increments_map)
+
+    from commitizen.version_increment import VersionIncrement
+
+    increment: Any = VersionIncrement.get_highest_by_messages(
+        (commit.message for commit in commits), regex, increments_map
+    )
+    return None if increment == VersionIncrement.NONE else str(increment)
+
+
+def _order_changelog_tree(tree: Any, change_type_order: list[str]) -> list[Any]:
+    """Orders the changes of each release in a changelog tree by change type.
+
+    Newer commitizen releases replace changelog.order_changelog_tree with generate_ordered_changelog_tree, so this
+    uses whichever the installed version provides.
+    """
+    from commitizen import changelog
+
+    order: Callable[..., Any] = getattr(
+        changelog, "generate_ordered_changelog_tree", None
+    ) or changelog.order_changelog_tree
+    return list(order(tree, change_type_order))
+
+
+def get_package_version() -> str:
+    """Gets the package version."""
+    return ReleasePlanner().get_version()
+
+
+def get_bumped_package_version(increment: Optional[str] = None) -> str:
+    """Gets the bumped package version."""
+    return ReleasePlanner().plan(increment=increment).new_version
+
+
 def bump_version(increment: Optional[str] = None) -> None:
     """Bumps the package version."""
-    bump_cmd: list[str] = ["uvx", "--from", "commitizen", "cz", "bump", "--yes", "--files-only", "--changelog"]
-    if increment is not None:
-        bump_cmd.extend(["--increment", increment])
-    subprocess.run(bump_cmd, cwd=REPO_FOLDER, check=True)
+    planner: ReleasePlanner = ReleasePlanner()
+    planner.apply(planner.plan(increment=increment))
 
 
 def get_latest_tag() -> Optional[str]:
     """Gets the latest git tag."""
-    sort_tags: list[str] = ["git", "tag", "--sort=-creatordate"]
-    find_last: list[str] = ["grep", "-v", '"${GITHUB_REF_NAME}"']
-    echo_none: list[str] = ["echo", "''"]
-    result: subprocess.CompletedProcess = subprocess.run(
-        [*sort_tags, "|", *find_last, "|", "tail", "-n1", "||", *echo_none], cwd=REPO_FOLDER, capture_output=True
-    )
-    tag: str = result.stdout.decode("utf-8").strip()
-    if tag == "":
-        return None
-    return tag
+    return ReleasePlanner().get_latest_tag()
 
 
 def get_latest_release_notes() -> str:
@@ -127,28 +334,17 @@ def get_latest_release_notes() -> str:
 
     Assumes the latest_tag hasn't been applied yet.
     """
-    latest_tag: Optional[str] = get_latest_tag()
-    latest_version: str = get_package_version()
-    if latest_tag == latest_version:
+    planner: ReleasePlanner = ReleasePlanner()
+    latest_tag: Optional[str] = planner.get_latest_tag()
+    latest_version: str = planner.get_version()
+    if latest_tag == planner.rules.normalize_tag(latest_version):
         raise ValueError(
             "The latest tag and version are the same. Please ensure the release notes are taken before tagging."
         )
-    rev_range: str = "" if latest_tag is None else f"{latest_tag}..{latest_version}"
-    command: list[str] = [
-        "uvx",
-        "--from",
-        "commitizen",
-        "cz",
-        "changelog",
-        rev_range,
-        "--dry-run",
-        "--unreleased-version",
-        latest_version,
-    ]
-    result: subprocess.CompletedProcess = subprocess.run(command, cwd=REPO_FOLDER, capture_output=True, check=True)
-    return result.stdout.decode("utf-8")
+    return planner.get_release_notes(start_tag=latest_tag, version=latest_version)
 
 
 def tag_release() -> None:
-    """Tags the release using commitizen bump with tag only."""
-    subprocess.run(["uvx", "--from", "commitizen", "cz", "bump", "--tag-only", "--yes"], cwd=REPO_FOLDER, check=True)
+    """Tags the release of the current package version."""
+    planner: ReleasePlanner = ReleasePlanner()
+    planner.tag(planner.get_version())